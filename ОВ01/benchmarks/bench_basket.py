@@ -0,0 +1,105 @@
+"""Сравнение расчёта корзин через Store.get_price и через BasketPricer."""
+
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.basket import BasketPricer
+from task_manager_store.network import StoreNetwork
+from task_manager_store.store import Store
+
+STORES = 200
+PRODUCTS = 2000
+COVERAGE = 0.8
+BASKETS = 200
+BASKET_SIZE = 20
+
+
+def build_network(rng):
+    """Создаёт сеть магазинов со случайным ассортиментом."""
+    network = StoreNetwork()
+    names = [f"Товар {i}" for i in range(PRODUCTS)]
+    for number in range(STORES):
+        items = {
+            name: {"price": round(rng.uniform(10, 1000), 2)}
+            for name in names if rng.random() < COVERAGE
+        }
+        network.add_store(Store(f"Магазин {number}", "Адрес", items))
+    return network, names
+
+
+def naive_best_single_store(network, basket):
+    """Ищет лучший магазин вызовами Store.get_price для каждого товара."""
+    best = None
+    for key, store in network.get_stores().items():
+        total = 0.0
+        for item in basket:
+            price = store.get_price(item)
+            if price is None:
+                break
+            total += price
+        else:
+            if best is None or total < best[1]:
+                best = (key, total)
+    return best
+
+
+def naive_best_split(network, basket):
+    """Ищет лучшую пару магазинов вызовами Store.get_price."""
+    stores = list(network.get_stores().values())
+    best = None
+    for i, first in enumerate(stores):
+        for second in stores[i + 1:]:
+            total = 0.0
+            for item in basket:
+                prices = [p for p in (first.get_price(item), second.get_price(item)) if p is not None]
+                if not prices:
+                    break
+                total += min(prices)
+            else:
+                if best is None or total < best:
+                    best = total
+    return best
+
+
+def measure(title, func):
+    """Выполняет функцию и печатает время выполнения."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{title}: {time.perf_counter() - start:.3f} с")
+    return result
+
+
+def main():
+    """Запускает сравнение."""
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    network, names = build_network(rng)
+    baskets = [rng.sample(names, BASKET_SIZE) for _ in range(BASKETS)]
+    pricer = BasketPricer(network)
+
+    print(f"Магазинов: {STORES}, товаров: {PRODUCTS}, корзин: {BASKETS} по {BASKET_SIZE} товаров")
+    naive = measure("Store.get_price по всем магазинам",
+                    lambda: [naive_best_single_store(network, b) for b in baskets])
+    fast = measure("BasketPricer.price_baskets",
+                   lambda: pricer.price_baskets(baskets))
+    naive_split = measure("Store.get_price, до 2 магазинов (5 корзин)",
+                          lambda: [naive_best_split(network, b) for b in baskets[:5]])
+    fast_split = measure("BasketPricer.price_baskets, до 2 магазинов (5 корзин)",
+                         lambda: pricer.price_baskets(baskets[:5], max_stores=2))
+
+    for expected, quote in zip(naive, fast):
+        assert (expected is None) == (quote is None)
+        if quote is not None:
+            assert abs(expected[1] - quote.total) < 0.01
+    for expected, quote in zip(naive_split, fast_split):
+        assert abs(expected - quote.total) < 0.01
+
+
+if __name__ == "__main__":
+    main()
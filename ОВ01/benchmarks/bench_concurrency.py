@@ -0,0 +1,71 @@
+"""Нагрузочная проверка изменения цен с проверкой версии из нескольких потоков."""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.store import PriceConflictError, Store
+
+PRODUCTS = 1000
+UPDATES_PER_WORKER = 20000
+
+
+def run(workers, hot_products):
+    """Запускает потоки, увеличивающие цены на 1 с проверкой версии.
+
+    Args:
+        workers: Количество потоков.
+        hot_products: Количество товаров, между которыми распределяются изменения.
+
+    Returns:
+        Кортеж (изменений в секунду, количество конфликтов).
+    """
+    store = Store("Магазин", "Адрес")
+    store.add_items((f"Товар {i}", 100.0) for i in range(PRODUCTS))
+    conflicts = [0] * workers
+
+    def worker(number):
+        for i in range(UPDATES_PER_WORKER):
+            name = f"Товар {(number * 7919 + i) % hot_products}"
+            while True:
+                price, version = store.get_price_with_version(name)
+                try:
+                    store.update_price(name, price + 1, expected_version=version)
+                    break
+                except PriceConflictError:
+                    conflicts[number] += 1
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = workers * UPDATES_PER_WORKER
+    expected = 100.0 * PRODUCTS + total
+    actual = sum(product.price for product in store.get_items())
+    assert actual == expected, f"Потеряны изменения: {expected - actual:.0f}"
+    return total / elapsed, sum(conflicts)
+
+
+def main():
+    """Запускает проверку для разного числа потоков."""
+    logging.disable(logging.CRITICAL)
+    print(f"Товаров: {PRODUCTS}, изменений на поток: {UPDATES_PER_WORKER}")
+    for hot_products, title in ((PRODUCTS, "все товары"), (4, "4 популярных товара")):
+        print(f"\nИзменения распределены на {title}:")
+        for workers in (1, 2, 4, 8):
+            rate, conflicts = run(workers, hot_products)
+            print(f"  потоков: {workers}, изменений/с: {rate:,.0f}, конфликтов: {conflicts}, "
+                  f"потерянных изменений: 0")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Сравнение времени операций с журналом в файл напрямую и через очередь.
+
+Измеряется добавление задач и товаров и изменение цен с записью
+журнала уровня INFO: синхронным FileHandler, через configure_logging()
+(фоновый поток) и через configure_logging() с ограничением частоты.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.log import LOG_FORMAT, configure_logging
+from task_manager_store.store import Store
+from task_manager_store.task import TaskManager
+
+OPERATIONS = 5000
+
+
+def run_operations():
+    """Выполняет операции, каждая из которых пишет в журнал."""
+    manager = TaskManager()
+    store = Store("Гастроном", "ул. Ленина, 1")
+    for number in range(OPERATIONS):
+        manager.add_task(f"Задача {number}", "2024-05-01")
+        store.add_item(f"Товар {number}", 10.0 + number, "Продукты")
+        store.update_price(f"Товар {number}", 20.0 + number)
+
+
+def measure(title, func):
+    """Выполняет функцию и печатает среднее время одной операции."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{title}: {elapsed / OPERATIONS * 1e6:.1f} мкс на операцию")
+    return elapsed
+
+
+def main():
+    """Запускает сравнение."""
+    logging.disable(logging.CRITICAL)
+    measure("Без журнала", run_operations)
+    logging.disable(logging.NOTSET)
+    root = logging.getLogger()
+    with tempfile.TemporaryDirectory() as directory:
+        handler = logging.FileHandler(Path(directory) / "sync.log", encoding='utf-8')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.setLevel(logging.INFO)
+        root.addHandler(handler)
+        measure("FileHandler в вызывающем потоке", run_operations)
+        root.removeHandler(handler)
+        handler.close()
+
+        pipeline = configure_logging(log_file=Path(directory) / "queue.log", stream=False,
+                                     queue_size=100000)
+        measure("configure_logging (очередь)", run_operations)
+        pipeline.stop()
+        assert pipeline.dropped == 0
+
+        pipeline = configure_logging(log_file=Path(directory) / "limited.log", stream=False,
+                                     rate=10.0)
+        measure("configure_logging (очередь и ограничение частоты)", run_operations)
+        pipeline.stop()
+        print(f"  пропущено фильтром: {pipeline.suppressed}, отброшено: {pipeline.dropped}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Замер памяти, занимаемой ассортиментом многих магазинов сети."""
+
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.store import Store
+
+STORES = 200
+PRODUCTS = 2000
+CATEGORIES = ["Молочные продукты", "Хлебобулочные изделия", "Овощи и фрукты",
+              "Бакалея", "Без категории"]
+
+
+def catalog_json(number):
+    """Возвращает ассортимент магазина в формате JSON."""
+    return json.dumps({
+        "name": f"Магазин {number}",
+        "address": "Адрес",
+        "items": {
+            f"Товар сети номер {i}": {
+                "name": f"Товар сети номер {i}",
+                "price": 10.0 + (i * 7 + number) % 990,
+                "category": CATEGORIES[i % len(CATEGORIES)],
+            }
+            for i in range(PRODUCTS)
+        },
+    }, ensure_ascii=False)
+
+
+def measure(title, build):
+    """Печатает прирост памяти при построении объектов."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{title}: {used / 2 ** 20:.1f} МБ, "
+          f"{used / (STORES * PRODUCTS):.0f} байт на товар магазина")
+    return result
+
+
+def main():
+    """Запускает замер."""
+    logging.disable(logging.CRITICAL)
+    payloads = [catalog_json(number) for number in range(STORES)]
+
+    print(f"Магазинов: {STORES}, товаров в каждом: {PRODUCTS}")
+    raw = measure("Разобранный JSON (строки в каждом магазине свои)",
+                  lambda: [json.loads(payload) for payload in payloads])
+    del raw
+    stores = measure("Магазины Store (общие строки)",
+                     lambda: [Store.from_dict(json.loads(payload)) for payload in payloads])
+
+    names = {id(product.name) for store in stores for product in store.get_items()}
+    print(f"Уникальных объектов-названий: {len(names)} из {STORES * PRODUCTS} товаров")
+
+
+if __name__ == "__main__":
+    main()
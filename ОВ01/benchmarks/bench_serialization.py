@@ -0,0 +1,110 @@
+"""Сравнение скорости сохранения и загрузки магазина и менеджера задач.
+
+Прежний способ (to_dict() + json и from_dict()) сравнивается с кодеками
+модуля serialization с проверкой данных и без неё (trusted). Скорость
+указывается в записях (товарах или задачах) в секунду за полный цикл
+кодирования и декодирования.
+"""
+
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store import serialization
+from task_manager_store.store import Store
+from task_manager_store.task import TaskManager
+
+PRODUCTS = 100000
+TASKS = 20000
+DEPENDENCIES = 10000
+CATEGORIES = 50
+
+
+def build_store(rng):
+    """Создаёт магазин со случайными ценами."""
+    store = Store("Гипермаркет", "пр. Мира, 1")
+    store.add_items([
+        (f"Товар {number}", round(rng.uniform(10, 5000), 2), f"Категория {number % CATEGORIES}")
+        for number in range(PRODUCTS)
+    ])
+    return store
+
+
+def build_manager(rng):
+    """Создаёт менеджер задач со случайными сроками и зависимостями."""
+    manager = TaskManager()
+    with manager.transaction():
+        for number in range(TASKS):
+            manager.add_task(f"Задача {number}", f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+    for _ in range(DEPENDENCIES):
+        task = rng.randrange(1, TASKS)
+        manager.add_dependency(f"Задача {task}", f"Задача {rng.randrange(task)}")
+    return manager
+
+
+def manager_state(manager):
+    """Возвращает задачи менеджера с зависимостями в порядке, не зависящем от множеств."""
+    return [
+        (task['description'], task['due_date'], task['status'], sorted(task.get('blocked_by', ())))
+        for task in manager.to_dict()
+    ]
+
+
+def measure(title, func, count):
+    """Выполняет функцию и печатает скорость в записях в секунду."""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{title}: {elapsed * 1000:.0f} мс, {count / elapsed:,.0f} записей/с")
+    return result
+
+
+def main():
+    """Запускает сравнение."""
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    store = build_store(rng)
+    manager = build_manager(rng)
+
+    print(f"Магазин: {PRODUCTS} товаров")
+    restored = measure(
+        "to_dict() + json и from_dict()",
+        lambda: Store.from_dict(json.loads(json.dumps(store.to_dict(), ensure_ascii=False))),
+        PRODUCTS,
+    )
+    assert restored.to_dict() == store.to_dict()
+    for codec in serialization.available_codecs():
+        for trusted in (False, True):
+            payload = serialization.dumps(store, codec)
+            restored = measure(
+                f"{codec}{' (trusted)' if trusted else ''}, {len(payload) // 1024} КБ",
+                lambda: serialization.loads(serialization.dumps(store, codec), codec, trusted=trusted),
+                PRODUCTS,
+            )
+            assert restored.to_dict() == store.to_dict()
+
+    print(f"\nМенеджер задач: {TASKS} задач, {DEPENDENCIES} зависимостей")
+    restored = measure(
+        "to_dict() + json и from_dict()",
+        lambda: TaskManager.from_dict(json.loads(json.dumps(manager.to_dict(), ensure_ascii=False))),
+        TASKS,
+    )
+    assert manager_state(restored) == manager_state(manager)
+    for codec in serialization.available_codecs():
+        for trusted in (False, True):
+            restored = measure(
+                f"{codec}{' (trusted)' if trusted else ''}",
+                lambda: serialization.loads(serialization.dumps(manager, codec), codec, trusted=trusted),
+                TASKS,
+            )
+            assert manager_state(restored) == manager_state(manager)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Сравнение поиска ближайших магазинов перебором и через StoreLocator."""
+
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.spatial import StoreLocator, haversine
+
+STORES = 50000
+QUERIES = 1000
+NEAREST = 5
+RADIUS_KM = 20
+
+
+def build_locations(rng):
+    """Создаёт случайные координаты магазинов (европейская часть и Сибирь)."""
+    return {
+        f"Магазин {number}": (rng.uniform(43, 68), rng.uniform(28, 110))
+        for number in range(STORES)
+    }
+
+
+def linear_nearest(locations, latitude, longitude):
+    """Ищет ближайшие магазины расчётом расстояния до каждого."""
+    distances = sorted(
+        (haversine(latitude, longitude, *point), key) for key, point in locations.items()
+    )
+    return [key for _, key in distances[:NEAREST]]
+
+
+def measure(title, func, count):
+    """Выполняет функцию и печатает среднее время одного запроса."""
+    start = time.perf_counter()
+    result = func()
+    print(f"{title}: {(time.perf_counter() - start) / count * 1e6:.1f} мкс на запрос")
+    return result
+
+
+def main():
+    """Запускает сравнение."""
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(42)
+    locations = build_locations(rng)
+    locator = StoreLocator(cell_size=0.25)
+    for key, point in locations.items():
+        locator.add(key, *point)
+    queries = [(rng.uniform(45, 65), rng.uniform(30, 105)) for _ in range(QUERIES)]
+
+    print(f"Магазинов: {STORES}, запросов: {QUERIES}")
+    naive = measure("Перебор всех магазинов (10 запросов)",
+                    lambda: [linear_nearest(locations, *q) for q in queries[:10]], 10)
+    fast = measure("StoreLocator.nearest",
+                   lambda: [locator.nearest(*q, k=NEAREST) for q in queries], QUERIES)
+    measure("StoreLocator.within_radius",
+            lambda: [locator.within_radius(*q, RADIUS_KM) for q in queries], QUERIES)
+
+    for expected, found in zip(naive, fast):
+        assert expected == [key for key, _ in found]
+
+
+if __name__ == "__main__":
+    main()
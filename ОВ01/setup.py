@@ -27,6 +27,12 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
+        "columnar": [
+            "numpy>=1.20",
+        ],
+        "msgpack": [
+            "msgpack>=1.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=3.0.0",
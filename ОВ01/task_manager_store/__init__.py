@@ -4,6 +4,21 @@
 Содержит модули:
 - task: Класс для работы с задачами
 - store: Класс для работы с магазинами
+- indexes: Вспомогательные индексы (дерево Фенвика, календарь сроков, индекс цен,
+  индекс названий для поиска по префиксу, фильтр Блума)
+- pool: Пул менеджеров задач пользователей с вытеснением на диск
+- columnar: Колоночный каталог товаров на NumPy (необязательный)
+- network: Сеть магазинов с общим индексом товаров
+- basket: Расчёт стоимости корзины покупок в сети магазинов
+- price_history: Компактная история цен товаров магазина
+- sqlite_store: Хранение ассортимента магазинов в SQLite
+- inventory: Остатки товаров и резервирование при оформлении заказов
+- dedup: Поиск почти одинаковых товаров в каталогах (MinHash и LSH)
+- spatial: Поиск ближайших магазинов по координатам
+- snapshot: Снимки магазина по категориям с ленивой загрузкой
+- serialization: Быстрая сериализация объектов в JSON и MessagePack
+- sync: Синхронизация копий магазинов и задач по дереву хешей
+- log: Журналирование через фоновую очередь
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,325 @@
+"""Модуль для расчёта стоимости корзины покупок в сети магазинов."""
+
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .network import StoreNetwork
+
+logger = logging.getLogger(__name__)
+
+# Максимальное число сочетаний магазинов для точного перебора
+EXACT_SEARCH_LIMIT = 20000
+
+
+@dataclass
+class BasketQuote:
+    """Результат расчёта корзины.
+
+    Атрибуты:
+        total: Итоговая стоимость.
+        stores: Ключи магазинов, в которых совершаются покупки.
+        assignment: Словарь, где ключ - товар, значение - ключ магазина.
+        missing: Товары, которых нет ни в одном магазине сети.
+    """
+    total: float
+    stores: List[str]
+    assignment: Dict[str, str] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+
+class _PriceMatrix:
+    """Матрица цен "товар x магазин" для одной корзины.
+
+    Столбцы хранятся кортежами и строятся при первом обращении, поэтому
+    стоимость набора магазинов считается через zip/min/sum без
+    поэлементного цикла на Python.
+    """
+
+    def __init__(self, quantities: Dict[str, int], prices: Dict[str, Dict[str, float]]):
+        """Строит матрицу по ценам товаров корзины.
+
+        Args:
+            quantities: Количество каждого товара в корзине.
+            prices: Цены товаров по магазинам из индекса сети.
+        """
+        self.quantities = quantities
+        self.prices = prices
+        self.items = [item for item in quantities if prices.get(item)]
+        self.missing = [item for item in quantities if not prices.get(item)]
+
+    @cached_property
+    def stores(self) -> List[str]:
+        """Ключи магазинов, продающих хотя бы один товар корзины."""
+        return sorted({key for item in self.items for key in self.prices[item]})
+
+    @cached_property
+    def columns(self) -> List[Tuple[float, ...]]:
+        """Стоимость каждого товара корзины по магазинам (math.inf - нет в наличии)."""
+        rows = [(self.prices[item], self.quantities[item]) for item in self.items]
+        return [
+            tuple(prices.get(key, math.inf) * quantity for prices, quantity in rows)
+            for key in self.stores
+        ]
+
+    def common_stores(self) -> List[str]:
+        """Возвращает ключи магазинов, в которых есть все товары корзины.
+
+        Множества магазинов пересекаются начиная с самого редкого товара,
+        поэтому кандидатов обычно становится мало уже после нескольких шагов.
+
+        Returns:
+            Отсортированный список ключей магазинов.
+        """
+        items = sorted(self.items, key=lambda item: len(self.prices[item]))
+        common = set(self.prices[items[0]])
+        for item in items[1:]:
+            common.intersection_update(self.prices[item])
+            if not common:
+                break
+        return sorted(common)
+
+    def cost(self, selection: Sequence[int]) -> float:
+        """Возвращает стоимость корзины при покупке в выбранных магазинах.
+
+        Args:
+            selection: Номера столбцов (магазинов).
+
+        Returns:
+            Стоимость или math.inf, если какой-то товар не покрыт.
+        """
+        if len(selection) == 1:
+            return sum(self.columns[selection[0]])
+        total: float = sum(map(min, *(self.columns[i] for i in selection)))
+        return total
+
+    def score(self, selection: Sequence[int]) -> Tuple[int, float]:
+        """Возвращает число непокрытых товаров и стоимость покрытых.
+
+        Args:
+            selection: Номера столбцов (магазинов).
+
+        Returns:
+            Кортеж (количество непокрытых товаров, стоимость покрытых).
+        """
+        if not selection:
+            return len(self.items), 0.0
+        best: Sequence[float]
+        if len(selection) == 1:
+            best = self.columns[selection[0]]
+        else:
+            best = list(map(min, *(self.columns[i] for i in selection)))
+        uncovered = sum(1 for price in best if math.isinf(price))
+        return uncovered, sum(price for price in best if not math.isinf(price))
+
+    def quote(self, selection: Sequence[int]) -> BasketQuote:
+        """Формирует результат для выбранных магазинов.
+
+        Args:
+            selection: Номера столбцов (магазинов).
+
+        Returns:
+            Результат расчёта корзины.
+        """
+        assignment = {}
+        used = set()
+        for row, item in enumerate(self.items):
+            best = min(selection, key=lambda i: self.columns[i][row])
+            assignment[item] = self.stores[best]
+            used.add(best)
+        return BasketQuote(
+            total=round(self.cost(selection), 2),
+            stores=[self.stores[i] for i in sorted(used)],
+            assignment=assignment,
+            missing=list(self.missing),
+        )
+
+
+class BasketPricer:
+    """Расчёт стоимости корзин по общему индексу цен сети магазинов.
+
+    Цены товаров берутся из индекса StoreNetwork одним обращением на
+    товар, а не вызовом Store.get_price для каждого магазина.
+    """
+
+    def __init__(self, network: StoreNetwork):
+        """Инициализирует расчёт для сети магазинов.
+
+        Args:
+            network: Сеть магазинов.
+        """
+        self.network = network
+
+    def _matrix(self, basket: Iterable[str],
+                cache: Optional[Dict[str, Dict[str, float]]] = None) -> _PriceMatrix:
+        """Строит матрицу цен корзины.
+
+        Args:
+            basket: Названия товаров (повторы означают количество).
+            cache: Общий кэш цен для пакетного расчёта.
+
+        Returns:
+            Матрица цен.
+        """
+        quantities = Counter(basket)
+        if cache is None:
+            cache = {}
+        for item in quantities:
+            if item not in cache:
+                cache[item] = self.network.get_prices(item)
+        return _PriceMatrix(quantities, cache)
+
+    def best_single_store(self, basket: Iterable[str]) -> Optional[BasketQuote]:
+        """Находит магазин с минимальной стоимостью всей корзины.
+
+        Товары, которых нет ни в одном магазине, попадают в missing.
+
+        Args:
+            basket: Названия товаров (повторы означают количество).
+
+        Returns:
+            Результат или None, если ни один магазин не продаёт все товары.
+        """
+        return self._best_single(self._matrix(basket))
+
+    def _best_single(self, matrix: _PriceMatrix) -> Optional[BasketQuote]:
+        """Находит лучший магазин по готовой матрице цен.
+
+        Args:
+            matrix: Матрица цен корзины.
+
+        Returns:
+            Результат или None, если ни один магазин не продаёт все товары.
+        """
+        if not matrix.items:
+            return BasketQuote(total=0.0, stores=[], missing=list(matrix.missing))
+        candidates = matrix.common_stores()
+        if not candidates:
+            return None
+        rows = [(matrix.prices[item], matrix.quantities[item]) for item in matrix.items]
+        totals = [
+            sum(prices[key] * quantity for prices, quantity in rows)
+            for key in candidates
+        ]
+        best = min(range(len(totals)), key=totals.__getitem__)
+        return BasketQuote(
+            total=round(totals[best], 2),
+            stores=[candidates[best]],
+            assignment=dict.fromkeys(matrix.items, candidates[best]),
+            missing=list(matrix.missing),
+        )
+
+    def best_split(self, basket: Iterable[str], max_stores: int = 2) -> Optional[BasketQuote]:
+        """Находит самую дешёвую покупку корзины не более чем в max_stores магазинах.
+
+        Если число сочетаний магазинов не превышает EXACT_SEARCH_LIMIT,
+        выполняется точный перебор; иначе используется жадный выбор с
+        последующим улучшением заменой магазинов (результат приближённый).
+
+        Args:
+            basket: Названия товаров (повторы означают количество).
+            max_stores: Максимальное количество магазинов.
+
+        Returns:
+            Результат или None, если корзину нельзя собрать в max_stores магазинах.
+
+        Raises:
+            ValueError: Если max_stores меньше 1.
+        """
+        return self._best_split(self._matrix(basket), max_stores)
+
+    def _best_split(self, matrix: _PriceMatrix, max_stores: int) -> Optional[BasketQuote]:
+        """Находит лучший набор магазинов по готовой матрице цен.
+
+        Args:
+            matrix: Матрица цен корзины.
+            max_stores: Максимальное количество магазинов.
+
+        Returns:
+            Результат или None, если корзину нельзя собрать.
+        """
+        if max_stores < 1:
+            error_msg = f"Количество магазинов должно быть положительным: {max_stores}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not matrix.items:
+            return BasketQuote(total=0.0, stores=[], missing=list(matrix.missing))
+
+        count = len(matrix.stores)
+        size = min(max_stores, count)
+        if math.comb(count, size) <= EXACT_SEARCH_LIMIT:
+            # Добавление магазина не увеличивает стоимость, поэтому достаточно
+            # перебрать наборы ровно из size магазинов; лишние отсеет quote()
+            cheapest = min(combinations(range(count), size), key=matrix.cost)
+            selection = list(cheapest)
+        else:
+            selection = self._greedy_selection(matrix, size)
+
+        if not selection or math.isinf(matrix.cost(selection)):
+            return None
+        return matrix.quote(selection)
+
+    @staticmethod
+    def _greedy_selection(matrix: _PriceMatrix, size: int) -> List[int]:
+        """Выбирает магазины жадно, затем улучшает набор заменами.
+
+        Args:
+            matrix: Матрица цен корзины.
+            size: Максимальное количество магазинов.
+
+        Returns:
+            Номера выбранных столбцов.
+        """
+        candidates = range(len(matrix.stores))
+        selection: List[int] = []
+        best_score = matrix.score(selection)
+        while len(selection) < size:
+            score, store = min(
+                (matrix.score(selection + [i]), i) for i in candidates if i not in selection
+            )
+            if score >= best_score:
+                break
+            selection.append(store)
+            best_score = score
+
+        improved = True
+        while improved:
+            improved = False
+            for position in range(len(selection)):
+                for candidate in candidates:
+                    if candidate in selection:
+                        continue
+                    trial = selection[:position] + [candidate] + selection[position + 1:]
+                    score = matrix.score(trial)
+                    if score < best_score:
+                        selection, best_score, improved = trial, score, True
+        return selection
+
+    def price_baskets(self, baskets: Iterable[Iterable[str]],
+                      max_stores: int = 1) -> List[Optional[BasketQuote]]:
+        """Рассчитывает несколько корзин за один проход.
+
+        Цены каждого товара запрашиваются из индекса сети один раз на
+        весь пакет, даже если товар встречается во многих корзинах.
+
+        Args:
+            baskets: Корзины (названия товаров).
+            max_stores: Максимальное количество магазинов на корзину.
+
+        Returns:
+            Результаты в порядке корзин (None для корзин, которые нельзя собрать).
+        """
+        cache: Dict[str, Dict[str, float]] = {}
+        results = []
+        for basket in baskets:
+            matrix = self._matrix(basket, cache)
+            if max_stores == 1:
+                results.append(self._best_single(matrix))
+            else:
+                results.append(self._best_split(matrix, max_stores))
+        return results
@@ -0,0 +1,305 @@
+"""Модуль для колоночного хранения каталога товаров на основе NumPy.
+
+Требует установленного пакета numpy (pip install task_manager_store[columnar]).
+"""
+
+import logging
+import math
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy является необязательной зависимостью
+    HAS_NUMPY = False
+
+from .store import Product, Store
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnarCatalog:
+    """Каталог товаров в колоночном представлении.
+
+    Цены хранятся в массиве float64, категории - в массиве кодов int32
+    со справочником названий, названия товаров - в общем списке.
+    Массовое изменение цен, фильтрация и агрегаты по категориям
+    выполняются векторно, без цикла по товарам на Python.
+
+    Удалённые товары помечаются в маске и не участвуют в операциях.
+    """
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self) -> None:
+        """Инициализирует пустой каталог.
+
+        Raises:
+            ImportError: Если пакет numpy не установлен.
+        """
+        if not HAS_NUMPY:
+            error_msg = "Для колоночного каталога требуется пакет numpy"
+            logger.error(error_msg)
+            raise ImportError(error_msg)
+
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self._prices = np.zeros(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._codes = np.zeros(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+
+    @classmethod
+    def from_store(cls, store: Store) -> 'ColumnarCatalog':
+        """Создаёт каталог из ассортимента магазина.
+
+        Args:
+            store: Исходный магазин.
+
+        Returns:
+            Экземпляр класса ColumnarCatalog.
+        """
+        catalog = cls()
+        products = store.get_items()
+        size = len(products)
+        catalog._reserve(size)
+        for row, product in enumerate(products):
+            catalog._names.append(product.name)
+            catalog._rows[product.name] = row
+            catalog._codes[row] = catalog._category_code(product.category)
+        catalog._prices[:size] = [product.price for product in products]
+        catalog._alive[:size] = True
+        return catalog
+
+    def _reserve(self, size: int) -> None:
+        """Увеличивает ёмкость массивов до указанного размера.
+
+        Args:
+            size: Требуемое количество строк.
+        """
+        capacity = len(self._prices)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for attr in ('_prices', '_codes', '_alive'):
+            old = getattr(self, attr)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, attr, new)
+
+    def _category_code(self, category: str) -> int:
+        """Возвращает код категории, регистрируя новую при необходимости.
+
+        Args:
+            category: Название категории.
+
+        Returns:
+            Код категории.
+        """
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self._categories)
+            self._categories.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def add(self, name: str, price: float, category: str = "Без категории") -> None:
+        """Добавляет товар в каталог.
+
+        Args:
+            name: Название товара.
+            price: Цена товара.
+            category: Категория товара.
+
+        Raises:
+            ValueError: Если товар уже существует или данные некорректны.
+        """
+        if name in self._rows:
+            error_msg = f"Товар с названием '{name}' уже существует в каталоге"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not math.isfinite(price):
+            error_msg = f"Цена товара должна быть конечным числом: {price}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        Product(name=name, price=price, category=category)
+        row = len(self._names)
+        self._reserve(row + 1)
+        self._names.append(name)
+        self._rows[name] = row
+        self._prices[row] = price
+        self._codes[row] = self._category_code(category)
+        self._alive[row] = True
+
+    def remove(self, name: str) -> bool:
+        """Удаляет товар из каталога.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            True, если товар был удалён, иначе False.
+        """
+        row = self._rows.pop(name, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        return True
+
+    def product(self, name: str) -> Optional[Product]:
+        """Возвращает товар в виде экземпляра Product.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Товар или None, если не найден.
+        """
+        row = self._rows.get(name)
+        if row is None:
+            return None
+        return Product(
+            name=name,
+            price=float(self._prices[row]),
+            category=self._categories[self._codes[row]],
+        )
+
+    def get_price(self, name: str) -> Optional[float]:
+        """Возвращает цену товара.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Цена товара или None, если товар не найден.
+        """
+        row = self._rows.get(name)
+        return None if row is None else float(self._prices[row])
+
+    def mask_category(self, category: str) -> 'np.ndarray':
+        """Возвращает маску товаров категории.
+
+        Args:
+            category: Название категории.
+
+        Returns:
+            Булев массив по строкам каталога.
+        """
+        size = len(self._names)
+        code = self._category_codes.get(category)
+        if code is None:
+            return np.zeros(size, dtype=bool)
+        return np.equal(self._codes[:size], code) & self._alive[:size]
+
+    def mask_price_range(self, min_price: float, max_price: float) -> 'np.ndarray':
+        """Возвращает маску товаров с ценой в диапазоне включительно.
+
+        Args:
+            min_price: Минимальная цена.
+            max_price: Максимальная цена.
+
+        Returns:
+            Булев массив по строкам каталога.
+        """
+        size = len(self._names)
+        prices = self._prices[:size]
+        return (prices >= min_price) & (prices <= max_price) & self._alive[:size]
+
+    def reprice(self, mask: 'np.ndarray', factor: float = 1.0, delta: float = 0.0,
+                decimals: int = 2) -> int:
+        """Изменяет цены товаров по маске: цена * factor + delta.
+
+        Новые цены округляются и проверяются целиком до применения:
+        если хотя бы одна цена получается неположительной или не
+        конечной (NaN, бесконечность), каталог не изменяется.
+
+        Args:
+            mask: Булев массив отбираемых строк.
+            factor: Множитель цены.
+            delta: Прибавка к цене.
+            decimals: Количество знаков после запятой при округлении.
+
+        Returns:
+            Количество товаров, цена которых изменена.
+
+        Raises:
+            ValueError: Если новая цена какого-либо товара неположительна
+                или не является конечным числом.
+        """
+        size = len(self._names)
+        mask = np.asarray(mask, dtype=bool) & self._alive[:size]
+        new_prices = np.round(self._prices[:size][mask] * factor + delta, decimals)
+        invalid = ~np.isfinite(new_prices) | (new_prices <= 0)
+        if invalid.any():
+            error_msg = f"Цена товара должна быть положительной: {new_prices[invalid][0]}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        self._prices[:size][mask] = new_prices
+        logger.info("Изменены цены товаров в каталоге: %s", new_prices.size)
+        return int(new_prices.size)
+
+    def reprice_category(self, category: str, factor: float) -> int:
+        """Умножает цены всех товаров категории на коэффициент.
+
+        Args:
+            category: Название категории.
+            factor: Множитель цены (например, 1.07 для повышения на 7%).
+
+        Returns:
+            Количество товаров, цена которых изменена.
+        """
+        return self.reprice(self.mask_category(category), factor=factor)
+
+    def category_stats(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает количество, сумму и среднюю цену по категориям.
+
+        Returns:
+            Словарь, где ключ - категория, значение - словарь с ключами
+            'count', 'total' и 'average'.
+        """
+        size = len(self._names)
+        alive = self._alive[:size]
+        codes = self._codes[:size][alive]
+        prices = self._prices[:size][alive]
+        length = len(self._categories)
+        counts = np.bincount(codes, minlength=length)
+        totals = np.bincount(codes, weights=prices, minlength=length)
+        result = {}
+        for code, category in enumerate(self._categories):
+            count = int(counts[code])
+            if count:
+                result[category] = {
+                    'count': count,
+                    'total': float(totals[code]),
+                    'average': float(totals[code] / count),
+                }
+        return result
+
+    def write_back(self, store: Store) -> int:
+        """Переносит изменённые цены в магазин одним пакетом.
+
+        Args:
+            store: Магазин, из которого был построен каталог.
+
+        Returns:
+            Количество товаров, цена которых изменена в магазине.
+        """
+        size = len(self._names)
+        changed = {}
+        for row in np.flatnonzero(self._alive[:size]):
+            name = self._names[row]
+            price = float(self._prices[row])
+            if store.get_price(name) not in (None, price):
+                changed[name] = price
+        return sum(store.update_prices(changed).values())
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров в каталоге."""
+        return len(self._rows)
+
+    def __contains__(self, name: str) -> bool:
+        """Проверяет наличие товара в каталоге."""
+        return name in self._rows
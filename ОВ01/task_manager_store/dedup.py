@@ -0,0 +1,343 @@
+"""Модуль для поиска почти одинаковых товаров (MinHash и LSH)."""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from .store import Store
+
+logger = logging.getLogger(__name__)
+
+# Простое число Мерсенна 2^61 - 1 для универсального хеширования
+_PRIME = (1 << 61) - 1
+
+# Максимальное количество n-грамм в кэше значений хеш-функций
+SHINGLE_CACHE_SIZE = 100000
+
+# Латинские буквы, совпадающие по написанию с кириллическими
+_LOOKALIKES = str.maketrans({
+    'A': 'А', 'B': 'В', 'C': 'С', 'E': 'Е', 'H': 'Н', 'K': 'К', 'M': 'М',
+    'O': 'О', 'P': 'Р', 'T': 'Т', 'X': 'Х', 'Y': 'У',
+    'a': 'а', 'c': 'с', 'e': 'е', 'k': 'к', 'o': 'о', 'p': 'р', 'x': 'х', 'y': 'у',
+    'ё': 'е', 'Ё': 'Е',
+})
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_name(name: str) -> str:
+    """Приводит название товара к виду для сравнения.
+
+    Латинские буквы, похожие на кириллические, заменяются кириллическими,
+    "ё" - на "е", регистр и знаки препинания не учитываются.
+
+    Args:
+        name: Название товара.
+
+    Returns:
+        Нормализованное название.
+    """
+    return _NON_WORD.sub(' ', name.translate(_LOOKALIKES).casefold()).strip()
+
+
+def shingles(name: str, size: int = 3) -> List[str]:
+    """Возвращает символьные n-граммы нормализованного названия.
+
+    Args:
+        name: Название товара.
+        size: Длина n-граммы.
+
+    Returns:
+        Список уникальных n-грамм.
+    """
+    text = f" {normalize_name(name)} "
+    if len(text) <= size:
+        return [text]
+    return list({text[i:i + size] for i in range(len(text) - size + 1)})
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Подбирает количество полос и строк в полосе для порога сходства.
+
+    Вероятность попадания пары в кандидаты резко растёт около
+    (1 / полос) ^ (1 / строк); выбирается разбиение, у которого
+    эта точка ближе всего к порогу.
+
+    Args:
+        threshold: Порог сходства.
+        num_perm: Длина сигнатуры.
+
+    Returns:
+        Кортеж (количество полос, строк в полосе).
+    """
+    options = [
+        (bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0
+    ]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class DuplicateIndex:
+    """Индекс для поиска почти одинаковых названий товаров.
+
+    Для каждого названия строится MinHash-сигнатура по символьным
+    n-граммам; сигнатура делится на полосы, и названия с совпадающей
+    полосой становятся кандидатами (LSH). Кандидаты проверяются по
+    оценке сходства Жаккара, поэтому поиск дубликатов выполняется
+    примерно за линейное время вместо сравнения всех пар.
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 64, shingle_size: int = 3):
+        """Инициализирует пустой индекс.
+
+        Args:
+            threshold: Минимальное сходство Жаккара n-грамм для дубликатов.
+            num_perm: Длина MinHash-сигнатуры (точнее, но медленнее при росте).
+            shingle_size: Длина символьной n-граммы.
+
+        Raises:
+            ValueError: Если параметры заданы неверно.
+        """
+        if not 0 < threshold <= 1 or num_perm < 1 or shingle_size < 1:
+            error_msg = (
+                f"Неверные параметры поиска дубликатов: threshold={threshold}, "
+                f"num_perm={num_perm}, shingle_size={shingle_size}"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        # Коэффициенты хеш-функций (a * x + b) mod _PRIME, детерминированные
+        self._coefficients = [
+            (self._hash(f"a{i}") % (_PRIME - 1) + 1, self._hash(f"b{i}") % _PRIME)
+            for i in range(num_perm)
+        ]
+        # Значения всех хеш-функций для n-граммы: набор n-грамм каталога
+        # невелик, поэтому сигнатура обычно собирается из готовых значений
+        self._shingle_cache: Dict[str, Tuple[int, ...]] = {}
+        self._names: Dict[Hashable, str] = {}
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[Hashable]]] = [
+            {} for _ in range(self.bands)
+        ]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Возвращает 64-битный хеш строки, одинаковый между запусками.
+
+        Args:
+            value: Строка.
+
+        Returns:
+            Хеш.
+        """
+        return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def _shingle_hashes(self, shingle: str) -> Tuple[int, ...]:
+        """Возвращает значения всех хеш-функций для n-граммы.
+
+        Args:
+            shingle: n-грамма.
+
+        Returns:
+            Кортеж длины num_perm.
+        """
+        hashes = self._shingle_cache.get(shingle)
+        if hashes is None:
+            h = self._hash(shingle)
+            hashes = tuple([(a * h + b) % _PRIME for a, b in self._coefficients])
+            if len(self._shingle_cache) >= SHINGLE_CACHE_SIZE:
+                self._shingle_cache.clear()
+            self._shingle_cache[shingle] = hashes
+        return hashes
+
+    def signature(self, name: str) -> Tuple[int, ...]:
+        """Вычисляет MinHash-сигнатуру названия.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Сигнатура длины num_perm.
+        """
+        rows = [self._shingle_hashes(shingle) for shingle in shingles(name, self.shingle_size)]
+        if len(rows) == 1:
+            return rows[0]
+        return tuple(map(min, *rows))
+
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Оценивает сходство Жаккара по двум сигнатурам.
+
+        Args:
+            first: Первая сигнатура.
+            second: Вторая сигнатура.
+
+        Returns:
+            Доля совпадающих позиций сигнатур.
+        """
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        """Делит сигнатуру на полосы.
+
+        Args:
+            signature: Сигнатура.
+
+        Returns:
+            Список полос.
+        """
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def add(self, key: Hashable, name: str) -> None:
+        """Добавляет название в индекс.
+
+        Args:
+            key: Уникальный ключ товара (например, (магазин, название)).
+            name: Название товара.
+
+        Raises:
+            ValueError: Если ключ уже есть в индексе.
+        """
+        if key in self._signatures:
+            error_msg = f"Товар с ключом {key!r} уже есть в индексе дубликатов"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        signature = self.signature(name)
+        self._names[key] = name
+        self._signatures[key] = signature
+        for buckets, band in zip(self._buckets, self._bands(signature)):
+            buckets.setdefault(band, []).append(key)
+
+    def add_store(self, store: Store, store_key: Optional[Hashable] = None) -> int:
+        """Добавляет в индекс все товары магазина с ключами (магазин, название).
+
+        Args:
+            store: Магазин.
+            store_key: Ключ магазина (по умолчанию - название).
+
+        Returns:
+            Количество добавленных товаров.
+        """
+        store_key = store.name if store_key is None else store_key
+        products = store.get_items()
+        for product in products:
+            self.add((store_key, product.name), product.name)
+        return len(products)
+
+    def remove(self, key: Hashable) -> bool:
+        """Удаляет название из индекса.
+
+        Args:
+            key: Ключ товара.
+
+        Returns:
+            True, если ключ был в индексе, иначе False.
+        """
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return False
+        del self._names[key]
+        for buckets, band in zip(self._buckets, self._bands(signature)):
+            members = buckets[band]
+            members.remove(key)
+            if not members:
+                del buckets[band]
+        return True
+
+    def query(self, name: str, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """Находит товары, похожие на название.
+
+        Args:
+            name: Название товара.
+            threshold: Минимальное сходство (по умолчанию - порог индекса).
+
+        Returns:
+            Список пар (ключ, оценка сходства) по убыванию сходства.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(name)
+        candidates: Set[Hashable] = set()
+        for buckets, band in zip(self._buckets, self._bands(signature)):
+            candidates.update(buckets.get(band, ()))
+        matches = [
+            (key, self.similarity(signature, self._signatures[key])) for key in candidates
+        ]
+        matches = [match for match in matches if match[1] >= threshold]
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def clusters(self, threshold: Optional[float] = None) -> List[List[Hashable]]:
+        """Группирует почти одинаковые товары.
+
+        Товары с одинаковыми сигнатурами из одной корзины LSH объединяются
+        без сравнения (система непересекающихся множеств). Остальные
+        сравниваются только с представителями уже найденных в корзине
+        групп, а не со всеми её товарами: один товар, продаваемый в тысяче
+        магазинов, даёт тысячу одинаковых сигнатур в одной корзине, и
+        попарное сравнение заняло бы квадратичное время.
+
+        Args:
+            threshold: Минимальное сходство (по умолчанию - порог индекса).
+
+        Returns:
+            Группы ключей из двух и более товаров.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        parent: Dict[Hashable, Hashable] = {}
+
+        def find(key: Hashable) -> Hashable:
+            root = key
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while key != root:
+                parent[key], key = root, parent.get(key, key)
+            return root
+
+        def union(first: Hashable, second: Hashable) -> None:
+            first, second = find(first), find(second)
+            if first != second:
+                parent[second] = first
+
+        for buckets in self._buckets:
+            for members in buckets.values():
+                distinct: Dict[Tuple[int, ...], Hashable] = {}
+                for key in members:
+                    union(distinct.setdefault(self._signatures[key], key), key)
+                representatives: List[Tuple[Hashable, Tuple[int, ...]]] = []
+                for signature, key in distinct.items():
+                    matched = False
+                    for other, other_signature in representatives:
+                        if find(other) == find(key):
+                            matched = True
+                        elif self.similarity(signature, other_signature) >= threshold:
+                            union(other, key)
+                            matched = True
+                    if not matched:
+                        representatives.append((key, signature))
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        result = []
+        for root, members in groups.items():
+            if root not in parent:
+                members.append(root)
+            result.append(members)
+        logger.info("Найдено групп похожих товаров: %s", len(result))
+        return result
+
+    def get_name(self, key: Hashable) -> Optional[str]:
+        """Возвращает название товара по ключу."""
+        return self._names.get(key)
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров в индексе."""
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Проверяет наличие товара в индексе."""
+        return key in self._signatures
@@ -0,0 +1,568 @@
+"""Модуль со вспомогательными индексами для задач и магазинов."""
+
+import hashlib
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Начиная с такого размера пакета записи добавляются в конец списка
+# с последующей сортировкой, а не вставкой каждой по отдельности
+BULK_INSERT_THRESHOLD = 32
+
+
+class FenwickTree:
+    """Дерево Фенвика для префиксных сумм с точечными обновлениями.
+
+    Обновление и запрос суммы на префиксе выполняются за O(log n).
+    Индексация начинается с нуля.
+    """
+
+    def __init__(self, size: int = 0):
+        """Инициализирует дерево из нулей.
+
+        Args:
+            size: Количество элементов.
+        """
+        self._tree: List[int] = [0] * (size + 1)
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> 'FenwickTree':
+        """Строит дерево по массиву значений за O(n).
+
+        Args:
+            values: Начальные значения элементов.
+
+        Returns:
+            Экземпляр класса FenwickTree.
+        """
+        tree = cls()
+        tree._tree = [0]
+        tree._tree.extend(values)
+        size = len(tree._tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree._tree[parent] += tree._tree[i]
+        return tree
+
+    def add(self, index: int, delta: int) -> None:
+        """Прибавляет значение к элементу.
+
+        Args:
+            index: Индекс элемента.
+            delta: Прибавляемое значение.
+        """
+        i = index + 1
+        size = len(self._tree)
+        while i < size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """Возвращает сумму элементов с индексами от 0 до index включительно.
+
+        Args:
+            index: Последний индекс префикса.
+
+        Returns:
+            Сумма элементов префикса (0 для отрицательного индекса).
+        """
+        i = min(index + 1, len(self._tree) - 1)
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def range_sum(self, first: int, last: int) -> int:
+        """Возвращает сумму элементов на отрезке [first, last].
+
+        Args:
+            first: Первый индекс отрезка.
+            last: Последний индекс отрезка.
+
+        Returns:
+            Сумма элементов отрезка.
+        """
+        if last < first:
+            return 0
+        return self.prefix_sum(last) - self.prefix_sum(first - 1)
+
+    def __len__(self) -> int:
+        """Возвращает количество элементов."""
+        return len(self._tree) - 1
+
+
+class DayHistogram:
+    """Количество записей по дням (порядковым номерам дат).
+
+    Хранит счётчики по дням в словаре и дерево Фенвика для запросов
+    по диапазону дат. Окно дерева расширяется автоматически, но не шире
+    _MAX_WINDOW дней: более далёкие дни (например, год 1 рядом с 2025)
+    учитываются отдельно, без выделения памяти под промежуток. Запрос по
+    диапазону занимает O(log n + m), где m - количество таких дней.
+    """
+
+    # Минимальный запас дней при расширении окна
+    _PADDING = 183
+
+    # Наибольшая ширина окна дерева в днях
+    _MAX_WINDOW = 366 * 50
+
+    def __init__(self) -> None:
+        """Инициализирует пустую гистограмму."""
+        self._counts: Dict[int, int] = {}
+        self._origin = 0
+        self._tree = FenwickTree()
+        # Дни с записями за пределами окна дерева
+        self._outliers: Set[int] = set()
+        self._total = 0
+
+    def _in_window(self, day: int) -> bool:
+        """Проверяет, попадает ли день в окно дерева."""
+        return self._origin <= day < self._origin + len(self._tree)
+
+    def add(self, day: int, delta: int = 1) -> None:
+        """Изменяет количество записей за день.
+
+        Args:
+            day: Порядковый номер дня (date.toordinal()).
+            delta: Изменение количества.
+        """
+        if not self._in_window(day) and day not in self._outliers:
+            self._grow(day)
+        count = self._counts.get(day, 0) + delta
+        if count:
+            self._counts[day] = count
+        else:
+            self._counts.pop(day, None)
+        if self._in_window(day):
+            self._tree.add(day - self._origin, delta)
+        elif count:
+            self._outliers.add(day)
+        else:
+            self._outliers.discard(day)
+        self._total += delta
+
+    def _grow(self, day: int) -> None:
+        """Расширяет окно дерева так, чтобы оно включало указанный день.
+
+        Если окно стало бы шире _MAX_WINDOW, день остаётся за его
+        пределами. Когда таких дней больше, чем дней в окне, окно
+        строится заново вокруг нового дня.
+
+        Args:
+            day: Порядковый номер дня, который должен попасть в окно.
+        """
+        if len(self._tree):
+            first = min(day, self._origin)
+            last = max(day, self._origin + len(self._tree) - 1)
+        else:
+            first = last = day
+        if last - first + 1 > self._MAX_WINDOW:
+            if len(self._outliers) * 2 < len(self._counts):
+                return
+            first = last = day
+        span = last - first + 1
+        padding = min(max(self._PADDING, span // 2), (self._MAX_WINDOW - span) // 2)
+        self._origin = first - padding
+        size = span + 2 * padding
+        values = [0] * size
+        self._outliers = set()
+        for known_day, count in self._counts.items():
+            if 0 <= known_day - self._origin < size:
+                values[known_day - self._origin] = count
+            else:
+                self._outliers.add(known_day)
+        self._tree = FenwickTree.from_values(values)
+
+    def count(self, day: int) -> int:
+        """Возвращает количество записей за день.
+
+        Args:
+            day: Порядковый номер дня.
+
+        Returns:
+            Количество записей.
+        """
+        return self._counts.get(day, 0)
+
+    def range_count(self, first_day: int, last_day: int) -> int:
+        """Возвращает количество записей за период включительно.
+
+        Args:
+            first_day: Порядковый номер первого дня.
+            last_day: Порядковый номер последнего дня.
+
+        Returns:
+            Количество записей за период.
+        """
+        total = self._tree.range_sum(first_day - self._origin, last_day - self._origin)
+        for day in self._outliers:
+            if first_day <= day <= last_day:
+                total += self._counts[day]
+        return total
+
+    @property
+    def total(self) -> int:
+        """Общее количество записей."""
+        return self._total
+
+
+class CalendarHistogram:
+    """Календарная гистограмма невыполненных и выполненных задач."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустую гистограмму."""
+        self.open = DayHistogram()
+        self.done = DayHistogram()
+
+    def add(self, day: int, done: bool = False) -> None:
+        """Учитывает задачу со сроком в указанный день.
+
+        Args:
+            day: Порядковый номер дня срока.
+            done: Выполнена ли задача.
+        """
+        (self.done if done else self.open).add(day, 1)
+
+    def remove(self, day: int, done: bool = False) -> None:
+        """Исключает задачу со сроком в указанный день.
+
+        Args:
+            day: Порядковый номер дня срока.
+            done: Была ли задача выполнена.
+        """
+        (self.done if done else self.open).add(day, -1)
+
+    def mark_done(self, day: int) -> None:
+        """Переносит задачу из невыполненных в выполненные.
+
+        Args:
+            day: Порядковый номер дня срока.
+        """
+        self.open.add(day, -1)
+        self.done.add(day, 1)
+
+    def range_count(self, first_day: int, last_day: int, status: Optional[bool] = None) -> int:
+        """Возвращает количество задач со сроком в периоде.
+
+        Args:
+            first_day: Порядковый номер первого дня.
+            last_day: Порядковый номер последнего дня.
+            status: True - только выполненные, False - только невыполненные,
+                None - все задачи.
+
+        Returns:
+            Количество задач.
+        """
+        if status is None:
+            return (
+                self.open.range_count(first_day, last_day)
+                + self.done.range_count(first_day, last_day)
+            )
+        histogram = self.done if status else self.open
+        return histogram.range_count(first_day, last_day)
+
+
+class SortedPriceIndex:
+    """Отсортированный по цене список пар (цена, название товара).
+
+    Запросы по диапазону и первые/последние n элементов выполняются
+    двоичным поиском за O(log n + k). Вставка и удаление находят позицию
+    за O(log n), но сдвигают хвост списка, то есть занимают O(n); сдвиг
+    выполняется одним копированием памяти и для ассортимента магазина
+    (до сотен тысяч товаров) дешевле накладных расходов дерева поиска.
+    Сумма цен поддерживается при каждом изменении, поэтому минимум,
+    максимум, сумма и средняя цена доступны за O(1).
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустой индекс."""
+        self._entries: List[Tuple[float, str]] = []
+        self._total = 0.0
+
+    def add(self, price: float, name: str) -> None:
+        """Добавляет товар в индекс.
+
+        Args:
+            price: Цена товара.
+            name: Название товара.
+        """
+        insort(self._entries, (price, name))
+        self._total += price
+
+    def update(self, entries: Iterable[Tuple[float, str]]) -> None:
+        """Добавляет несколько товаров.
+
+        Большой пакет дописывается в конец и список сортируется один раз:
+        вставка по одной записи сдвигает хвост списка при каждом добавлении.
+
+        Args:
+            entries: Пары (цена, название товара).
+        """
+        entries = list(entries)
+        if len(entries) < BULK_INSERT_THRESHOLD:
+            for price, name in entries:
+                self.add(price, name)
+            return
+        self._entries.extend(entries)
+        self._entries.sort()
+        self._total += sum(price for price, _ in entries)
+
+    def remove(self, price: float, name: str) -> bool:
+        """Удаляет товар из индекса.
+
+        Args:
+            price: Цена товара на момент добавления.
+            name: Название товара.
+
+        Returns:
+            True, если запись найдена и удалена, иначе False.
+        """
+        entry = (price, name)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+            # Пустой индекс обнуляет сумму, чтобы не копить ошибку округления
+            self._total = self._total - price if self._entries else 0.0
+            return True
+        return False
+
+    def range(self, min_price: float, max_price: float) -> List[str]:
+        """Возвращает названия товаров с ценой в диапазоне включительно.
+
+        Args:
+            min_price: Минимальная цена.
+            max_price: Максимальная цена.
+
+        Returns:
+            Названия товаров в порядке возрастания цены.
+        """
+        first = bisect_left(self._entries, (min_price,))
+        last = bisect_right(self._entries, (max_price, chr(0x10FFFF)))
+        return [name for _, name in self._entries[first:last]]
+
+    def first(self, count: int) -> List[str]:
+        """Возвращает названия самых дешёвых товаров.
+
+        Args:
+            count: Количество товаров.
+
+        Returns:
+            Названия товаров в порядке возрастания цены.
+        """
+        return [name for _, name in self._entries[:max(count, 0)]]
+
+    def last(self, count: int) -> List[str]:
+        """Возвращает названия самых дорогих товаров.
+
+        Args:
+            count: Количество товаров.
+
+        Returns:
+            Названия товаров в порядке убывания цены.
+        """
+        if count <= 0:
+            return []
+        return [name for _, name in reversed(self._entries[-count:])]
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Возвращает цену указанного процентиля (метод ближайшего ранга).
+
+        Args:
+            percent: Процентиль от 0 до 100.
+
+        Returns:
+            Цена или None, если индекс пуст.
+        """
+        if not self._entries:
+            return None
+        rank = math.ceil(percent / 100 * len(self._entries))
+        return self._entries[max(rank - 1, 0)][0]
+
+    def min_price(self) -> Optional[float]:
+        """Возвращает минимальную цену или None, если индекс пуст."""
+        return self._entries[0][0] if self._entries else None
+
+    def max_price(self) -> Optional[float]:
+        """Возвращает максимальную цену или None, если индекс пуст."""
+        return self._entries[-1][0] if self._entries else None
+
+    @property
+    def total(self) -> float:
+        """Сумма цен всех товаров индекса."""
+        return self._total
+
+    def mean(self) -> Optional[float]:
+        """Возвращает среднюю цену или None, если индекс пуст."""
+        return self._total / len(self._entries) if self._entries else None
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров в индексе."""
+        return len(self._entries)
+
+
+class PrefixIndex:
+    """Отсортированный список названий для поиска по префиксу.
+
+    Названия хранятся парами (название в нижнем регистре casefold,
+    исходное название), поэтому поиск не зависит от регистра, а все
+    совпадения с префиксом образуют непрерывный отрезок списка,
+    границы которого находятся двоичным поиском за O(log n). Вставка
+    и удаление, как и в SortedPriceIndex, занимают O(n) из-за сдвига
+    хвоста списка.
+    """
+
+    # Символ, больший любого символа в названиях: граница отрезка совпадений
+    _MAX_CHAR = chr(0x10FFFF)
+
+    def __init__(self) -> None:
+        """Инициализирует пустой индекс."""
+        self._entries: List[Tuple[str, str]] = []
+
+    def add(self, name: str) -> None:
+        """Добавляет название в индекс.
+
+        Args:
+            name: Название.
+        """
+        insort(self._entries, (name.casefold(), name))
+
+    def update(self, names: Iterable[str]) -> None:
+        """Добавляет несколько названий (большой пакет - с одной сортировкой).
+
+        Args:
+            names: Названия.
+        """
+        entries = [(name.casefold(), name) for name in names]
+        if len(entries) < BULK_INSERT_THRESHOLD:
+            for entry in entries:
+                insort(self._entries, entry)
+            return
+        self._entries.extend(entries)
+        self._entries.sort()
+
+    def remove(self, name: str) -> bool:
+        """Удаляет название из индекса.
+
+        Args:
+            name: Название.
+
+        Returns:
+            True, если название найдено и удалено, иначе False.
+        """
+        entry = (name.casefold(), name)
+        position = bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+            return True
+        return False
+
+    def _bounds(self, prefix: str) -> Tuple[int, int]:
+        """Возвращает границы отрезка названий, начинающихся с префикса.
+
+        Args:
+            prefix: Префикс.
+
+        Returns:
+            Кортеж (первая позиция, позиция после последней).
+        """
+        key = prefix.casefold()
+        first = bisect_left(self._entries, (key,))
+        last = bisect_left(self._entries, (key + self._MAX_CHAR,), first)
+        return first, last
+
+    def search(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Возвращает названия, начинающиеся с префикса, по алфавиту.
+
+        Args:
+            prefix: Префикс (регистр не учитывается).
+            limit: Максимальное количество названий (None - все).
+
+        Returns:
+            Список названий.
+        """
+        first, last = self._bounds(prefix)
+        if limit is not None:
+            last = min(last, first + max(limit, 0))
+        return [name for _, name in self._entries[first:last]]
+
+    def count(self, prefix: str) -> int:
+        """Возвращает количество названий, начинающихся с префикса.
+
+        Args:
+            prefix: Префикс (регистр не учитывается).
+
+        Returns:
+            Количество названий.
+        """
+        first, last = self._bounds(prefix)
+        return last - first
+
+    def __len__(self) -> int:
+        """Возвращает количество названий в индексе."""
+        return len(self._entries)
+
+
+class BloomFilter:
+    """Фильтр Блума для быстрой проверки отсутствия строки в множестве.
+
+    Отрицательный ответ точен, положительный верен с вероятностью
+    ложного срабатывания около error_rate при заполнении до capacity.
+    Удаление элементов не поддерживается.
+    """
+
+    def __init__(self, capacity: int = 1024, error_rate: float = 0.01):
+        """Инициализирует пустой фильтр.
+
+        Args:
+            capacity: Ожидаемое количество элементов.
+            error_rate: Допустимая вероятность ложного срабатывания.
+
+        Raises:
+            ValueError: Если параметры заданы неверно.
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError(
+                f"Неверные параметры фильтра Блума: capacity={capacity}, error_rate={error_rate}"
+            )
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        """Возвращает номера битов для строки (двойное хеширование).
+
+        Args:
+            key: Строка.
+
+        Returns:
+            Номера битов.
+        """
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self._size for i in range(self._hashes)]
+
+    def add(self, key: str) -> None:
+        """Добавляет строку в фильтр.
+
+        Args:
+            key: Строка.
+        """
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """Проверяет, могла ли строка быть добавлена в фильтр."""
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+    def __len__(self) -> int:
+        """Возвращает количество добавленных строк."""
+        return self._count
@@ -0,0 +1,402 @@
+"""Модуль для учёта остатков товаров и их резервирования."""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .store import Store, StoreEvent
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientStockError(ValueError):
+    """Доступного остатка товара не хватает для резервирования.
+
+    Атрибуты:
+        name: Название товара.
+        requested: Запрошенное количество.
+        available: Доступное количество.
+    """
+
+    def __init__(self, name: str, requested: int, available: int):
+        """Инициализирует ошибку нехватки остатка.
+
+        Args:
+            name: Название товара.
+            requested: Запрошенное количество.
+            available: Доступное количество.
+        """
+        super().__init__(
+            f"Недостаточно товара '{name}': запрошено {requested}, доступно {available}"
+        )
+        self.name = name
+        self.requested = requested
+        self.available = available
+
+
+@dataclass
+class Reservation:
+    """Резерв товара для оформляемого заказа.
+
+    Атрибуты:
+        id: Номер резерва.
+        name: Название товара.
+        quantity: Зарезервированное количество.
+        expires_at: Момент истечения резерва (по часам склада).
+    """
+    id: int
+    name: str
+    quantity: int
+    expires_at: float
+
+
+class _Shard:
+    """Часть остатков склада со своей блокировкой."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустую часть."""
+        self.lock = threading.Lock()
+        self.on_hand: Dict[str, int] = {}
+        self.reserved: Dict[str, int] = {}
+
+
+class Inventory:
+    """Остатки товаров магазина с резервированием.
+
+    Остатки распределены по частям (shards) по названию товара, у каждой
+    части своя блокировка, поэтому оформление заказов с популярным
+    товаром не блокирует работу с остальными. Резерв уменьшает доступный
+    остаток; commit() списывает товар, release() возвращает резерв.
+    Резервы с истёкшим сроком хранятся в куче по времени истечения и
+    снимаются при очередных операциях (или вызове expire()).
+
+    Если указан storage_path, остатки (без резервов) загружаются из
+    JSON-файла и записываются в него пакетно: после flush_every
+    изменений или при вызове flush().
+    """
+
+    def __init__(
+        self,
+        store: Store,
+        shards: int = 64,
+        reservation_ttl: float = 900.0,
+        storage_path: Optional[Union[str, Path]] = None,
+        flush_every: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Инициализирует склад магазина.
+
+        Args:
+            store: Магазин, остатки товаров которого учитываются.
+            shards: Количество частей с отдельными блокировками.
+            reservation_ttl: Срок действия резерва по умолчанию в секундах.
+            storage_path: Путь к JSON-файлу с остатками.
+            flush_every: Количество изменений, после которого остатки записываются.
+            clock: Источник времени для сроков резервов.
+        """
+        self.store = store
+        self.reservation_ttl = reservation_ttl
+        self.storage_path = Path(storage_path) if storage_path else None
+        self.flush_every = flush_every
+        self.clock = clock
+        self._shards = [_Shard() for _ in range(shards)]
+        self._reservations: Dict[int, Reservation] = {}
+        self._ids = itertools.count(1)
+        # Куча сроков резервов: (момент истечения, номер резерва)
+        self._timers: List[Tuple[float, int]] = []
+        self._timers_lock = threading.Lock()
+        # Изменения остатков, ещё не записанные на диск (счётчик приблизительный:
+        # он только определяет момент пакетной записи)
+        self._pending = 0
+        self._flush_lock = threading.Lock()
+
+        if self.storage_path is not None and self.storage_path.exists():
+            self._load(self.storage_path)
+        store.add_listener(self._on_store_events)
+
+    def _shard(self, name: str) -> _Shard:
+        """Возвращает часть склада, в которой учитывается товар.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Часть склада.
+        """
+        return self._shards[hash(name) % len(self._shards)]
+
+    def _check_product(self, name: str, quantity: int) -> None:
+        """Проверяет наличие товара в магазине и количество.
+
+        Args:
+            name: Название товара.
+            quantity: Количество.
+
+        Raises:
+            ValueError: Если товара нет в магазине или количество отрицательно.
+        """
+        if name not in self.store:
+            error_msg = f"Товар '{name}' не найден в магазине '{self.store.name}'"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        if quantity < 0:
+            error_msg = f"Количество товара не может быть отрицательным: {quantity}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+    def set_stock(self, name: str, quantity: int) -> None:
+        """Устанавливает остаток товара на складе.
+
+        Args:
+            name: Название товара.
+            quantity: Количество на складе (включая зарезервированное).
+
+        Raises:
+            ValueError: Если товара нет в магазине, количество отрицательно
+                или меньше зарезервированного.
+        """
+        self._check_product(name, quantity)
+        shard = self._shard(name)
+        with shard.lock:
+            reserved = shard.reserved.get(name, 0)
+            if quantity < reserved:
+                error_msg = (
+                    f"Остаток товара '{name}' не может быть меньше резерва: "
+                    f"{quantity} < {reserved}"
+                )
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            shard.on_hand[name] = quantity
+        self._changed()
+
+    def add_stock(self, name: str, quantity: int) -> int:
+        """Увеличивает остаток товара (поступление на склад).
+
+        Args:
+            name: Название товара.
+            quantity: Поступившее количество.
+
+        Returns:
+            Новый остаток товара.
+
+        Raises:
+            ValueError: Если товара нет в магазине или количество отрицательно.
+        """
+        self._check_product(name, quantity)
+        shard = self._shard(name)
+        with shard.lock:
+            on_hand = shard.on_hand.get(name, 0) + quantity
+            shard.on_hand[name] = on_hand
+        self._changed()
+        return on_hand
+
+    def get_stock(self, name: str) -> int:
+        """Возвращает количество товара на складе, включая резерв."""
+        return self._shard(name).on_hand.get(name, 0)
+
+    def get_reserved(self, name: str) -> int:
+        """Возвращает зарезервированное количество товара."""
+        self.expire()
+        return self._shard(name).reserved.get(name, 0)
+
+    def get_available(self, name: str) -> int:
+        """Возвращает количество товара, доступное для резервирования."""
+        self.expire()
+        shard = self._shard(name)
+        with shard.lock:
+            return shard.on_hand.get(name, 0) - shard.reserved.get(name, 0)
+
+    def reserve(self, name: str, quantity: int = 1, ttl: Optional[float] = None) -> int:
+        """Резервирует товар для заказа.
+
+        Args:
+            name: Название товара.
+            quantity: Количество.
+            ttl: Срок действия резерва в секундах (по умолчанию reservation_ttl).
+
+        Returns:
+            Номер резерва.
+
+        Raises:
+            ValueError: Если товара нет в магазине или количество неположительно.
+            InsufficientStockError: Если доступного остатка не хватает.
+        """
+        if quantity <= 0:
+            error_msg = f"Количество резервируемого товара должно быть положительным: {quantity}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        self._check_product(name, quantity)
+        self.expire()
+
+        shard = self._shard(name)
+        with shard.lock:
+            reserved = shard.reserved.get(name, 0)
+            available = shard.on_hand.get(name, 0) - reserved
+            if available < quantity:
+                # Нехватка остатка - обычная ситуация при оформлении заказов
+                error = InsufficientStockError(name, quantity, available)
+                logger.debug("%s", error)
+                raise error
+            shard.reserved[name] = reserved + quantity
+
+        expires_at = self.clock() + (self.reservation_ttl if ttl is None else ttl)
+        reservation = Reservation(next(self._ids), name, quantity, expires_at)
+        self._reservations[reservation.id] = reservation
+        with self._timers_lock:
+            heapq.heappush(self._timers, (expires_at, reservation.id))
+        return reservation.id
+
+    def _take(self, reservation_id: int, write_off: bool = False) -> Optional[Reservation]:
+        """Забирает резерв и снимает его с учёта зарезервированного.
+
+        Args:
+            reservation_id: Номер резерва.
+            write_off: Списать ли товар со склада вместе со снятием резерва.
+
+        Returns:
+            Резерв или None, если он уже списан, отменён или истёк.
+        """
+        reservation = self._reservations.pop(reservation_id, None)
+        if reservation is None:
+            return None
+        name = reservation.name
+        shard = self._shard(name)
+        with shard.lock:
+            left = shard.reserved.get(name, 0) - reservation.quantity
+            if left > 0:
+                shard.reserved[name] = left
+            else:
+                shard.reserved.pop(name, None)
+            if write_off and name in shard.on_hand:
+                shard.on_hand[name] -= reservation.quantity
+        return reservation
+
+    def release(self, reservation_id: int) -> bool:
+        """Отменяет резерв, возвращая товар в доступный остаток.
+
+        Args:
+            reservation_id: Номер резерва.
+
+        Returns:
+            True, если резерв отменён, иначе False.
+        """
+        return self._take(reservation_id) is not None
+
+    def commit(self, reservation_id: int) -> bool:
+        """Списывает зарезервированный товар со склада (заказ оплачен).
+
+        Args:
+            reservation_id: Номер резерва.
+
+        Returns:
+            True, если товар списан, и False, если резерв уже списан,
+            отменён или истёк.
+        """
+        self.expire()
+        if self._take(reservation_id, write_off=True) is None:
+            logger.warning("Резерв %s не найден или истёк", reservation_id)
+            return False
+        self._changed()
+        return True
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Снимает резервы с истёкшим сроком.
+
+        Args:
+            now: Текущий момент (по умолчанию - по часам склада).
+
+        Returns:
+            Количество снятых резервов.
+        """
+        now = self.clock() if now is None else now
+        # Быстрая проверка без блокировки: другой поток может забрать
+        # последний срок между проверкой и чтением, тогда снимать нечего
+        try:
+            if self._timers[0][0] > now:
+                return 0
+        except IndexError:
+            return 0
+        due = []
+        with self._timers_lock:
+            while self._timers and self._timers[0][0] <= now:
+                due.append(heapq.heappop(self._timers)[1])
+        expired = sum(1 for reservation_id in due if self._take(reservation_id) is not None)
+        if expired:
+            logger.info("Снято просроченных резервов в магазине '%s': %s", self.store.name, expired)
+        return expired
+
+    def _on_store_events(self, store: Store, events: List[StoreEvent]) -> None:
+        """Удаляет остатки и резервы товаров, удалённых из магазина.
+
+        Args:
+            store: Магазин.
+            events: Список изменений ассортимента.
+        """
+        removed = {event.product.name for event in events if event.kind == 'remove'}
+        if not removed:
+            return
+        for reservation in list(self._reservations.values()):
+            if reservation.name in removed:
+                self._reservations.pop(reservation.id, None)
+        for name in removed:
+            shard = self._shard(name)
+            with shard.lock:
+                shard.on_hand.pop(name, None)
+                shard.reserved.pop(name, None)
+        self._changed()
+
+    @property
+    def active_reservations(self) -> int:
+        """Количество действующих резервов."""
+        return len(self._reservations)
+
+    def _changed(self) -> None:
+        """Учитывает изменение остатков и записывает их, если накопился пакет."""
+        if self.storage_path is None:
+            return
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> bool:
+        """Записывает остатки на диск, если есть незаписанные изменения.
+
+        Returns:
+            True, если остатки записаны, иначе False.
+        """
+        if self.storage_path is None:
+            return False
+        with self._flush_lock:
+            if not self._pending:
+                return False
+            self._pending = 0
+            snapshot = {}
+            for shard in self._shards:
+                with shard.lock:
+                    snapshot.update(shard.on_hand)
+            tmp_path = self.storage_path.with_name(self.storage_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.storage_path)
+        logger.info("Остатки магазина '%s' записаны: %s товаров", self.store.name, len(snapshot))
+        return True
+
+    def _load(self, path: Path) -> None:
+        """Загружает остатки товаров, которые есть в магазине.
+
+        Args:
+            path: Путь к файлу остатков.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for name, quantity in data.items():
+            if name in self.store:
+                self._shard(name).on_hand[name] = quantity
+        logger.info("Остатки магазина '%s' загружены из %s", self.store.name, path)
@@ -0,0 +1,253 @@
+"""Модуль для настройки журналирования через фоновую очередь.
+
+Записи журнала помещаются в ограниченную очередь, а запись в файл и
+вывод на экран выполняет отдельный поток (QueueListener), поэтому
+операции с задачами и магазинами не ждут дискового ввода-вывода. При
+переполнении очереди записи отбрасываются с подсчётом, а частые
+однотипные сообщения можно ограничить по скорости.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+# Формат записей журнала
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Размер очереди записей по умолчанию
+DEFAULT_QUEUE_SIZE = 10000
+
+_active: Optional['LoggingPipeline'] = None
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Обработчик, помещающий записи в ограниченную очередь без ожидания.
+
+    В вызывающем потоке только подставляются аргументы сообщения (чтобы
+    оно отражало состояние объектов на момент вызова); время, формат
+    строки и вывод обрабатываются потоком QueueListener. Если очередь
+    заполнена, запись отбрасывается.
+
+    Атрибуты:
+        dropped: Количество отброшенных записей.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        """Инициализирует обработчик.
+
+        Args:
+            log_queue: Ограниченная очередь записей.
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Подставляет аргументы сообщения и текст исключения в запись.
+
+        Запись изменяется на месте, без копирования: другие обработчики
+        получат то же готовое сообщение.
+
+        Args:
+            record: Запись журнала.
+
+        Returns:
+            Запись, которую можно передать в другой поток.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Помещает запись в очередь или отбрасывает её, если очередь заполнена.
+
+        Args:
+            record: Подготовленная запись.
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """Ограничивает частоту однотипных сообщений.
+
+    Сообщения различаются по имени журнала и шаблону (record.msg до
+    подстановки аргументов), поэтому, например, все "Создана новая
+    задача: %s" считаются одним видом. Для каждого вида действует
+    "ведро жетонов": до burst сообщений подряд и далее rate сообщений
+    в секунду. Сообщения выше max_level (предупреждения и ошибки по
+    умолчанию) не ограничиваются.
+
+    Атрибуты:
+        suppressed: Количество пропущенных сообщений.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 100, max_level: int = logging.INFO,
+                 clock: Callable[[], float] = time.monotonic):
+        """Инициализирует фильтр.
+
+        Args:
+            rate: Количество сообщений одного вида в секунду.
+            burst: Количество сообщений одного вида подряд.
+            max_level: Наибольший ограничиваемый уровень.
+            clock: Источник времени.
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_level = max_level
+        self.clock = clock
+        self.suppressed = 0
+        # Вид сообщения -> (доступные жетоны, момент последнего пополнения)
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Проверяет, можно ли пропустить запись.
+
+        Args:
+            record: Запись журнала.
+
+        Returns:
+            True, если запись пропускается, иначе False.
+        """
+        if record.levelno > self.max_level:
+            return True
+        key = (record.name, str(record.msg))
+        now = self.clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.suppressed += 1
+                return False
+            self._buckets[key] = (tokens - 1, now)
+        return True
+
+
+class LoggingPipeline:
+    """Настроенный конвейер журналирования.
+
+    Атрибуты:
+        logger: Журнал, к которому подключён обработчик очереди.
+        handler: Обработчик очереди.
+        listener: Поток, передающий записи конечным обработчикам.
+        rate_filter: Фильтр частоты сообщений (если задан).
+    """
+
+    def __init__(self, logger: logging.Logger, handler: DroppingQueueHandler,
+                 listener: logging.handlers.QueueListener,
+                 rate_filter: Optional[RateLimitFilter]):
+        """Инициализирует конвейер."""
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self.rate_filter = rate_filter
+        self._previous_level = logger.level
+
+    @property
+    def dropped(self) -> int:
+        """Количество записей, отброшенных из-за переполнения очереди."""
+        return self.handler.dropped
+
+    @property
+    def suppressed(self) -> int:
+        """Количество записей, пропущенных фильтром частоты."""
+        return self.rate_filter.suppressed if self.rate_filter is not None else 0
+
+    def stop(self) -> None:
+        """Отключает обработчик, дописывает записи из очереди и закрывает файлы.
+
+        Уровень журнала возвращается к значению до настройки.
+        """
+        global _active
+        if self.handler not in self.logger.handlers:
+            return
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self._previous_level)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        if self.dropped or self.suppressed:
+            logging.getLogger(__name__).warning(
+                "Журнал: отброшено записей %d, пропущено фильтром частоты %d",
+                self.dropped, self.suppressed,
+            )
+        if _active is self:
+            _active = None
+
+
+def configure_logging(
+    level: int = logging.INFO,
+    log_file: Optional[Union[str, Path]] = None,
+    stream: bool = True,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    rate: Optional[float] = None,
+    burst: int = 100,
+    logger_name: str = '',
+    fmt: str = LOG_FORMAT,
+) -> LoggingPipeline:
+    """Настраивает журналирование через фоновую очередь.
+
+    Повторный вызов заменяет ранее настроенный конвейер. При завершении
+    программы оставшиеся записи дописываются автоматически.
+
+    Args:
+        level: Уровень журнала.
+        log_file: Путь к файлу журнала (None - без файла).
+        stream: Выводить ли записи в stderr.
+        queue_size: Наибольшее количество записей в очереди.
+        rate: Количество однотипных сообщений в секунду (None - без ограничения).
+        burst: Количество однотипных сообщений подряд при ограничении.
+        logger_name: Имя настраиваемого журнала ('' - корневой).
+        fmt: Формат записей.
+
+    Returns:
+        Настроенный конвейер.
+    """
+    global _active
+    if _active is not None:
+        _active.stop()
+
+    formatter = logging.Formatter(fmt)
+    handlers: List[logging.Handler] = []
+    if log_file is not None:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    if stream:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    rate_filter = None
+    if rate is not None:
+        rate_filter = RateLimitFilter(rate=rate, burst=burst)
+        handler.addFilter(rate_filter)
+    listener = logging.handlers.QueueListener(handler.queue, *handlers, respect_handler_level=True)
+
+    logger = logging.getLogger(logger_name)
+    _active = LoggingPipeline(logger, handler, listener, rate_filter)
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    listener.start()
+    return _active
+
+
+@atexit.register
+def _stop_active() -> None:
+    """Дописывает записи из очереди при завершении программы."""
+    if _active is not None:
+        _active.stop()
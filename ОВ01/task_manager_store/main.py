@@ -11,16 +11,8 @@ from typing import Dict, Any
 # Импортируем наши классы
 from .task import Task, TaskManager
 from .store import Store, Product
+from .log import configure_logging
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 def setup_demo_tasks() -> TaskManager:
@@ -177,6 +169,9 @@ def demo_store_operations():
 
 def main():
     """Главная функция приложения."""
+    # Записи пишутся фоновым потоком; однотипные сообщения о каждой
+    # операции ограничиваются по частоте
+    configure_logging(log_file="app.log", rate=20.0)
     try:
         # Демонстрация работы с задачами
         demo_task_manager()
@@ -189,7 +184,7 @@ def main():
         print("="*50)
         
     except Exception as e:
-        logger.error(f"Произошла ошибка: {e}", exc_info=True)
+        logger.error("Произошла ошибка: %s", e, exc_info=True)
         print(f"\nПроизошла ошибка: {e}")
 
 if __name__ == "__main__":
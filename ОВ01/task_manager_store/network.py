@@ -0,0 +1,271 @@
+"""Модуль для работы с сетью магазинов."""
+
+import heapq
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .indexes import BloomFilter, PrefixIndex
+from .store import Store, StoreEvent, StoreListener
+
+logger = logging.getLogger(__name__)
+
+
+class StoreNetwork:
+    """Сеть магазинов с общим индексом товаров.
+
+    Сеть подписывается на изменения каждого магазина и поддерживает
+    индекс "название товара -> {магазин: цена}", поэтому поиск магазинов
+    с товаром и самой низкой цены не обращается ко всем магазинам.
+    Для каждого магазина ведётся фильтр Блума по названиям товаров,
+    позволяющий быстро убедиться, что товара в магазине нет.
+    Индекс названий всей сети позволяет искать товары по префиксу.
+    """
+
+    def __init__(self, bloom_error_rate: float = 0.01):
+        """Инициализирует пустую сеть.
+
+        Args:
+            bloom_error_rate: Вероятность ложного срабатывания фильтров Блума.
+        """
+        self.bloom_error_rate = bloom_error_rate
+        self._stores: Dict[str, Store] = {}
+        self._listeners: Dict[str, StoreListener] = {}
+        # Общий индекс: название товара -> {ключ магазина: цена}
+        self._index: Dict[str, Dict[str, float]] = {}
+        # Названия товаров сети для поиска по префиксу
+        self._names = PrefixIndex()
+        self._blooms: Dict[str, BloomFilter] = {}
+        # Количество удалённых товаров, оставшихся в фильтре Блума магазина
+        self._bloom_stale: Dict[str, int] = {}
+
+    def add_store(self, store: Store, key: Optional[str] = None) -> str:
+        """Добавляет магазин в сеть.
+
+        Args:
+            store: Магазин.
+            key: Уникальный ключ магазина (по умолчанию - название).
+
+        Returns:
+            Ключ магазина в сети.
+
+        Raises:
+            ValueError: Если магазин с таким ключом уже есть в сети.
+        """
+        key = key or store.name
+        if key in self._stores:
+            error_msg = f"Магазин '{key}' уже есть в сети"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self._stores[key] = store
+        for product in store.get_items():
+            self._index_price(product.name, key, product.price)
+        self._rebuild_bloom(key)
+
+        def listener(changed_store: Store, events: List[StoreEvent]) -> None:
+            self._on_store_events(key, events)
+
+        self._listeners[key] = listener
+        store.add_listener(listener)
+        logger.info("Магазин '%s' добавлен в сеть, товаров: %s", key, len(store))
+        return key
+
+    def remove_store(self, key: str) -> bool:
+        """Удаляет магазин из сети.
+
+        Args:
+            key: Ключ магазина.
+
+        Returns:
+            True, если магазин был удалён, иначе False.
+        """
+        store = self._stores.pop(key, None)
+        if store is None:
+            return False
+        store.remove_listener(self._listeners.pop(key))
+        for product in store.get_items():
+            self._unindex(product.name, key)
+        del self._blooms[key]
+        del self._bloom_stale[key]
+        logger.info("Магазин '%s' удалён из сети", key)
+        return True
+
+    def _index_price(self, name: str, key: str, price: float) -> None:
+        """Добавляет цену товара магазина в общий индекс.
+
+        Args:
+            name: Название товара.
+            key: Ключ магазина.
+            price: Цена товара.
+        """
+        prices = self._index.get(name)
+        if prices is None:
+            prices = self._index[name] = {}
+            self._names.add(name)
+        prices[key] = price
+
+    def _unindex(self, name: str, key: str) -> None:
+        """Удаляет запись о товаре магазина из общего индекса.
+
+        Args:
+            name: Название товара.
+            key: Ключ магазина.
+        """
+        prices = self._index.get(name)
+        if prices is not None:
+            prices.pop(key, None)
+            if not prices:
+                del self._index[name]
+                self._names.remove(name)
+
+    def _rebuild_bloom(self, key: str) -> None:
+        """Перестраивает фильтр Блума магазина с запасом по ёмкости.
+
+        Args:
+            key: Ключ магазина.
+        """
+        store = self._stores[key]
+        bloom = BloomFilter(max(1024, 2 * len(store)), self.bloom_error_rate)
+        for product in store.get_items():
+            bloom.add(product.name)
+        self._blooms[key] = bloom
+        self._bloom_stale[key] = 0
+
+    def _on_store_events(self, key: str, events: List[StoreEvent]) -> None:
+        """Обновляет общий индекс по изменениям магазина.
+
+        Args:
+            key: Ключ магазина.
+            events: Список изменений ассортимента.
+        """
+        bloom = self._blooms[key]
+        for event in events:
+            name = event.product.name
+            if event.kind == 'add':
+                self._index_price(name, key, event.added_price)
+                bloom.add(name)
+            elif event.kind == 'remove':
+                self._unindex(name, key)
+                self._bloom_stale[key] += 1
+            else:
+                self._index[name][key] = event.added_price
+
+        # Перестраиваем фильтр, если он переполнен или накопил много удалённых
+        if len(bloom) > bloom.capacity or self._bloom_stale[key] > bloom.capacity // 2:
+            self._rebuild_bloom(key)
+
+    def might_carry(self, key: str, name: str) -> bool:
+        """Быстро проверяет, может ли магазин продавать товар.
+
+        Ответ False точен; ответ True может оказаться ложным срабатыванием.
+
+        Args:
+            key: Ключ магазина.
+            name: Название товара.
+
+        Returns:
+            False, если товара в магазине точно нет, иначе True.
+        """
+        bloom = self._blooms.get(key)
+        return bloom is not None and name in bloom
+
+    def stores_carrying(self, name: str) -> List[Store]:
+        """Возвращает магазины, в которых есть товар.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Список магазинов.
+        """
+        return [self._stores[key] for key in self._index.get(name, {})]
+
+    def get_prices(self, name: str) -> Dict[str, float]:
+        """Возвращает цены товара по магазинам.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Словарь, где ключ - ключ магазина, значение - цена.
+        """
+        return dict(self._index.get(name, {}))
+
+    def find_cheapest(self, name: str) -> Optional[Tuple[Store, float]]:
+        """Находит магазин с самой низкой ценой на товар.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Кортеж (магазин, цена) или None, если товара нет ни в одном магазине.
+        """
+        prices = self._index.get(name)
+        if not prices:
+            return None
+        key = min(prices, key=prices.__getitem__)
+        return self._stores[key], prices[key]
+
+    def autocomplete(self, prefix: str, limit: int = 10,
+                     order: str = 'name') -> List[Tuple[str, float]]:
+        """Возвращает товары сети, название которых начинается с префикса.
+
+        Args:
+            prefix: Начало названия товара (регистр не учитывается).
+            limit: Максимальное количество товаров.
+            order: Порядок: 'name' - по названию, 'price' - по возрастанию
+                самой низкой цены в сети.
+
+        Returns:
+            Список пар (название товара, самая низкая цена в сети).
+
+        Raises:
+            ValueError: Если порядок сортировки неизвестен.
+        """
+        if order not in ('name', 'price'):
+            error_msg = f"Неизвестный порядок сортировки подсказок: {order}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if order == 'name':
+            names = self._names.search(prefix, limit)
+            return [(name, min(self._index[name].values())) for name in names]
+        matches = [
+            (name, min(self._index[name].values())) for name in self._names.search(prefix)
+        ]
+        return heapq.nsmallest(limit, matches, key=lambda match: (match[1], match[0]))
+
+    def get_store(self, key: str) -> Optional[Store]:
+        """Возвращает магазин по ключу.
+
+        Args:
+            key: Ключ магазина.
+
+        Returns:
+            Магазин или None, если не найден.
+        """
+        return self._stores.get(key)
+
+    def get_stores(self) -> Dict[str, Store]:
+        """Возвращает магазины сети.
+
+        Returns:
+            Словарь, где ключ - ключ магазина, значение - магазин.
+        """
+        return dict(self._stores)
+
+    def get_product_names(self) -> List[str]:
+        """Возвращает названия всех товаров сети.
+
+        Returns:
+            Список уникальных названий товаров.
+        """
+        return list(self._index)
+
+    def __len__(self) -> int:
+        """Возвращает количество магазинов в сети."""
+        return len(self._stores)
+
+    def __contains__(self, key: str) -> bool:
+        """Проверяет наличие магазина в сети."""
+        return key in self._stores
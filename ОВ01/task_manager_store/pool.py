@@ -0,0 +1,387 @@
+"""Модуль для хранения менеджеров задач множества пользователей."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from .task import TaskManager
+
+logger = logging.getLogger(__name__)
+
+# Оценка памяти: пустой менеджер и одна задача с индексами (в байтах)
+MANAGER_BASE_SIZE = 4096
+TASK_SIZE = 1024
+
+# Количество блокировок записи; пользователь выбирает свою по хешу
+_WRITE_LOCK_STRIPES = 64
+
+
+def estimate_manager_size(manager: TaskManager) -> int:
+    """Приблизительно оценивает объём памяти менеджера задач.
+
+    Args:
+        manager: Менеджер задач.
+
+    Returns:
+        Оценка размера в байтах.
+    """
+    return MANAGER_BASE_SIZE + TASK_SIZE * len(manager)
+
+
+@dataclass
+class PoolStats:
+    """Статистика работы пула менеджеров задач.
+
+    Атрибуты:
+        hits: Обращения к уже загруженным менеджерам.
+        misses: Обращения, потребовавшие загрузки с диска.
+        coalesced: Обращения, дождавшиеся загрузки, начатой другим потоком.
+        evictions: Менеджеры, вытесненные из памяти.
+        writebacks: Изменённые менеджеры, записанные на диск.
+    """
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    writebacks: int = 0
+
+
+class TaskManagerPool:
+    """Пул менеджеров задач пользователей с вытеснением по LRU.
+
+    Менеджер пользователя загружается с диска при первом обращении.
+    В памяти хранится ограниченное количество недавно использованных
+    менеджеров; при превышении лимита или бюджета памяти наименее
+    используемые вытесняются, а изменённые записываются на диск.
+    Одновременные обращения к одному незагруженному пользователю
+    выполняют загрузку только один раз.
+
+    Менеджер, полученный из пула, не следует хранить долго: изменения,
+    сделанные после его вытеснения, не будут сохранены. Менеджер, который
+    не удалось записать при вытеснении, остаётся в очереди записи и
+    сохраняется следующим вызовом flush().
+    """
+
+    def __init__(
+        self,
+        storage_dir: Union[str, Path],
+        max_managers: int = 1024,
+        memory_budget: Optional[int] = None,
+        size_estimator: Callable[[TaskManager], int] = estimate_manager_size,
+    ):
+        """Инициализирует пул.
+
+        Args:
+            storage_dir: Каталог для файлов менеджеров задач.
+            max_managers: Максимальное количество менеджеров в памяти.
+            memory_budget: Бюджет памяти в байтах (None - без ограничения).
+            size_estimator: Функция оценки размера менеджера в байтах.
+
+        Raises:
+            ValueError: Если лимиты заданы неверно.
+        """
+        if max_managers < 1:
+            error_msg = f"Размер пула должен быть положительным: {max_managers}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if memory_budget is not None and memory_budget <= 0:
+            error_msg = f"Бюджет памяти должен быть положительным: {memory_budget}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.storage_dir = Path(storage_dir)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        self.max_managers = max_managers
+        self.memory_budget = memory_budget
+        self._size_estimator = size_estimator
+
+        self._lock = threading.Lock()
+        # Загруженные менеджеры в порядке использования (последний - самый свежий)
+        self._managers: 'OrderedDict[str, TaskManager]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._memory_usage = 0
+        # Версия менеджера на момент последней загрузки или записи
+        self._saved_versions: Dict[str, int] = {}
+        # Загрузки, выполняющиеся в данный момент
+        self._loading: Dict[str, 'Future[TaskManager]'] = {}
+        # Вытесненные менеджеры, запись которых ещё не завершена или не удалась
+        self._writing: Dict[str, TaskManager] = {}
+        # Записи одного пользователя выполняются по очереди, чтобы более
+        # старый снимок не заменил на диске более новый
+        self._write_locks = [threading.Lock() for _ in range(_WRITE_LOCK_STRIPES)]
+        self._stats = PoolStats()
+
+    def _path(self, tenant_id: str) -> Path:
+        """Возвращает путь к файлу менеджера пользователя.
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+
+        Returns:
+            Путь к файлу.
+        """
+        return self.storage_dir / f"{quote(tenant_id, safe='')}.json"
+
+    def _load_manager(self, tenant_id: str) -> TaskManager:
+        """Загружает менеджер пользователя с диска.
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+
+        Returns:
+            Загруженный менеджер или новый, если файла нет.
+        """
+        path = self._path(tenant_id)
+        if not path.exists():
+            return TaskManager()
+        with open(path, encoding="utf-8") as f:
+            return TaskManager.from_dict(json.load(f))
+
+    def _save_manager(self, tenant_id: str, manager: TaskManager) -> int:
+        """Атомарно записывает менеджер пользователя на диск.
+
+        Каждая запись идёт во временный файл с уникальным именем. Записи
+        одного пользователя (вытеснение и flush()) выполняются под его
+        блокировкой записи: снимок снимается после ожидания, поэтому
+        последним файл заменяет самый новый из них.
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+            manager: Менеджер задач.
+
+        Returns:
+            Версия записанного менеджера.
+        """
+        with self._write_locks[hash(tenant_id) % _WRITE_LOCK_STRIPES]:
+            version = manager.version
+            self._write_file(self._path(tenant_id), manager)
+        return version
+
+    @staticmethod
+    def _write_file(path: Path, manager: TaskManager) -> None:
+        """Записывает менеджер во временный файл и заменяет им файл path.
+
+        Args:
+            path: Путь к файлу.
+            manager: Менеджер задач.
+        """
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".",
+            suffix=".tmp", delete=False,
+        ) as f:
+            tmp_path = f.name
+            try:
+                json.dump(manager.to_dict(), f, ensure_ascii=False)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+    def get(self, tenant_id: str) -> TaskManager:
+        """Возвращает менеджер задач пользователя, загружая его при необходимости.
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+
+        Returns:
+            Менеджер задач пользователя.
+        """
+        owner = False
+        victims: Dict[str, TaskManager] = {}
+        with self._lock:
+            manager = self._managers.get(tenant_id)
+            if manager is None:
+                manager = self._writing.get(tenant_id)
+                if manager is not None:
+                    # Менеджер ещё записывается после вытеснения - возвращаем его в пул
+                    self._insert(tenant_id, manager)
+            if manager is not None:
+                self._managers.move_to_end(tenant_id)
+                self._stats.hits += 1
+                self._resize(tenant_id, manager)
+                victims = self._collect_victims()
+            else:
+                future = self._loading.get(tenant_id)
+                if future is not None:
+                    self._stats.coalesced += 1
+                else:
+                    self._stats.misses += 1
+                    future = Future()
+                    self._loading[tenant_id] = future
+                    owner = True
+
+        if manager is not None:
+            self._write_back(victims)
+            return manager
+
+        assert future is not None
+        if not owner:
+            return future.result()
+
+        try:
+            manager = self._load_manager(tenant_id)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[tenant_id]
+            future.set_exception(e)
+            logger.error("Ошибка при загрузке задач пользователя '%s': %s", tenant_id, e)
+            raise
+
+        with self._lock:
+            del self._loading[tenant_id]
+            self._saved_versions[tenant_id] = manager.version
+            self._insert(tenant_id, manager)
+            victims = self._collect_victims()
+        future.set_result(manager)
+        logger.info("Загружены задачи пользователя '%s': %s", tenant_id, len(manager))
+        self._write_back(victims)
+        return manager
+
+    def _insert(self, tenant_id: str, manager: TaskManager) -> None:
+        """Помещает менеджер в пул (вызывается под блокировкой).
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+            manager: Менеджер задач.
+        """
+        self._writing.pop(tenant_id, None)
+        self._managers[tenant_id] = manager
+        self._sizes[tenant_id] = 0
+        self._resize(tenant_id, manager)
+
+    def _resize(self, tenant_id: str, manager: TaskManager) -> None:
+        """Обновляет оценку размера менеджера (вызывается под блокировкой).
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+            manager: Менеджер задач.
+        """
+        size = self._size_estimator(manager)
+        self._memory_usage += size - self._sizes[tenant_id]
+        self._sizes[tenant_id] = size
+
+    def _collect_victims(self) -> Dict[str, TaskManager]:
+        """Вытесняет менеджеры сверх лимитов (вызывается под блокировкой).
+
+        Самый свежий менеджер не вытесняется никогда.
+
+        Returns:
+            Изменённые вытесненные менеджеры, которые нужно записать на диск.
+        """
+        victims = {}
+        while len(self._managers) > 1 and (
+            len(self._managers) > self.max_managers
+            or (self.memory_budget is not None and self._memory_usage > self.memory_budget)
+        ):
+            tenant_id, manager = self._managers.popitem(last=False)
+            self._memory_usage -= self._sizes.pop(tenant_id)
+            self._stats.evictions += 1
+            if manager.version != self._saved_versions.get(tenant_id):
+                victims[tenant_id] = manager
+                self._writing[tenant_id] = manager
+            else:
+                self._saved_versions.pop(tenant_id, None)
+        return victims
+
+    def _write(self, tenant_id: str, manager: TaskManager) -> None:
+        """Записывает менеджер на диск и отмечает его сохранённым.
+
+        Args:
+            tenant_id: Идентификатор пользователя.
+            manager: Менеджер задач.
+        """
+        version = self._save_manager(tenant_id, manager)
+        with self._lock:
+            self._stats.writebacks += 1
+            if self._writing.get(tenant_id) is manager:
+                del self._writing[tenant_id]
+                self._saved_versions.pop(tenant_id, None)
+            elif self._managers.get(tenant_id) is manager:
+                self._saved_versions[tenant_id] = version
+
+    def _write_back(self, victims: Dict[str, TaskManager]) -> None:
+        """Записывает вытесненные изменённые менеджеры на диск.
+
+        Ошибка записи одного менеджера не мешает записи остальных;
+        незаписанный менеджер остаётся в очереди записи для flush().
+
+        Args:
+            victims: Менеджеры для записи.
+        """
+        for tenant_id, manager in victims.items():
+            try:
+                self._write(tenant_id, manager)
+            except Exception as e:
+                logger.error(
+                    "Не удалось сохранить задачи пользователя '%s' при вытеснении: %s",
+                    tenant_id, e
+                )
+                continue
+            logger.info("Задачи пользователя '%s' сохранены при вытеснении", tenant_id)
+
+    def flush(self) -> int:
+        """Записывает на диск все изменённые менеджеры, оставляя их в памяти.
+
+        Записываются и вытесненные менеджеры, запись которых не удалась.
+
+        Returns:
+            Количество записанных менеджеров.
+
+        Raises:
+            OSError: Первая ошибка записи, если какой-то менеджер не удалось
+                записать (остальные при этом записываются).
+        """
+        with self._lock:
+            dirty: List[Tuple[str, TaskManager]] = [
+                (tenant_id, manager)
+                for tenant_id, manager in self._managers.items()
+                if manager.version != self._saved_versions.get(tenant_id)
+            ]
+            dirty.extend(self._writing.items())
+        written = 0
+        error: Optional[Exception] = None
+        for tenant_id, manager in dirty:
+            try:
+                self._write(tenant_id, manager)
+            except Exception as e:
+                logger.error("Не удалось сохранить задачи пользователя '%s': %s", tenant_id, e)
+                error = error or e
+                continue
+            written += 1
+        if written:
+            logger.info("Сохранены задачи пользователей: %s", written)
+        if error is not None:
+            raise error
+        return written
+
+    def stats(self) -> PoolStats:
+        """Возвращает копию статистики пула.
+
+        Returns:
+            Статистика обращений и вытеснений.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def memory_usage(self) -> int:
+        """Оценка памяти, занятой загруженными менеджерами, в байтах."""
+        return self._memory_usage
+
+    def __len__(self) -> int:
+        """Возвращает количество загруженных менеджеров."""
+        return len(self._managers)
+
+    def __contains__(self, tenant_id: str) -> bool:
+        """Проверяет, загружен ли менеджер пользователя."""
+        return tenant_id in self._managers
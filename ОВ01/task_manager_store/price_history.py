@@ -0,0 +1,477 @@
+"""Модуль для хранения истории цен товаров магазина."""
+
+import logging
+import math
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .store import Store, StoreEvent
+
+logger = logging.getLogger(__name__)
+
+# Момент времени: секунды с начала эпохи или datetime
+Timestamp = Union[float, datetime]
+
+
+def _to_millis(ts: Timestamp) -> int:
+    """Переводит момент времени в миллисекунды с начала эпохи.
+
+    Args:
+        ts: Секунды с начала эпохи или datetime.
+
+    Returns:
+        Количество миллисекунд.
+    """
+    if isinstance(ts, datetime):
+        ts = ts.timestamp()
+    return int(round(ts * 1000))
+
+
+# Вид записи цены в блоке - младшие два бита кода записи
+_PRICE_CENTS = 0   # разность цен в копейках: код = zigzag(разность) * 4
+_PRICE_ABSENT = 1  # товара нет в ассортименте
+_PRICE_EXACT = 2   # цена не выражается в копейках: далее 8 байт float64
+
+_FLOAT = struct.Struct('<d')
+
+
+def _encode_varint(buffer: bytearray, value: int) -> None:
+    """Дописывает неотрицательное целое число в буфер (varint).
+
+    Args:
+        buffer: Буфер.
+        value: Число.
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _decode_varint(data: Union[bytes, bytearray], position: int) -> Tuple[int, int]:
+    """Читает число, записанное _encode_varint.
+
+    Args:
+        data: Закодированные данные.
+        position: Позиция начала числа.
+
+    Returns:
+        Кортеж (число, позиция после числа).
+    """
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, position
+        shift += 7
+
+
+def _cents(price: float) -> Optional[int]:
+    """Возвращает цену в копейках, если она точно выражается в копейках.
+
+    Args:
+        price: Цена.
+
+    Returns:
+        Количество копеек или None (например, для 0.001 или 12.345).
+    """
+    if not math.isfinite(price):
+        return None
+    cents = round(price * 100)
+    return cents if cents / 100 == price else None
+
+
+class PriceSeries:
+    """Временной ряд цен одного товара.
+
+    Изменения хранятся блоками по chunk_size записей. Для каждого блока
+    в массиве хранится время первой записи, а сами записи кодируются
+    в байты блока: время - разностью с предыдущей записью (varint),
+    цена - разностью в копейках с предыдущей ценой, поэтому типичное
+    изменение занимает несколько байт. Цены, не выражаемые точно
+    в копейках, записываются целиком (8 байт); отсутствие товара
+    в ассортименте записывается отдельным видом записи. Время хранится
+    в миллисекундах.
+    """
+
+    def __init__(self, chunk_size: int = 128) -> None:
+        """Инициализирует пустой ряд.
+
+        Args:
+            chunk_size: Количество записей в блоке.
+        """
+        self.chunk_size = chunk_size
+        self._starts = array('q')
+        self._chunks: List[Union[bytes, bytearray]] = []
+        self._buffer = bytearray()
+        self._count = 0
+        self._last_ts = 0
+        self._last_cents = 0
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        """Время последней записи в миллисекундах (None для пустого ряда)."""
+        return self._last_ts if self._count else None
+
+    def append(self, ts: int, price: Optional[float]) -> None:
+        """Добавляет запись в конец ряда.
+
+        Args:
+            ts: Время в миллисекундах.
+            price: Цена или None, если товара нет.
+
+        Raises:
+            ValueError: Если время записи меньше времени последней записи.
+        """
+        if self._count and ts < self._last_ts:
+            error_msg = f"Записи истории цен должны идти по времени: {ts} < {self._last_ts}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if self._count % self.chunk_size == 0:
+            if self._chunks:
+                self._chunks[-1] = bytes(self._buffer)
+            self._buffer = bytearray()
+            self._chunks.append(self._buffer)
+            self._starts.append(ts)
+            self._last_cents = 0
+        else:
+            _encode_varint(self._buffer, ts - self._last_ts)
+        self._encode_price(price)
+        self._count += 1
+        self._last_ts = ts
+
+    def _encode_price(self, price: Optional[float]) -> None:
+        """Дописывает цену записи в текущий блок.
+
+        Args:
+            price: Цена или None, если товара нет.
+        """
+        if price is None:
+            _encode_varint(self._buffer, _PRICE_ABSENT)
+            return
+        cents = _cents(price)
+        if cents is None:
+            _encode_varint(self._buffer, _PRICE_EXACT)
+            self._buffer += _FLOAT.pack(price)
+            return
+        delta = cents - self._last_cents
+        zigzag = delta * 2 if delta >= 0 else -delta * 2 - 1
+        _encode_varint(self._buffer, zigzag * 4 + _PRICE_CENTS)
+        self._last_cents = cents
+
+    def _chunk_entries(self, index: int) -> List[Tuple[int, Optional[float]]]:
+        """Декодирует блок записей.
+
+        Args:
+            index: Номер блока.
+
+        Returns:
+            Список пар (время, цена или None).
+        """
+        data = self._chunks[index]
+        ts = self._starts[index]
+        cents = 0
+        entries: List[Tuple[int, Optional[float]]] = []
+        position = 0
+        while position < len(data):
+            if entries:
+                delta_ts, position = _decode_varint(data, position)
+                ts += delta_ts
+            code, position = _decode_varint(data, position)
+            kind = code & 3
+            price: Optional[float]
+            if kind == _PRICE_ABSENT:
+                price = None
+            elif kind == _PRICE_EXACT:
+                price = _FLOAT.unpack_from(data, position)[0]
+                position += _FLOAT.size
+            else:
+                zigzag = code >> 2
+                cents += zigzag >> 1 if not zigzag & 1 else -(zigzag >> 1) - 1
+                price = cents / 100
+            entries.append((ts, price))
+        return entries
+
+    def at(self, ts: int) -> Optional[float]:
+        """Возвращает цену, действовавшую в указанный момент.
+
+        Блок находится двоичным поиском по времени начала блоков,
+        запись внутри блока - двоичным поиском по декодированному блоку.
+
+        Args:
+            ts: Время в миллисекундах.
+
+        Returns:
+            Цена или None, если товара в этот момент не было.
+        """
+        index = bisect_right(self._starts, ts) - 1
+        if index < 0:
+            return None
+        entries = self._chunk_entries(index)
+        position = bisect_right([entry_ts for entry_ts, _ in entries], ts) - 1
+        return entries[position][1]
+
+    def entries(self, start: Optional[int] = None,
+                end: Optional[int] = None) -> List[Tuple[int, Optional[float]]]:
+        """Возвращает записи за период включительно.
+
+        Args:
+            start: Начало периода в миллисекундах (None - с начала ряда).
+            end: Конец периода в миллисекундах (None - до конца ряда).
+
+        Returns:
+            Список пар (время, цена или None) в порядке времени.
+        """
+        # Записи с временем start могут оказаться и в конце предыдущего блока
+        first = 0 if start is None else max(bisect_left(self._starts, start) - 1, 0)
+        last = len(self._chunks) if end is None else bisect_right(self._starts, end)
+        result = []
+        for index in range(first, last):
+            for ts, price in self._chunk_entries(index):
+                if (start is None or ts >= start) and (end is None or ts <= end):
+                    result.append((ts, price))
+        return result
+
+    @property
+    def nbytes(self) -> int:
+        """Объём памяти, занимаемый рядом, в байтах."""
+        return (
+            sys.getsizeof(self._starts) + sys.getsizeof(self._chunks)
+            + sum(sys.getsizeof(chunk) for chunk in self._chunks)
+        )
+
+    def __len__(self) -> int:
+        """Возвращает количество записей."""
+        return self._count
+
+
+class PriceBucket(NamedTuple):
+    """Агрегат цены товара за интервал времени.
+
+    Атрибуты:
+        start: Начало интервала (секунды с начала эпохи).
+        low: Минимальная цена за интервал.
+        high: Максимальная цена за интервал.
+        close: Цена на конец интервала (None, если товара уже нет).
+    """
+    start: float
+    low: float
+    high: float
+    close: Optional[float]
+
+
+class PriceHistory:
+    """История цен товаров магазина.
+
+    История подписывается на изменения магазина и записывает каждое
+    добавление товара, изменение цены и удаление в компактный ряд
+    PriceSeries. Изменения транзакции записываются с одним временем
+    при её завершении; откаченные изменения в историю не попадают.
+    Если часы отстают от времени последней записи товара (например,
+    после коррекции NTP), изменение записывается со временем последней
+    записи, поэтому подписчик магазина никогда не завершается ошибкой.
+    """
+
+    def __init__(self, store: Optional[Store] = None, chunk_size: int = 128,
+                 clock: Callable[[], float] = time.time) -> None:
+        """Инициализирует историю цен.
+
+        Args:
+            store: Магазин, изменения которого записываются.
+            chunk_size: Количество записей в блоке ряда.
+            clock: Источник текущего времени (секунды с начала эпохи).
+        """
+        self.chunk_size = chunk_size
+        self.clock = clock
+        self._series: Dict[str, PriceSeries] = {}
+        self._store: Optional[Store] = None
+        if store is not None:
+            self.attach(store)
+
+    def attach(self, store: Store) -> None:
+        """Подписывает историю на изменения магазина.
+
+        Текущие цены магазина записываются как начальные.
+
+        Args:
+            store: Магазин.
+
+        Raises:
+            ValueError: Если история уже подписана на магазин.
+        """
+        if self._store is not None:
+            error_msg = f"История цен уже подписана на магазин '{self._store.name}'"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        ts = _to_millis(self.clock())
+        for product in store.get_items():
+            self._append(product.name, ts, product.price, clamp=True)
+        self._store = store
+        store.add_listener(self._on_store_events)
+        logger.info("История цен подключена к магазину '%s'", store.name)
+
+    def detach(self) -> None:
+        """Отписывает историю от магазина; записанная история сохраняется."""
+        if self._store is not None:
+            self._store.remove_listener(self._on_store_events)
+            self._store = None
+
+    def _on_store_events(self, store: Store, events: List[StoreEvent]) -> None:
+        """Записывает изменения магазина.
+
+        Args:
+            store: Магазин.
+            events: Список изменений ассортимента.
+        """
+        ts = _to_millis(self.clock())
+        for event in events:
+            price = None if event.kind == 'remove' else event.added_price
+            self._append(event.product.name, ts, price, clamp=True)
+
+    def _append(self, name: str, ts: int, price: Optional[float], clamp: bool = False) -> None:
+        """Добавляет запись в ряд товара.
+
+        Args:
+            name: Название товара.
+            ts: Время в миллисекундах.
+            price: Цена или None, если товар удалён.
+            clamp: Заменять время, меньшее времени последней записи
+                товара, временем последней записи (иначе - ошибка).
+        """
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = PriceSeries(self.chunk_size)
+        last_ts = series.last_ts
+        if clamp and last_ts is not None and ts < last_ts:
+            ts = last_ts
+        series.append(ts, price)
+
+    def record(self, name: str, price: Optional[float], ts: Optional[Timestamp] = None) -> None:
+        """Записывает цену товара вручную (например, при загрузке архива).
+
+        Args:
+            name: Название товара.
+            price: Цена или None, если товар снят с продажи.
+            ts: Момент изменения (по умолчанию - текущее время).
+
+        Raises:
+            ValueError: Если цена неположительна или явно заданный момент
+                старше последней записи товара.
+        """
+        if price is not None and price <= 0:
+            error_msg = f"Цена товара должна быть положительной: {price}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        if ts is None:
+            self._append(name, _to_millis(self.clock()), price, clamp=True)
+        else:
+            self._append(name, _to_millis(ts), price)
+
+    def price_at(self, name: str, ts: Timestamp) -> Optional[float]:
+        """Возвращает цену товара в указанный момент.
+
+        Args:
+            name: Название товара.
+            ts: Момент времени.
+
+        Returns:
+            Цена или None, если товара в этот момент не было.
+        """
+        series = self._series.get(name)
+        if series is None:
+            return None
+        return series.at(_to_millis(ts))
+
+    def changes(self, name: str, start: Optional[Timestamp] = None,
+                end: Optional[Timestamp] = None) -> List[Tuple[float, Optional[float]]]:
+        """Возвращает изменения цены товара за период включительно.
+
+        Args:
+            name: Название товара.
+            start: Начало периода (None - с начала истории).
+            end: Конец периода (None - до конца истории).
+
+        Returns:
+            Список пар (время в секундах, цена или None для удаления).
+        """
+        series = self._series.get(name)
+        if series is None:
+            return []
+        entries = series.entries(
+            None if start is None else _to_millis(start),
+            None if end is None else _to_millis(end),
+        )
+        return [(ts / 1000, price) for ts, price in entries]
+
+    def downsample(self, name: str, start: Timestamp, end: Timestamp,
+                   buckets: int) -> List[PriceBucket]:
+        """Сворачивает историю цены за период в равные интервалы.
+
+        Для каждого интервала возвращаются минимальная, максимальная и
+        конечная цена с учётом цены, действовавшей на его начало.
+        Интервалы, в течение которых товара не было, пропускаются.
+
+        Args:
+            name: Название товара.
+            start: Начало периода.
+            end: Конец периода.
+            buckets: Количество интервалов.
+
+        Returns:
+            Список агрегатов в порядке времени.
+
+        Raises:
+            ValueError: Если количество интервалов меньше 1 или период пуст.
+        """
+        first, last = _to_millis(start), _to_millis(end)
+        if buckets < 1 or last <= first:
+            error_msg = f"Неверные параметры свёртки истории цен: buckets={buckets}, период {start} - {end}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        series = self._series.get(name)
+        if series is None:
+            return []
+        current = series.at(first)
+        entries = series.entries(first + 1, last)
+        width = (last - first) / buckets
+        result = []
+        position = 0
+        for bucket in range(buckets):
+            bucket_end = first + width * (bucket + 1)
+            prices = [current] if current is not None else []
+            closing = bucket == buckets - 1
+            while position < len(entries) and (closing or entries[position][0] < bucket_end):
+                current = entries[position][1]
+                if current is not None:
+                    prices.append(current)
+                position += 1
+            if prices:
+                result.append(PriceBucket(
+                    start=(first + width * bucket) / 1000,
+                    low=min(prices),
+                    high=max(prices),
+                    close=current,
+                ))
+        return result
+
+    def memory_usage(self) -> int:
+        """Возвращает объём памяти, занимаемый рядами цен, в байтах."""
+        return sum(series.nbytes for series in self._series.values())
+
+    def __len__(self) -> int:
+        """Возвращает общее количество записанных изменений."""
+        return sum(len(series) for series in self._series.values())
+
+    def __contains__(self, name: str) -> bool:
+        """Проверяет наличие истории товара."""
+        return name in self._series
@@ -0,0 +1,619 @@
+"""Модуль для сериализации задач и магазинов с подключаемыми кодеками.
+
+Объект переводится в компактную запись из списков и словарей, которая
+затем кодируется выбранным кодеком: 'json' (текст) или 'msgpack'
+(двоичный формат MessagePack). Если установлен пакет msgpack
+(pip install task_manager_store[msgpack]), используется он, иначе -
+встроенная реализация того же формата.
+"""
+
+import json
+import logging
+import struct
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:  # pragma: no cover - msgpack является необязательной зависимостью
+    HAS_MSGPACK = False
+
+from .store import Product, Store
+from .task import Task, TaskManager
+
+logger = logging.getLogger(__name__)
+
+# Версия формата записей; сохраняется вместе с данными
+FORMAT_VERSION = 1
+
+Serializable = Union[Task, Product, Store, TaskManager]
+
+
+class Codec(ABC):
+    """Кодек: переводит простые данные (словари, списки, строки, числа,
+    bool и None) в байты и обратно.
+
+    Атрибуты:
+        name: Название кодека для выбора в dumps() и loads().
+    """
+
+    name = ''
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Кодирует данные.
+
+        Args:
+            data: Простые данные.
+
+        Returns:
+            Закодированные данные.
+        """
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Any:
+        """Декодирует данные.
+
+        Args:
+            payload: Закодированные данные.
+
+        Returns:
+            Простые данные.
+        """
+
+
+class JsonCodec(Codec):
+    """Кодек JSON в UTF-8 без лишних пробелов."""
+
+    name = 'json'
+
+    def __init__(self) -> None:
+        """Инициализирует кодек."""
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def dumps(self, data: Any) -> bytes:
+        """Кодирует данные в JSON."""
+        return self._encoder.encode(data).encode('utf-8')
+
+    def loads(self, payload: bytes) -> Any:
+        """Декодирует данные из JSON."""
+        return json.loads(payload)
+
+
+def _pack_nil(value: None, out: bytearray) -> None:
+    """Дописывает None в буфер."""
+    out.append(0xC0)
+
+
+def _pack_bool(value: bool, out: bytearray) -> None:
+    """Дописывает логическое значение в буфер."""
+    out.append(0xC3 if value else 0xC2)
+
+
+def _pack_int(value: int, out: bytearray) -> None:
+    """Дописывает целое число в буфер.
+
+    Raises:
+        TypeError: Если число не помещается в 64 бита.
+    """
+    if 0 <= value < 0x80:
+        out.append(value)
+    elif -32 <= value < 0:
+        out.append(value & 0xFF)
+    elif -(1 << 63) <= value < 0:
+        out += b'\xd3' + struct.pack('>q', value)
+    elif value < (1 << 64):
+        out += b'\xcf' + struct.pack('>Q', value)
+    else:
+        raise TypeError(f"Целое число не помещается в 64 бита: {value}")
+
+
+def _pack_float(value: float, out: bytearray) -> None:
+    """Дописывает число с плавающей точкой (float64) в буфер."""
+    out += b'\xcb' + struct.pack('>d', value)
+
+
+# Заголовки строк, двоичных данных, массивов и словарей: код короткой формы
+# (размер в младших битах) с пределом размера и коды форм с отдельной длиной
+_Header = Tuple[Optional[Tuple[int, int]], Tuple[Tuple[bytes, str], ...]]
+_STR_HEADER: _Header = ((0xA0, 32), ((b'\xd9', '>B'), (b'\xda', '>H'), (b'\xdb', '>I')))
+_BIN_HEADER: _Header = (None, ((b'\xc4', '>B'), (b'\xc5', '>H'), (b'\xc6', '>I')))
+_ARRAY_HEADER: _Header = ((0x90, 16), ((b'\xdc', '>H'), (b'\xdd', '>I')))
+_MAP_HEADER: _Header = ((0x80, 16), ((b'\xde', '>H'), (b'\xdf', '>I')))
+
+
+def _pack_header(size: int, header: _Header, out: bytearray) -> None:
+    """Дописывает в буфер заголовок с размером значения.
+
+    Args:
+        size: Количество байтов или элементов.
+        header: Описание заголовка (_STR_HEADER, _BIN_HEADER и т.д.).
+        out: Буфер.
+    """
+    fixed, sized = header
+    if fixed is not None and size < fixed[1]:
+        out.append(fixed[0] | size)
+        return
+    for code, fmt in sized[:-1]:
+        if size < 1 << (8 * struct.calcsize(fmt)):
+            out += code + struct.pack(fmt, size)
+            return
+    code, fmt = sized[-1]
+    out += code + struct.pack(fmt, size)
+
+
+def _pack_str(value: str, out: bytearray) -> None:
+    """Дописывает строку (UTF-8) в буфер."""
+    data = value.encode('utf-8')
+    _pack_header(len(data), _STR_HEADER, out)
+    out += data
+
+
+def _pack_bin(value: Union[bytes, bytearray], out: bytearray) -> None:
+    """Дописывает двоичные данные в буфер."""
+    _pack_header(len(value), _BIN_HEADER, out)
+    out += value
+
+
+def _pack_array(value: Union[List[Any], Tuple[Any, ...]], out: bytearray) -> None:
+    """Дописывает список или кортеж в буфер."""
+    _pack_header(len(value), _ARRAY_HEADER, out)
+    for item in value:
+        _pack(item, out)
+
+
+def _pack_map(value: Dict[Any, Any], out: bytearray) -> None:
+    """Дописывает словарь в буфер."""
+    _pack_header(len(value), _MAP_HEADER, out)
+    for key, item in value.items():
+        _pack(key, out)
+        _pack(item, out)
+
+
+_Packer = Callable[[Any, bytearray], None]
+
+# Функции записи по точному типу значения
+_PACKERS: Dict[type, _Packer] = {
+    type(None): _pack_nil,
+    bool: _pack_bool,
+    int: _pack_int,
+    float: _pack_float,
+    str: _pack_str,
+    bytes: _pack_bin,
+    bytearray: _pack_bin,
+    list: _pack_array,
+    tuple: _pack_array,
+    dict: _pack_map,
+}
+
+# Функции записи для подклассов (например, IntEnum или именованных
+# кортежей) в порядке проверки
+_BASE_PACKERS: Tuple[Tuple[Union[type, Tuple[type, ...]], _Packer], ...] = (
+    ((list, tuple), _pack_array),
+    (dict, _pack_map),
+    ((bytes, bytearray), _pack_bin),
+    (int, lambda value, out: _pack_int(int(value), out)),
+    (float, lambda value, out: _pack_float(float(value), out)),
+    (str, lambda value, out: _pack_str(str(value), out)),
+)
+
+
+def _pack(value: Any, out: bytearray) -> None:
+    """Дописывает значение в буфер в формате MessagePack.
+
+    Функция записи выбирается по точному типу значения; для подклассов
+    поддерживаемых типов она находится один раз и запоминается.
+
+    Args:
+        value: Простое значение.
+        out: Буфер.
+
+    Raises:
+        TypeError: Если тип значения не поддерживается.
+    """
+    packer = _PACKERS.get(type(value))
+    if packer is None:
+        for base, base_packer in _BASE_PACKERS:
+            if isinstance(value, base):
+                packer = _PACKERS[type(value)] = base_packer
+                break
+        else:
+            raise TypeError(f"Тип не поддерживается кодеком msgpack: {type(value).__name__}")
+    packer(value, out)
+
+
+# Числа фиксированной длины: код -> (формат struct, размер)
+_FIXED = {
+    0xCA: ('>f', 4), 0xCB: ('>d', 8),
+    0xCC: ('>B', 1), 0xCD: ('>H', 2), 0xCE: ('>I', 4), 0xCF: ('>Q', 8),
+    0xD0: ('>b', 1), 0xD1: ('>h', 2), 0xD2: ('>i', 4), 0xD3: ('>q', 8),
+}
+# Строки, двоичные данные, массивы и словари: код -> (вид, формат длины, размер)
+_SIZED = {
+    0xD9: ('str', '>B', 1), 0xDA: ('str', '>H', 2), 0xDB: ('str', '>I', 4),
+    0xC4: ('bin', '>B', 1), 0xC5: ('bin', '>H', 2), 0xC6: ('bin', '>I', 4),
+    0xDC: ('array', '>H', 2), 0xDD: ('array', '>I', 4),
+    0xDE: ('map', '>H', 2), 0xDF: ('map', '>I', 4),
+}
+
+
+def _unpack(data: bytes, position: int) -> Tuple[Any, int]:
+    """Читает значение в формате MessagePack.
+
+    Args:
+        data: Закодированные данные.
+        position: Позиция начала значения.
+
+    Returns:
+        Кортеж (значение, позиция следующего значения).
+
+    Raises:
+        ValueError: Если данные повреждены или тип не поддерживается.
+    """
+    code = data[position]
+    position += 1
+    if code < 0x80:
+        return code, position
+    if code >= 0xE0:
+        return code - 0x100, position
+    if 0xA0 <= code <= 0xBF:
+        end = position + (code & 0x1F)
+        return data[position:end].decode('utf-8'), end
+    if 0x90 <= code <= 0x9F:
+        kind, size = 'array', code & 0x0F
+    elif 0x80 <= code <= 0x8F:
+        kind, size = 'map', code & 0x0F
+    elif code == 0xC0:
+        return None, position
+    elif code == 0xC2:
+        return False, position
+    elif code == 0xC3:
+        return True, position
+    elif code in _FIXED:
+        fmt, width = _FIXED[code]
+        return struct.unpack_from(fmt, data, position)[0], position + width
+    elif code in _SIZED:
+        kind, fmt, width = _SIZED[code]
+        size = struct.unpack_from(fmt, data, position)[0]
+        position += width
+    else:
+        raise ValueError(f"Неподдерживаемый код MessagePack: 0x{code:02x}")
+
+    if kind == 'str':
+        end = position + size
+        return data[position:end].decode('utf-8'), end
+    if kind == 'bin':
+        end = position + size
+        return bytes(data[position:end]), end
+    if kind == 'array':
+        items = []
+        for _ in range(size):
+            item, position = _unpack(data, position)
+            items.append(item)
+        return items, position
+    result = {}
+    for _ in range(size):
+        key, position = _unpack(data, position)
+        result[key], position = _unpack(data, position)
+    return result, position
+
+
+class MsgpackCodec(Codec):
+    """Двоичный кодек MessagePack.
+
+    При установленном пакете msgpack кодирование выполняется им,
+    иначе - встроенной реализацией (строки, числа, bool, None, списки,
+    словари и байты). Результат совместим в обе стороны.
+    """
+
+    name = 'msgpack'
+
+    def __init__(self, use_package: bool = True) -> None:
+        """Инициализирует кодек.
+
+        Args:
+            use_package: Использовать ли пакет msgpack, если он установлен.
+        """
+        self.use_package = use_package and HAS_MSGPACK
+
+    def dumps(self, data: Any) -> bytes:
+        """Кодирует данные в MessagePack."""
+        if self.use_package:
+            packed: bytes = msgpack.packb(data, use_bin_type=True)
+            return packed
+        out = bytearray()
+        _pack(data, out)
+        return bytes(out)
+
+    def loads(self, payload: bytes) -> Any:
+        """Декодирует данные из MessagePack.
+
+        Raises:
+            ValueError: Если данные повреждены.
+        """
+        if self.use_package:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        try:
+            value, position = _unpack(payload, 0)
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            raise ValueError(f"Повреждённые данные MessagePack: {e}") from e
+        if position != len(payload):
+            raise ValueError("Повреждённые данные MessagePack: лишние байты в конце")
+        return value
+
+
+_CODECS: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Регистрирует кодек под его названием (заменяя прежний).
+
+    Args:
+        codec: Кодек.
+    """
+    _CODECS[codec.name] = codec
+
+
+def get_codec(codec: Union[str, Codec]) -> Codec:
+    """Возвращает кодек по названию.
+
+    Args:
+        codec: Название кодека или сам кодек.
+
+    Returns:
+        Кодек.
+
+    Raises:
+        ValueError: Если кодек с таким названием не зарегистрирован.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in _CODECS:
+        error_msg = f"Неизвестный кодек: {codec}. Доступны: {', '.join(sorted(_CODECS))}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    return _CODECS[codec]
+
+
+def available_codecs() -> List[str]:
+    """Возвращает названия зарегистрированных кодеков."""
+    return sorted(_CODECS)
+
+
+register_codec(JsonCodec())
+register_codec(MsgpackCodec())
+
+
+def _trusted_product(name: str, price: float, category: str) -> Product:
+    """Создаёт товар без проверки данных (для доверенного источника).
+
+    Args:
+        name: Название товара.
+        price: Цена товара.
+        category: Категория товара.
+
+    Returns:
+        Товар.
+    """
+    product = object.__new__(Product)
+    product.name = sys.intern(name)
+    product.price = price
+    product.category = sys.intern(category)
+    return product
+
+
+def _trusted_task(description: str, due_date: str, status: bool) -> Task:
+    """Создаёт задачу без проверки данных и записи в журнал.
+
+    Args:
+        description: Описание задачи.
+        due_date: Срок выполнения в формате 'YYYY-MM-DD'.
+        status: Статус выполнения.
+
+    Returns:
+        Задача.
+    """
+    task = object.__new__(Task)
+    task.description = description
+    task.due_date = due_date
+    task.status = status
+    task._on_done = None
+    return task
+
+
+def _encode_product(product: Product) -> List[Any]:
+    """Возвращает запись товара."""
+    return [product.name, product.price, product.category]
+
+
+def _decode_product(record: List[Any], trusted: bool) -> Product:
+    """Создаёт товар из записи."""
+    if trusted:
+        return _trusted_product(*record)
+    return Product(*record)
+
+
+def _encode_task(task: Task) -> List[Any]:
+    """Возвращает запись задачи."""
+    return [task.description, task.due_date, task.status]
+
+
+def _decode_task(record: List[Any], trusted: bool) -> Task:
+    """Создаёт задачу из записи."""
+    if trusted:
+        return _trusted_task(*record)
+    description, due_date, status = record
+    task = Task(description, due_date)
+    task.status = bool(status)
+    return task
+
+
+def _encode_store(store: Store) -> Dict[str, Any]:
+    """Возвращает запись магазина: данные магазина и товары списками."""
+    record: Dict[str, Any] = {
+        'name': store.name,
+        'address': store.address,
+        'items': [[p.name, p.price, p.category] for p in store.get_items()],
+    }
+    if store.location is not None:
+        record['location'] = list(store.location)
+    return record
+
+
+def _decode_store(record: Dict[str, Any], trusted: bool) -> Store:
+    """Создаёт магазин из записи.
+
+    Без доверия каждый товар проверяется, а некорректные и
+    повторяющиеся товары пропускаются с записью в журнал, как в
+    Store.from_dict(). Товары добавляются одним пакетом.
+    """
+    location = record.get('location')
+    store = Store(
+        record['name'],
+        record['address'],
+        location=tuple(location) if location is not None else None,
+    )
+    if trusted:
+        products = [_trusted_product(*item) for item in record['items']]
+    else:
+        products = []
+        seen = set()
+        for item in record['items']:
+            try:
+                product = Product(*item)
+            except (ValueError, TypeError) as e:
+                logger.error("Ошибка при загрузке товара %s: %s", item[0] if item else item, e)
+                continue
+            if product.name in seen:
+                logger.error("Повторяющийся товар пропущен: %s", product.name)
+                continue
+            seen.add(product.name)
+            products.append(product)
+    store._insert_batch(products)
+    return store
+
+
+def _encode_manager(manager: TaskManager) -> Dict[str, Any]:
+    """Возвращает запись менеджера задач: задачи и зависимости списками."""
+    return {
+        'tasks': [_encode_task(task) for task in manager.tasks],
+        'dependencies': [
+            [task.description, blocker.description]
+            for task in manager.tasks
+            for blocker in manager.blockers_of(task)
+        ],
+    }
+
+
+def _decode_manager(record: Dict[str, Any], trusted: bool) -> TaskManager:
+    """Создаёт менеджер задач из записи.
+
+    Без доверия зависимости проверяются на циклы, как в
+    add_dependency(); доверенные связываются напрямую, а индексы
+    перестраиваются один раз при завершении транзакции.
+    """
+    manager = TaskManager()
+    with manager.transaction():
+        for item in record['tasks']:
+            try:
+                manager._register_task(_decode_task(item, trusted))
+            except (TypeError, ValueError) as e:
+                logger.error("Ошибка при загрузке задачи: %s", e)
+        # Задачи ищутся по словарю, а не перебором в get_task()
+        tasks = manager.tasks_by_description()
+        for description, blocker_description in record['dependencies']:
+            task = tasks.get(description.lower())
+            blocker = tasks.get(blocker_description.lower())
+            if task is None or blocker is None:
+                missing = description if task is None else blocker_description
+                logger.error("Ошибка при загрузке зависимости: задача не найдена: %s", missing)
+            elif trusted:
+                manager._blockers.setdefault(task, set()).add(blocker)
+                manager._dependents.setdefault(blocker, set()).add(task)
+            else:
+                try:
+                    manager.link_tasks(task, blocker)
+                except ValueError as e:
+                    logger.error("Ошибка при загрузке зависимости: %s", e)
+        manager._indexes_dirty = True
+    return manager
+
+
+# Название типа -> (класс, функция записи, функция восстановления)
+_TYPES: Dict[str, Tuple[Type[Any], Callable[[Any], Any], Callable[[Any, bool], Serializable]]] = {
+    'Task': (Task, _encode_task, _decode_task),
+    'Product': (Product, _encode_product, _decode_product),
+    'Store': (Store, _encode_store, _decode_store),
+    'TaskManager': (TaskManager, _encode_manager, _decode_manager),
+}
+
+
+def _type_name(obj: Any) -> str:
+    """Возвращает название сериализуемого типа объекта.
+
+    Raises:
+        TypeError: Если объект не поддерживается.
+    """
+    for type_name, (cls, _, _) in _TYPES.items():
+        if isinstance(obj, cls):
+            return type_name
+    raise TypeError(f"Объект не поддерживает сериализацию: {type(obj).__name__}")
+
+
+def dumps(obj: Serializable, codec: Union[str, Codec] = 'json') -> bytes:
+    """Сериализует задачу, товар, магазин или менеджер задач.
+
+    Args:
+        obj: Объект.
+        codec: Название кодека или кодек.
+
+    Returns:
+        Закодированные данные.
+
+    Raises:
+        TypeError: Если объект не поддерживается.
+        ValueError: Если кодек неизвестен.
+    """
+    type_name = _type_name(obj)
+    encode = _TYPES[type_name][1]
+    return get_codec(codec).dumps([type_name, FORMAT_VERSION, encode(obj)])
+
+
+def loads(payload: bytes, codec: Union[str, Codec] = 'json', trusted: bool = False,
+          expected: Optional[Type[Any]] = None) -> Serializable:
+    """Восстанавливает объект из данных, созданных dumps().
+
+    Args:
+        payload: Закодированные данные.
+        codec: Название кодека или кодек.
+        trusted: Данные из доверенного источника (например, записанные
+            этим же приложением): объекты создаются без проверки полей
+            и записи в журнал по каждому, что в несколько раз быстрее.
+        expected: Ожидаемый класс объекта.
+
+    Returns:
+        Восстановленный объект.
+
+    Raises:
+        ValueError: Если данные повреждены, версия формата не
+            поддерживается или тип объекта не совпадает с ожидаемым.
+    """
+    try:
+        type_name, version, record = get_codec(codec).loads(payload)
+    except (TypeError, ValueError) as e:
+        error_msg = f"Не удалось декодировать данные: {e}"
+        logger.error(error_msg)
+        raise ValueError(error_msg) from e
+
+    if type_name not in _TYPES or version != FORMAT_VERSION:
+        error_msg = f"Неподдерживаемые данные: тип {type_name}, версия формата {version}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    cls, _, decode = _TYPES[type_name]
+    if expected is not None and not issubclass(cls, expected):
+        error_msg = f"Ожидался объект {expected.__name__}, получен {type_name}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    return decode(record, trusted)
@@ -0,0 +1,461 @@
+"""Модуль для снимков магазина, разбитых по категориям, и их ленивой загрузки."""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .store import CsvLoadReport, Product, Store, StoreEvent, StoreListener
+
+logger = logging.getLogger(__name__)
+
+# Имя файла с описанием снимка; товары категорий лежат в PARTITIONS_DIR
+MANIFEST_NAME = 'manifest.json'
+PARTITIONS_DIR = 'partitions'
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Атомарно записывает данные в JSON-файл.
+
+    Args:
+        path: Путь к файлу.
+        data: Данные.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def save_snapshot(store: Store, directory: Union[str, Path]) -> Path:
+    """Сохраняет магазин в каталог снимка, разбитый по категориям.
+
+    Товары каждой категории записываются в отдельный файл, а описание
+    снимка (данные магазина, файлы, количество и названия товаров
+    категорий) - в MANIFEST_NAME, который записывается последним.
+
+    Args:
+        store: Магазин.
+        directory: Каталог снимка.
+
+    Returns:
+        Путь к описанию снимка.
+    """
+    directory = Path(directory)
+    partitions_dir = directory / PARTITIONS_DIR
+    partitions_dir.mkdir(parents=True, exist_ok=True)
+
+    categories = {}
+    for number, category in enumerate(sorted(store.get_categories())):
+        products = store.get_items_by_category(category)
+        file_name = f"{number:05d}.json"
+        _write_json(partitions_dir / file_name, [[p.name, p.price] for p in products])
+        categories[category] = {
+            'file': file_name,
+            'count': len(products),
+            'names': [p.name for p in products],
+        }
+
+    manifest: Dict[str, Any] = {
+        'name': store.name,
+        'address': store.address,
+        'categories': categories,
+    }
+    if store.location is not None:
+        manifest['location'] = list(store.location)
+    manifest_path = directory / MANIFEST_NAME
+    _write_json(manifest_path, manifest)
+
+    # Файлы категорий из прежнего снимка больше не нужны
+    used = {part['file'] for part in categories.values()}
+    for path in partitions_dir.glob('*.json'):
+        if path.name not in used:
+            path.unlink()
+    logger.info(
+        "Снимок магазина '%s' сохранён в %s: категорий %s",
+        store.name, directory, len(categories),
+    )
+    return manifest_path
+
+
+class LazyStore(Store):
+    """Магазин, загружающий товары категорий из снимка по мере обращения.
+
+    При открытии читается только описание снимка; товары категории
+    создаются при первом обращении к ней (или к товару по названию),
+    поэтому запуск не зависит от размера ассортимента. Операции над
+    всем магазином (get_items(), to_dict(), выборки без категории и т.п.)
+    загружают все категории.
+
+    Загруженные категории учитываются в порядке последнего обращения.
+    Если задан max_products, после каждой операции категории, к которым
+    дольше всего не обращались, выгружаются, пока товаров в памяти не
+    станет не больше max_products. Выгружаются только категории без
+    изменений с момента загрузки и не во время транзакции, поэтому
+    изменения не теряются. Загрузка и выгрузка увеличивают номер версии
+    магазина (version), так как меняют содержимое памяти.
+
+    Подписчики (add_listener) не поддерживаются: загрузка и выгрузка не
+    являются изменениями ассортимента, и подписчик, отражающий товары
+    в памяти, разошёлся бы с магазином, а передача их как добавлений и
+    удалений исказила бы, например, историю цен и остатки склада.
+    Для подписчиков магазин можно полностью загрузить:
+    Store.from_dict(lazy.to_dict()).
+    """
+
+    def __init__(self, directory: Union[str, Path], max_products: Optional[int] = None):
+        """Открывает снимок магазина.
+
+        Args:
+            directory: Каталог снимка (см. save_snapshot()).
+            max_products: Ограничение количества товаров в памяти или None.
+        """
+        # Атрибуты нужны до Store.__init__, который выводит магазин в журнал
+        self.directory = Path(directory)
+        self.max_products = max_products
+        # Файлы категорий снимка и количество товаров не загруженных категорий
+        self._files: Dict[str, str] = {}
+        self._unloaded: Dict[str, int] = {}
+        self._name_categories: Dict[str, str] = {}
+        # Загруженные категории в порядке обращения: первая - самая давняя
+        self._loaded: 'OrderedDict[str, None]' = OrderedDict()
+        # Категории, изменённые после загрузки (не выгружаются)
+        self._modified: Set[str] = set()
+        # Версия товаров категории, назначенная при первой загрузке:
+        # при повторной загрузке версии не меняются
+        self._load_versions: Dict[str, int] = {}
+        # Количество выполняющихся операций, во время которых выгрузка откладывается
+        self._pins = 0
+        # Идёт Store.__init__: строковое представление не загружает категории
+        self._opening = True
+
+        with open(self.directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        for category, part in manifest['categories'].items():
+            self._files[category] = part['file']
+            self._unloaded[category] = part['count']
+            for name in part['names']:
+                self._name_categories[name] = category
+        location = manifest.get('location')
+        super().__init__(
+            manifest['name'],
+            manifest['address'],
+            location=tuple(location) if location is not None else None,
+        )
+        self._opening = False
+        logger.info(
+            "Открыт снимок магазина '%s': категорий %s, товаров %s",
+            self.name, len(self._files), len(self._name_categories)
+        )
+
+    @property
+    def loaded_categories(self) -> List[str]:
+        """Загруженные категории снимка, начиная с самой давно использованной."""
+        return list(self._loaded)
+
+    def is_loaded(self, category: str) -> bool:
+        """Проверяет, что товары категории находятся в памяти."""
+        return category not in self._unloaded
+
+    def _load(self, category: str) -> None:
+        """Загружает товары категории, если они ещё не загружены.
+
+        Args:
+            category: Название категории.
+        """
+        with self._lock:
+            if category in self._loaded:
+                self._loaded.move_to_end(category)
+                return
+            if category not in self._unloaded:
+                return
+            path = self.directory / PARTITIONS_DIR / self._files[category]
+            with open(path, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+            self._version += 1
+            version = self._load_versions.setdefault(category, self._version)
+            events = []
+            for name, price in rows:
+                product = Product(name, price, category)
+                self._items[product.name] = product
+                self._product_versions[product.name] = version
+                events.append(StoreEvent('add', product, new_price=product.price))
+            self._update_indexes(events)
+            del self._unloaded[category]
+            self._loaded[category] = None
+        logger.debug("Загружена категория '%s' магазина '%s': %s товаров",
+                     category, self.name, len(rows))
+
+    def _load_all(self) -> None:
+        """Загружает все категории снимка."""
+        for category in list(self._unloaded):
+            self._load(category)
+
+    def _load_name(self, name: str) -> None:
+        """Загружает категорию, в которой товар лежит в снимке.
+
+        Args:
+            name: Название товара.
+        """
+        if name not in self._items:
+            category = self._name_categories.get(name)
+            if category is not None:
+                self._load(category)
+
+    def _load_scope(self, category: Optional[str]) -> None:
+        """Загружает категорию или, если она не указана, весь магазин.
+
+        Args:
+            category: Название категории или None.
+        """
+        if category is None:
+            self._load_all()
+        else:
+            self._load(category)
+
+    @contextmanager
+    def _pinned(self) -> Iterator[None]:
+        """Откладывает выгрузку категорий до конца операции."""
+        with self._lock:
+            self._pins += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins -= 1
+            self._evict_over_budget()
+
+    def _evict_over_budget(self) -> None:
+        """Выгружает давно не использованные категории сверх ограничения."""
+        if self.max_products is None or self._pins or self._tx_depth:
+            return
+        for category in list(self._loaded):
+            if len(self._items) <= self.max_products:
+                break
+            self.evict(category)
+
+    def evict(self, category: str) -> bool:
+        """Выгружает товары категории из памяти.
+
+        Args:
+            category: Название категории.
+
+        Returns:
+            True, если категория выгружена, и False, если она не загружена,
+            изменена после загрузки или идёт транзакция.
+        """
+        with self._lock:
+            if category not in self._loaded or category in self._modified or self._tx_depth:
+                return False
+            self._version += 1
+            products = list(self._categories.get(category, {}).values())
+            for product in products:
+                del self._items[product.name]
+                self._product_versions.pop(product.name, None)
+            self._update_indexes([
+                StoreEvent('remove', product, old_price=product.price) for product in products
+            ])
+            del self._loaded[category]
+            self._unloaded[category] = len(products)
+        logger.debug("Выгружена категория '%s' магазина '%s'", category, self.name)
+        return True
+
+    def add_listener(self, listener: StoreListener) -> None:
+        """Подписчики ленивого магазина не поддерживаются (см. описание класса).
+
+        Args:
+            listener: Функция-обработчик.
+
+        Raises:
+            TypeError: Всегда.
+        """
+        error_msg = (
+            f"Магазин '{self.name}' загружается из снимка по частям и не поддерживает "
+            "подписчиков; загрузите его полностью: Store.from_dict(store.to_dict())"
+        )
+        logger.error(error_msg)
+        raise TypeError(error_msg)
+
+    def _notify_listeners(self, events: List[StoreEvent]) -> None:
+        """Отмечает изменённые категории и обновляет категории товаров.
+
+        Args:
+            events: Список применённых изменений ассортимента.
+        """
+        for event in events:
+            product = event.product
+            self._modified.add(product.category)
+            if event.kind == 'add':
+                self._name_categories[product.name] = product.category
+            elif event.kind == 'remove':
+                self._name_categories.pop(product.name, None)
+        super()._notify_listeners(events)
+
+    def add_item(self, name: str, price: float, category: str = "Без категории") -> Product:
+        """Загружает нужные категории и добавляет товар (см. Store.add_item)."""
+        with self._pinned():
+            self._load_name(name)
+            self._load(category)
+            return super().add_item(name, price, category)
+
+    def add_items(self, items: Iterable[Sequence[Any]]) -> List[Product]:
+        """Загружает нужные категории и добавляет товары (см. Store.add_items)."""
+        items = list(items)
+        with self._pinned():
+            for item in items:
+                self._load_name(item[0])
+                self._load(item[2] if len(item) > 2 else "Без категории")
+            return super().add_items(items)
+
+    def load_csv(self, *args: Any, **kwargs: Any) -> CsvLoadReport:
+        """Загружает все категории и товары из CSV (см. Store.load_csv)."""
+        with self._pinned():
+            self._load_all()
+            return super().load_csv(*args, **kwargs)
+
+    def remove_item(self, name: str) -> bool:
+        """Загружает категорию товара и удаляет его (см. Store.remove_item)."""
+        with self._pinned():
+            self._load_name(name)
+            return super().remove_item(name)
+
+    def get_item(self, name: str) -> Optional[Product]:
+        """Загружает категорию товара и возвращает его (см. Store.get_item)."""
+        with self._pinned():
+            self._load_name(name)
+            return super().get_item(name)
+
+    def get_items(self) -> List[Product]:
+        """Загружает все категории и возвращает товары (см. Store.get_items)."""
+        with self._pinned():
+            self._load_all()
+            return super().get_items()
+
+    def get_version(self, name: str) -> Optional[int]:
+        """Загружает категорию товара и возвращает версию (см. Store.get_version)."""
+        with self._pinned():
+            self._load_name(name)
+            return super().get_version(name)
+
+    def get_price_with_version(self, name: str) -> Optional[Tuple[float, int]]:
+        """Загружает категорию товара и возвращает цену с версией."""
+        with self._pinned():
+            self._load_name(name)
+            return super().get_price_with_version(name)
+
+    def update_price(self, name: str, new_price: float,
+                     expected_version: Optional[int] = None) -> bool:
+        """Загружает категорию товара и обновляет цену (см. Store.update_price)."""
+        with self._pinned():
+            self._load_name(name)
+            return super().update_price(name, new_price, expected_version)
+
+    def update_prices(self, prices: Dict[str, float]) -> Dict[str, bool]:
+        """Загружает категории товаров и обновляет цены (см. Store.update_prices)."""
+        with self._pinned():
+            for name in prices:
+                self._load_name(name)
+            return super().update_prices(prices)
+
+    def get_items_by_category(self, category: str) -> List[Product]:
+        """Загружает категорию и возвращает её товары."""
+        with self._pinned():
+            self._load(category)
+            return super().get_items_by_category(category)
+
+    def get_categories(self) -> List[str]:
+        """Возвращает категории, не загружая их товары."""
+        categories = super().get_categories()
+        return categories + [c for c in self._unloaded if c not in self._categories]
+
+    def get_category_counts(self) -> Dict[str, int]:
+        """Возвращает количество товаров по категориям, не загружая их."""
+        counts = super().get_category_counts()
+        counts.update(self._unloaded)
+        return counts
+
+    def count_in_category(self, category: str) -> int:
+        """Возвращает количество товаров в категории, не загружая её."""
+        if category in self._unloaded:
+            return self._unloaded[category]
+        return super().count_in_category(category)
+
+    def get_category_stats(self, category: str) -> Optional[Dict[str, float]]:
+        """Загружает категорию и возвращает статистику её цен."""
+        with self._pinned():
+            self._load(category)
+            return super().get_category_stats(category)
+
+    def category_stats(self) -> Dict[str, Dict[str, float]]:
+        """Загружает все категории и возвращает статистику цен."""
+        with self._pinned():
+            self._load_all()
+            return super().category_stats()
+
+    def get_items_in_price_range(self, min_price: float, max_price: float,
+                                 category: Optional[str] = None) -> List[Product]:
+        """Загружает нужные категории и возвращает товары в диапазоне цен."""
+        with self._pinned():
+            self._load_scope(category)
+            return super().get_items_in_price_range(min_price, max_price, category)
+
+    def cheapest(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Загружает нужные категории и возвращает самые дешёвые товары."""
+        with self._pinned():
+            self._load_scope(category)
+            return super().cheapest(count, category)
+
+    def most_expensive(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Загружает нужные категории и возвращает самые дорогие товары."""
+        with self._pinned():
+            self._load_scope(category)
+            return super().most_expensive(count, category)
+
+    def price_percentile(self, percent: float, category: Optional[str] = None) -> Optional[float]:
+        """Загружает нужные категории и возвращает цену процентиля."""
+        with self._pinned():
+            self._load_scope(category)
+            return super().price_percentile(percent, category)
+
+    def autocomplete(self, prefix: str, limit: int = 10, order: str = 'name') -> List[Product]:
+        """Загружает все категории и возвращает подсказки (см. Store.autocomplete)."""
+        with self._pinned():
+            self._load_all()
+            return super().autocomplete(prefix, limit, order)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Загружает все категории и возвращает магазин в виде словаря."""
+        with self._pinned():
+            self._load_all()
+            return super().to_dict()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Store:
+        """Создаёт обычный магазин из словаря (ленивая загрузка - только из снимка)."""
+        return Store.from_dict(data)
+
+    def __str__(self) -> str:
+        """Загружает все категории и возвращает строковое представление.
+
+        При открытии снимка (Store.__init__ выводит магазин в журнал)
+        возвращается только заголовок, без загрузки категорий.
+        """
+        if self._opening:
+            return (
+                f"=== {self.name} ===\nАдрес: {self.address}\n"
+                f"Товаров в ассортименте: {len(self)} (снимок {self.directory})"
+            )
+        with self._pinned():
+            self._load_all()
+            return super().__str__()
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров, включая не загруженные."""
+        return len(self._items) + sum(self._unloaded.values())
+
+    def __contains__(self, item_name: str) -> bool:
+        """Проверяет наличие товара, не загружая его категорию."""
+        return item_name in self._items or self._name_categories.get(item_name) in self._unloaded
@@ -0,0 +1,386 @@
+"""Модуль для поиска ближайших магазинов по координатам."""
+
+import heapq
+import logging
+import math
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from .network import StoreNetwork
+
+logger = logging.getLogger(__name__)
+
+# Средний радиус Земли в километрах
+EARTH_RADIUS_KM = 6371.0088
+
+# Если товар есть не более чем в стольких магазинах, они перебираются
+# напрямую, без обхода ячеек сетки
+DIRECT_SCAN_LIMIT = 64
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Вычисляет расстояние между точками по поверхности Земли.
+
+    Args:
+        lat1: Широта первой точки в градусах.
+        lon1: Долгота первой точки в градусах.
+        lat2: Широта второй точки в градусах.
+        lon2: Долгота второй точки в градусах.
+
+    Returns:
+        Расстояние в километрах.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StoreLocator:
+    """Сеточный индекс магазинов по координатам.
+
+    Поверхность делится на ячейки cell_size x cell_size градусов;
+    магазин хранится в ячейке своих координат. Поиск ближайших
+    обходит кольца ячеек вокруг точки запроса и останавливается, когда
+    следующее кольцо заведомо дальше уже найденных магазинов, поэтому
+    время запроса зависит от плотности магазинов рядом с точкой, а не от
+    их общего количества. Размер ячейки стоит выбирать так, чтобы в
+    ячейке в среднем было около одного магазина. Фильтр по товару
+    использует общий индекс сети: если товар есть в немногих магазинах,
+    они перебираются напрямую.
+
+    Магазины, добавленные в сеть после создания индекса или перенесённые,
+    добавляются в индекс вызовом add().
+    """
+
+    def __init__(self, network: Optional[StoreNetwork] = None, cell_size: float = 0.1):
+        """Инициализирует индекс.
+
+        Args:
+            network: Сеть магазинов; её магазины с координатами добавляются
+                в индекс, а её индекс товаров используется для фильтра.
+            cell_size: Размер ячейки сетки в градусах.
+
+        Raises:
+            ValueError: Если размер ячейки неположителен.
+        """
+        if not 0 < cell_size <= 180:
+            error_msg = f"Размер ячейки сетки должен быть в пределах (0, 180]: {cell_size}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.network = network
+        self.cell_size = cell_size
+        self._columns = math.ceil(360 / cell_size)
+        self._rows = math.ceil(180 / cell_size)
+        # Фактические размеры ячейки: сетка ровно покрывает поверхность
+        self._lat_step = 180 / self._rows
+        self._lon_step = 360 / self._columns
+        self._locations: Dict[str, Tuple[float, float]] = {}
+        # Координаты в радианах и косинус широты для расчёта расстояний
+        self._points: Dict[str, Tuple[float, float, float]] = {}
+        self._cells: Dict[Tuple[int, int], List[str]] = {}
+        if network is not None:
+            for key, store in network.get_stores().items():
+                if store.location is not None:
+                    self.add(key, *store.location)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Возвращает ячейку сетки для координат.
+
+        Args:
+            latitude: Широта в градусах.
+            longitude: Долгота в градусах.
+
+        Returns:
+            Кортеж (строка, столбец).
+        """
+        row = min(int((latitude + 90) // self._lat_step), self._rows - 1)
+        column = int((longitude + 180) // self._lon_step) % self._columns
+        return row, column
+
+    def add(self, key: str, latitude: float, longitude: float) -> None:
+        """Добавляет магазин в индекс или перемещает его.
+
+        Args:
+            key: Ключ магазина.
+            latitude: Широта в градусах.
+            longitude: Долгота в градусах.
+
+        Raises:
+            ValueError: Если координаты вне допустимых пределов.
+        """
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            error_msg = f"Неверные координаты магазина '{key}': ({latitude}, {longitude})"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.remove(key)
+        self._locations[key] = (latitude, longitude)
+        phi = math.radians(latitude)
+        self._points[key] = (phi, math.radians(longitude), math.cos(phi))
+        self._cells.setdefault(self._cell(latitude, longitude), []).append(key)
+
+    def remove(self, key: str) -> bool:
+        """Удаляет магазин из индекса.
+
+        Args:
+            key: Ключ магазина.
+
+        Returns:
+            True, если магазин был в индексе, иначе False.
+        """
+        location = self._locations.pop(key, None)
+        if location is None:
+            return False
+        del self._points[key]
+        cell = self._cell(*location)
+        keys = self._cells[cell]
+        keys.remove(key)
+        if not keys:
+            del self._cells[cell]
+        return True
+
+    def get_location(self, key: str) -> Optional[Tuple[float, float]]:
+        """Возвращает координаты магазина из индекса."""
+        return self._locations.get(key)
+
+    def _distance_from(self, latitude: float, longitude: float) -> Callable[[str], float]:
+        """Возвращает функцию расстояния от точки до магазина.
+
+        Величины точки запроса вычисляются один раз, а для магазинов
+        используются заранее рассчитанные радианы и косинусы широты.
+
+        Args:
+            latitude: Широта точки в градусах.
+            longitude: Долгота точки в градусах.
+
+        Returns:
+            Функция, принимающая ключ магазина и возвращающая расстояние в км.
+        """
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        cos_phi = math.cos(phi)
+        points = self._points
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+        def distance(key: str) -> float:
+            phi2, lam2, cos_phi2 = points[key]
+            a = sin((phi2 - phi) / 2) ** 2 + cos_phi * cos_phi2 * sin((lam2 - lam) / 2) ** 2
+            return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+        return distance
+
+    def _carriers(self, product: Optional[str]) -> Optional[Set[str]]:
+        """Возвращает ключи магазинов с товаром для фильтра.
+
+        Args:
+            product: Название товара или None (без фильтра).
+
+        Returns:
+            Множество ключей магазинов или None, если фильтр не задан.
+
+        Raises:
+            ValueError: Если фильтр по товару задан без сети магазинов.
+        """
+        if product is None:
+            return None
+        if self.network is None:
+            error_msg = "Фильтр по товару требует индекс, построенный по сети магазинов"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return {key for key in self.network.get_prices(product) if key in self._locations}
+
+    def _ring(self, row: int, column: int, radius: int) -> Iterable[Tuple[int, int]]:
+        """Перечисляет ячейки на границе квадрата радиуса radius вокруг ячейки.
+
+        Args:
+            row: Строка центральной ячейки.
+            column: Столбец центральной ячейки.
+            radius: Радиус кольца в ячейках.
+
+        Yields:
+            Ячейки кольца (столбцы замыкаются по долготе).
+        """
+        if radius == 0:
+            yield row, column
+            return
+        width = min(2 * radius + 1, self._columns)
+        first = column - radius
+        for r in (row - radius, row + radius):
+            if 0 <= r < self._rows:
+                for c in range(first, first + width):
+                    yield r, c % self._columns
+        if 2 * radius <= self._columns:
+            # При 2 * radius == _columns левый и правый столбцы совпадают
+            both = 2 * radius < self._columns
+            for r in range(max(row - radius + 1, 0), min(row + radius, self._rows)):
+                yield r, (column - radius) % self._columns
+                if both:
+                    yield r, (column + radius) % self._columns
+
+    def _ring_bound(self, latitude: float, radius: int) -> float:
+        """Оценивает снизу расстояние до магазинов за пределами колец 0..radius.
+
+        Args:
+            latitude: Широта точки запроса.
+            radius: Номер последнего просмотренного кольца.
+
+        Returns:
+            Расстояние в километрах.
+        """
+        lat_gap = radius * self._lat_step
+        lon_gap = math.radians(radius * self._lon_step)
+        if lon_gap >= math.pi:
+            return EARTH_RADIUS_KM * math.radians(lat_gap)
+        # Смещение по долготе короче ближе к полюсу: берётся самая
+        # высокая широта, на которой магазин может оказаться ближе
+        highest = min(abs(latitude) + lat_gap, 90.0)
+        shrink = math.cos(math.radians(highest))
+        along_parallel = 2 * math.asin(min(1.0, shrink * math.sin(lon_gap / 2)))
+        return EARTH_RADIUS_KM * min(math.radians(lat_gap), along_parallel)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1,
+                product: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Находит ближайшие магазины.
+
+        Args:
+            latitude: Широта точки в градусах.
+            longitude: Долгота точки в градусах.
+            k: Количество магазинов.
+            product: Название товара, который должен быть в магазине.
+
+        Returns:
+            Список пар (ключ магазина, расстояние в км) по возрастанию расстояния.
+        """
+        carriers = self._carriers(product)
+        if k < 1:
+            return []
+        if carriers is not None and len(carriers) <= DIRECT_SCAN_LIMIT:
+            return self._scan(latitude, longitude, k, carriers)
+
+        total = len(self._locations) if carriers is None else len(carriers)
+        row, column = self._cell(latitude, longitude)
+        max_radius = max(row, self._rows - 1 - row, self._columns // 2)
+        distance_to = self._distance_from(latitude, longitude)
+        # Куча k ближайших: (-расстояние, ключ)
+        best: List[Tuple[float, str]] = []
+        seen = 0
+        for radius in range(max_radius + 1):
+            if 8 * radius > len(self._cells):
+                # Кольцо больше числа занятых ячеек: магазины редки вокруг
+                # точки, и перебрать их все дешевле, чем обходить кольца
+                keys = self._locations if carriers is None else carriers
+                return self._scan(latitude, longitude, k, keys)
+            for cell in self._ring(row, column, radius):
+                for key in self._cells.get(cell, ()):
+                    if carriers is not None and key not in carriers:
+                        continue
+                    seen += 1
+                    distance = distance_to(key)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            if seen >= total:
+                break
+            if len(best) == k and self._ring_bound(latitude, radius) > -best[0][0]:
+                break
+        return sorted(((key, -distance) for distance, key in best), key=lambda m: (m[1], m[0]))
+
+    def _scan(self, latitude: float, longitude: float, k: int,
+              keys: Iterable[str]) -> List[Tuple[str, float]]:
+        """Находит ближайшие магазины прямым перебором.
+
+        Args:
+            latitude: Широта точки в градусах.
+            longitude: Долгота точки в градусах.
+            k: Количество магазинов.
+            keys: Ключи магазинов для перебора.
+
+        Returns:
+            Список пар (ключ магазина, расстояние в км) по возрастанию расстояния.
+        """
+        distance_to = self._distance_from(latitude, longitude)
+        return heapq.nsmallest(k, (
+            (key, distance_to(key)) for key in keys
+        ), key=lambda match: (match[1], match[0]))
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      product: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Находит магазины в пределах расстояния от точки.
+
+        Args:
+            latitude: Широта точки в градусах.
+            longitude: Долгота точки в градусах.
+            radius_km: Расстояние в километрах.
+            product: Название товара, который должен быть в магазине.
+
+        Returns:
+            Список пар (ключ магазина, расстояние в км) по возрастанию расстояния.
+        """
+        carriers = self._carriers(product)
+        if radius_km < 0:
+            return []
+        if carriers is not None and len(carriers) <= DIRECT_SCAN_LIMIT:
+            keys: Iterable[str] = carriers
+        else:
+            keys = self._keys_near(latitude, longitude, radius_km)
+            if carriers is not None:
+                keys = (key for key in keys if key in carriers)
+        distance_to = self._distance_from(latitude, longitude)
+        matches = []
+        for key in keys:
+            distance = distance_to(key)
+            if distance <= radius_km:
+                matches.append((key, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def _keys_near(self, latitude: float, longitude: float, radius_km: float) -> List[str]:
+        """Возвращает магазины из ячеек, пересекающих круг поиска.
+
+        Args:
+            latitude: Широта центра в градусах.
+            longitude: Долгота центра в градусах.
+            radius_km: Радиус в километрах.
+
+        Returns:
+            Список ключей магазинов (включая лежащие за пределами круга).
+        """
+        span = math.degrees(radius_km / EARTH_RADIUS_KM)
+        low, high = latitude - span, latitude + span
+        highest = max(abs(low), abs(high))
+        if highest >= 90:
+            lon_span = 180.0
+        else:
+            lon_span = min(span / math.cos(math.radians(highest)), 180.0)
+        first_row, first_column = self._cell(max(low, -90.0), -180.0)
+        last_row, _ = self._cell(min(high, 90.0), -180.0)
+        columns: Collection[int]
+        if lon_span >= 180:
+            columns = range(self._columns)
+        else:
+            first_column = int((longitude - lon_span + 180) // self._lon_step)
+            last_column = int((longitude + lon_span + 180) // self._lon_step)
+            columns = {c % self._columns for c in range(first_column, last_column + 1)}
+        rows = range(first_row, last_row + 1)
+        keys = []
+        if len(rows) * len(columns) > len(self._cells):
+            # Круг покрывает больше ячеек, чем занято: проверяются занятые
+            for (row, column), cell_keys in self._cells.items():
+                if row in rows and column in columns:
+                    keys.extend(cell_keys)
+            return keys
+        for row in rows:
+            for column in columns:
+                keys.extend(self._cells.get((row, column), ()))
+        return keys
+
+    def __len__(self) -> int:
+        """Возвращает количество магазинов в индексе."""
+        return len(self._locations)
+
+    def __contains__(self, key: str) -> bool:
+        """Проверяет наличие магазина в индексе."""
+        return key in self._locations
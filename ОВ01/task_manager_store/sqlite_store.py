@@ -0,0 +1,484 @@
+"""Модуль для хранения ассортимента магазинов в базе данных SQLite."""
+
+import logging
+import math
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .store import Product, Store
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    address TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    store_id INTEGER NOT NULL REFERENCES stores(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    price REAL NOT NULL CHECK (price > 0),
+    category TEXT NOT NULL,
+    PRIMARY KEY (store_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS products_category ON products (store_id, category, name);
+CREATE INDEX IF NOT EXISTS products_price ON products (store_id, price, name);
+"""
+
+
+class SqliteStore:
+    """Магазин, ассортимент которого хранится в базе данных SQLite.
+
+    Интерфейс повторяет основные методы Store, но товары не держатся
+    в памяти: выборки по категории и диапазону цен выполняются
+    запросами к индексам базы. База работает в режиме WAL, поэтому
+    чтение не блокируется записью. Пакетные операции и транзакции
+    (см. transaction()) записываются одной транзакцией SQLite.
+    В одном файле базы может храниться несколько магазинов.
+    """
+
+    def __init__(self, path: Union[str, Path], name: str, address: Optional[str] = None):
+        """Открывает магазин в базе данных, создавая его при необходимости.
+
+        Args:
+            path: Путь к файлу базы данных.
+            name: Название магазина.
+            address: Адрес магазина (обязателен при создании нового магазина).
+
+        Raises:
+            ValueError: Если магазина нет в базе, а адрес не указан.
+        """
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        # Глубина вложенности транзакций (вложенные - точки сохранения)
+        self._tx_depth = 0
+
+        row = self._conn.execute(
+            "SELECT id, name, address FROM stores WHERE name = ?", (name.strip(),)
+        ).fetchone()
+        if row is None:
+            if not name.strip() or address is None or not address.strip():
+                self._conn.close()
+                error_msg = "Для нового магазина необходимо указать название и адрес"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            cursor = self._conn.execute(
+                "INSERT INTO stores (name, address) VALUES (?, ?)",
+                (name.strip(), address.strip())
+            )
+            row = (cursor.lastrowid, name.strip(), address.strip())
+            logger.info("Создан магазин '%s' в базе %s", name.strip(), self.path)
+        self._store_id, self.name, self.address = row
+
+    @classmethod
+    def from_store(cls, path: Union[str, Path], store: Store,
+                   batch_size: int = 10000) -> 'SqliteStore':
+        """Сохраняет ассортимент магазина из памяти в базу данных.
+
+        Существующие в базе товары магазина заменяются.
+
+        Args:
+            path: Путь к файлу базы данных.
+            store: Магазин.
+            batch_size: Количество товаров в одном пакете записи.
+
+        Returns:
+            Экземпляр класса SqliteStore.
+        """
+        sqlite_store = cls(path, store.name, store.address)
+        with sqlite_store.transaction():
+            sqlite_store._conn.execute(
+                "DELETE FROM products WHERE store_id = ?", (sqlite_store._store_id,)
+            )
+            products = store.get_items()
+            for start in range(0, len(products), batch_size):
+                sqlite_store._insert_batch(products[start:start + batch_size])
+        logger.info("Магазин '%s' сохранён в базу %s: %s товаров",
+                    store.name, sqlite_store.path, len(store))
+        return sqlite_store
+
+    def to_store(self) -> Store:
+        """Загружает ассортимент магазина в память.
+
+        Returns:
+            Экземпляр класса Store.
+        """
+        store = Store(self.name, self.address)
+        store.add_items(
+            (product.name, product.price, product.category) for product in self.iter_items()
+        )
+        return store
+
+    @contextmanager
+    def transaction(self) -> Iterator['SqliteStore']:
+        """Объединяет изменения в одну транзакцию SQLite.
+
+        При исключении все изменения транзакции откатываются. Вложенные
+        транзакции оформляются точками сохранения и откатывают только
+        свои изменения.
+
+        Yields:
+            Этот же магазин.
+        """
+        savepoint = f"sp{self._tx_depth}"
+        if self._tx_depth:
+            self._conn.execute(f"SAVEPOINT {savepoint}")
+        else:
+            self._conn.execute("BEGIN")
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth:
+                self._conn.execute(f"ROLLBACK TO {savepoint}")
+                self._conn.execute(f"RELEASE {savepoint}")
+            else:
+                self._conn.execute("ROLLBACK")
+            logger.warning("Транзакция в магазине '%s' отменена", self.name)
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth:
+            self._conn.execute(f"RELEASE {savepoint}")
+        else:
+            self._conn.execute("COMMIT")
+
+    def _insert_batch(self, products: Sequence[Product]) -> None:
+        """Записывает проверенные товары одним запросом.
+
+        Args:
+            products: Товары.
+        """
+        self._conn.executemany(
+            "INSERT INTO products (store_id, name, price, category) VALUES (?, ?, ?, ?)",
+            [(self._store_id, p.name, p.price, p.category) for p in products]
+        )
+
+    def add_item(self, name: str, price: float, category: str = "Без категории") -> Product:
+        """Добавляет товар в ассортимент магазина.
+
+        Args:
+            name: Название товара.
+            price: Цена товара.
+            category: Категория товара.
+
+        Returns:
+            Добавленный товар.
+
+        Raises:
+            ValueError: Если данные некорректны или товар уже существует.
+        """
+        product = Product(name=name, price=price, category=category)
+        try:
+            self._insert_batch([product])
+        except sqlite3.IntegrityError as e:
+            error_msg = f"Товар с названием '{name}' уже существует в магазине '{self.name}'"
+            logger.error(error_msg)
+            raise ValueError(error_msg) from e
+        if not self._tx_depth:
+            logger.info("Добавлен товар в магазин '%s': %s", self.name, product)
+        return product
+
+    def add_items(self, items: Iterable[Sequence[Any]]) -> List[Product]:
+        """Добавляет несколько товаров одним пакетом: либо все, либо ни одного.
+
+        Args:
+            items: Кортежи (название, цена) или (название, цена, категория).
+
+        Returns:
+            Список добавленных товаров в порядке передачи.
+
+        Raises:
+            ValueError: Если хотя бы один товар некорректен или уже существует.
+        """
+        products = []
+        errors = []
+        for item in items:
+            try:
+                products.append(Product(*item))
+            except (ValueError, TypeError) as e:
+                errors.append(f"{item!r}: {e}")
+
+        if not errors:
+            try:
+                with self.transaction():
+                    self._insert_batch(products)
+            except sqlite3.IntegrityError as e:
+                errors.append(f"повторяющееся название товара ({e})")
+
+        if errors:
+            error_msg = (
+                f"Товары не добавлены в магазин '{self.name}', ошибок: {len(errors)}: "
+                + "; ".join(errors[:10])
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        logger.info("Добавлено товаров в магазин '%s': %s", self.name, len(products))
+        return products
+
+    def remove_item(self, name: str) -> bool:
+        """Удаляет товар из ассортимента.
+
+        Args:
+            name: Название товара для удаления.
+
+        Returns:
+            True, если товар был удален, иначе False.
+        """
+        cursor = self._conn.execute(
+            "DELETE FROM products WHERE store_id = ? AND name = ?", (self._store_id, name)
+        )
+        if cursor.rowcount:
+            if not self._tx_depth:
+                logger.info("Товар '%s' удален из магазина '%s'", name, self.name)
+            return True
+        logger.warning("Товар '%s' не найден в магазине '%s'", name, self.name)
+        return False
+
+    def get_item(self, name: str) -> Optional[Product]:
+        """Возвращает товар по названию.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Найденный товар или None, если не найден.
+        """
+        row = self._conn.execute(
+            "SELECT name, price, category FROM products WHERE store_id = ? AND name = ?",
+            (self._store_id, name)
+        ).fetchone()
+        return Product(*row) if row else None
+
+    def get_price(self, name: str) -> Optional[float]:
+        """Возвращает цену товара по названию.
+
+        Args:
+            name: Название товара.
+
+        Returns:
+            Цена товара или None, если товар не найден.
+        """
+        row = self._conn.execute(
+            "SELECT price FROM products WHERE store_id = ? AND name = ?",
+            (self._store_id, name)
+        ).fetchone()
+        return row[0] if row else None
+
+    def update_price(self, name: str, new_price: float) -> bool:
+        """Обновляет цену товара.
+
+        Args:
+            name: Название товара.
+            new_price: Новая цена товара.
+
+        Returns:
+            True, если цена обновлена, иначе False.
+
+        Raises:
+            ValueError: Если новая цена некорректна.
+        """
+        return self.update_prices({name: new_price})[name]
+
+    def update_prices(self, prices: Dict[str, float]) -> Dict[str, bool]:
+        """Обновляет цены нескольких товаров одним пакетом: либо все, либо ни одной.
+
+        Args:
+            prices: Словарь, где ключ - название товара, значение - новая цена.
+
+        Returns:
+            Словарь, где ключ - название товара, значение - True, если цена
+            обновлена, и False, если товар не найден.
+
+        Raises:
+            ValueError: Если хотя бы одна цена некорректна.
+        """
+        invalid = [
+            f"{name}: {price!r}" for name, price in prices.items()
+            if not isinstance(price, (int, float)) or not math.isfinite(price) or price <= 0
+        ]
+        if invalid:
+            error_msg = (
+                f"Цена товара должна быть положительным конечным числом, "
+                f"некорректных цен: {len(invalid)}: "
+                + "; ".join(invalid[:10])
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        results = {}
+        with self.transaction():
+            for name, price in prices.items():
+                cursor = self._conn.execute(
+                    "UPDATE products SET price = ? WHERE store_id = ? AND name = ?",
+                    (price, self._store_id, name)
+                )
+                results[name] = cursor.rowcount > 0
+
+        updated = sum(results.values())
+        if updated < len(prices):
+            logger.warning(
+                "Обновлены цены в магазине '%s': %s, "
+                "не найдено товаров: %s",
+                self.name, updated, len(prices) - updated
+            )
+        elif not self._tx_depth:
+            logger.info("Обновлены цены в магазине '%s': %s", self.name, updated)
+        return results
+
+    def _select(self, where: str = "", params: Sequence[Any] = (), order: str = "name",
+                limit: Optional[int] = None) -> List[Product]:
+        """Выбирает товары магазина по условию.
+
+        Args:
+            where: Дополнительное условие SQL (начиная с AND).
+            params: Параметры условия.
+            order: Выражение сортировки SQL.
+            limit: Максимальное количество товаров.
+
+        Returns:
+            Список товаров.
+        """
+        query = (
+            f"SELECT name, price, category FROM products WHERE store_id = ? {where} "
+            f"ORDER BY {order}"
+        )
+        params = [self._store_id, *params]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(limit, 0))
+        return [Product(*row) for row in self._conn.execute(query, params)]
+
+    def iter_items(self, batch_size: int = 1000) -> Iterator[Product]:
+        """Перебирает товары магазина, не загружая их все в память.
+
+        Args:
+            batch_size: Количество строк, читаемых из базы за раз.
+
+        Yields:
+            Товары в порядке названий.
+        """
+        cursor = self._conn.execute(
+            "SELECT name, price, category FROM products WHERE store_id = ? ORDER BY name",
+            (self._store_id,)
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield Product(*row)
+
+    def get_items_by_category(self, category: str) -> List[Product]:
+        """Возвращает список товаров по категории.
+
+        Args:
+            category: Название категории.
+
+        Returns:
+            Список товаров в указанной категории в порядке названий.
+        """
+        return self._select("AND category = ?", (category,))
+
+    def get_categories(self) -> List[str]:
+        """Возвращает список всех категорий товаров в магазине.
+
+        Returns:
+            Список уникальных категорий по алфавиту.
+        """
+        return [row[0] for row in self._conn.execute(
+            "SELECT DISTINCT category FROM products WHERE store_id = ? ORDER BY category",
+            (self._store_id,)
+        )]
+
+    def get_category_counts(self) -> Dict[str, int]:
+        """Возвращает количество товаров в каждой категории.
+
+        Returns:
+            Словарь, где ключ - категория, значение - количество товаров.
+        """
+        return dict(self._conn.execute(
+            "SELECT category, COUNT(*) FROM products WHERE store_id = ? GROUP BY category",
+            (self._store_id,)
+        ))
+
+    def get_items_in_price_range(self, min_price: float, max_price: float,
+                                 category: Optional[str] = None) -> List[Product]:
+        """Возвращает товары с ценой в диапазоне включительно.
+
+        Args:
+            min_price: Минимальная цена.
+            max_price: Максимальная цена.
+            category: Название категории или None для всего магазина.
+
+        Returns:
+            Список товаров в порядке возрастания цены.
+        """
+        where = "AND price BETWEEN ? AND ?"
+        params: List[Any] = [min_price, max_price]
+        if category is not None:
+            where += " AND category = ?"
+            params.append(category)
+        return self._select(where, params, order="price, name")
+
+    def cheapest(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Возвращает самые дешёвые товары.
+
+        Args:
+            count: Количество товаров.
+            category: Название категории или None для всего магазина.
+
+        Returns:
+            Список товаров в порядке возрастания цены.
+        """
+        if category is None:
+            return self._select(order="price, name", limit=count)
+        return self._select("AND category = ?", (category,), order="price, name", limit=count)
+
+    def most_expensive(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Возвращает самые дорогие товары.
+
+        Args:
+            count: Количество товаров.
+            category: Название категории или None для всего магазина.
+
+        Returns:
+            Список товаров в порядке убывания цены.
+        """
+        order = "price DESC, name DESC"
+        if category is None:
+            return self._select(order=order, limit=count)
+        return self._select("AND category = ?", (category,), order=order, limit=count)
+
+    def close(self) -> None:
+        """Закрывает соединение с базой данных."""
+        self._conn.close()
+
+    def __enter__(self) -> 'SqliteStore':
+        """Возвращает магазин для использования в операторе with."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Закрывает соединение при выходе из оператора with."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Возвращает количество товаров в магазине."""
+        return int(self._conn.execute(
+            "SELECT COUNT(*) FROM products WHERE store_id = ?", (self._store_id,)
+        ).fetchone()[0])
+
+    def __contains__(self, item_name: str) -> bool:
+        """Проверяет наличие товара в магазине."""
+        return self._conn.execute(
+            "SELECT 1 FROM products WHERE store_id = ? AND name = ?",
+            (self._store_id, item_name)
+        ).fetchone() is not None
@@ -1,21 +1,52 @@
 """Модуль для работы с магазинами и товарами."""
 
+import csv
+import heapq
 import logging
-from typing import Dict, List, Optional, Any, Union
-from dataclasses import dataclass, asdict, field
-
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("store_manager.log"),
-        logging.StreamHandler()
-    ]
+import math
+import sys
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import (
+    Dict, List, Optional, Any, Union, Callable, Iterable, Iterator, NamedTuple, Sequence,
+    Set, TextIO, Tuple
 )
+from dataclasses import dataclass
+
+from .indexes import BULK_INSERT_THRESHOLD, PrefixIndex, SortedPriceIndex
+
+# Журнал настраивается приложением (см. log.configure_logging)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Количество блокировок, между которыми распределяются товары магазина
+_LOCK_STRIPES = 64
+
+# Начиная с Python 3.10 товары хранятся в слотах, без словаря атрибутов
+_PRODUCT_DATACLASS_OPTIONS: Dict[str, Any] = (
+    {'slots': True} if sys.version_info >= (3, 10) else {}
+)
+
+
+def validate_product_fields(name: str, price: float) -> Optional[str]:
+    """Проверяет название и цену товара.
+    
+    Args:
+        name: Название товара.
+        price: Цена товара.
+        
+    Returns:
+        Сообщение об ошибке или None, если данные корректны.
+    """
+    if not name.strip():
+        return "Название товара не может быть пустым"
+    if not math.isfinite(price) or price <= 0:
+        return f"Цена товара должна быть положительным конечным числом: {price}"
+    return None
+
+
+@dataclass(**_PRODUCT_DATACLASS_OPTIONS)
 class Product:
     """Класс для представления товара.
     
@@ -23,6 +54,11 @@ class Product:
         name: Название товара.
         price: Цена товара (должна быть положительной).
         category: Категория товара (опционально).
+    
+    Название и категория интернируются (sys.intern), поэтому одинаковые
+    строки во всех магазинах сети хранятся в памяти в одном экземпляре,
+    а у каждого магазина остаются только собственные цены. Атрибуты
+    хранятся в слотах (Python 3.10+), что уменьшает размер экземпляра.
     """
     name: str
     price: float
@@ -30,19 +66,22 @@ class Product:
     
     def __post_init__(self):
         """Проверяет корректность данных при инициализации."""
-        if not self.name.strip():
-            error_msg = "Название товара не может быть пустым"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-            
-        if self.price <= 0:
-            error_msg = f"Цена товара должна быть положительной: {self.price}"
+        error_msg = validate_product_fields(self.name, self.price)
+        if error_msg:
             logger.error(error_msg)
             raise ValueError(error_msg)
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+        if type(self.category) is str:
+            self.category = sys.intern(self.category)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Возвращает представление товара в виде словаря."""
-        return asdict(self)
+        """Возвращает представление товара в виде словаря.
+        
+        Словарь собирается напрямую: asdict() рекурсивно копирует поля
+        и в несколько раз медленнее для такого простого класса.
+        """
+        return {'name': self.name, 'price': self.price, 'category': self.category}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Product':
@@ -54,22 +93,135 @@ class Product:
         return f"{self.name} - {self.price:.2f} руб. ({self.category})"
 
 
+class StoreEvent(NamedTuple):
+    """Изменение ассортимента магазина.
+    
+    Атрибуты:
+        kind: Вид изменения: 'add', 'remove' или 'price'.
+        product: Затронутый товар.
+        old_price: Цена до изменения (None для 'add').
+        new_price: Цена после изменения (None для 'remove').
+    """
+    kind: str
+    product: Product
+    old_price: Optional[float] = None
+    new_price: Optional[float] = None
+    
+    @property
+    def added_price(self) -> float:
+        """Цена, с которой товар попадает в индексы ('add' и 'price')."""
+        assert self.new_price is not None, f"У изменения '{self.kind}' нет новой цены"
+        return self.new_price
+    
+    @property
+    def removed_price(self) -> float:
+        """Цена, с которой товар уходит из индексов ('remove' и 'price')."""
+        assert self.old_price is not None, f"У изменения '{self.kind}' нет старой цены"
+        return self.old_price
+
+
+StoreListener = Callable[['Store', List[StoreEvent]], None]
+
+
+class PriceConflictError(ValueError):
+    """Цена товара изменена другим участником после чтения версии.
+    
+    Атрибуты:
+        name: Название товара.
+        expected_version: Ожидавшаяся версия товара.
+        actual_version: Текущая версия товара.
+    """
+    
+    def __init__(self, name: str, expected_version: int, actual_version: int):
+        """Инициализирует ошибку конфликта версий.
+        
+        Args:
+            name: Название товара.
+            expected_version: Ожидавшаяся версия товара.
+            actual_version: Текущая версия товара.
+        """
+        super().__init__(
+            f"Цена товара '{name}' уже изменена: ожидалась версия "
+            f"{expected_version}, текущая {actual_version}"
+        )
+        self.name = name
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+@dataclass
+class CsvLoadReport:
+    """Результат загрузки товаров из CSV.
+    
+    Атрибуты:
+        rows: Количество прочитанных строк данных.
+        loaded: Количество добавленных товаров.
+        rejected: Количество отклонённых строк.
+        seconds: Время загрузки в секундах.
+    """
+    rows: int = 0
+    loaded: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Скорость загрузки в строках в секунду."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _invert_event(event: StoreEvent) -> StoreEvent:
+    """Возвращает изменение, обратное данному.
+    
+    Args:
+        event: Изменение ассортимента.
+        
+    Returns:
+        Изменение, отменяющее действие исходного.
+    """
+    if event.kind == 'add':
+        return StoreEvent('remove', event.product, old_price=event.new_price)
+    if event.kind == 'remove':
+        return StoreEvent('add', event.product, new_price=event.old_price)
+    return StoreEvent('price', event.product, event.new_price, event.old_price)
+
+
 class Store:
     """Класс для представления магазина.
     
     Атрибуты:
         name: Название магазина.
         address: Адрес магазина.
+        location: Координаты магазина (широта, долгота) в градусах или None.
         items: Словарь товаров, где ключ - название товара, значение - экземпляр Product.
+    
+    Магазин ведёт индекс товаров по категориям и отсортированные индексы
+    цен (общий и по категориям), поэтому списки категорий, выборки по
+    цене и процентили не требуют обхода всего ассортимента. Индекс
+    названий позволяет искать товары по префиксу (см. autocomplete()).
+    Об изменениях ассортимента уведомляются подписчики (см. add_listener).
+    Изменения можно объединять в транзакции (см. transaction()).
+    Строковое представление кэшируется по категориям и перестраивается
+    только для категорий, изменившихся с прошлого вызова.
+    
+    У каждого товара есть номер версии, меняющийся при каждом изменении
+    (см. get_version()), что позволяет нескольким потокам изменять цены
+    с проверкой версии (см. update_price()). Изменения одного товара
+    защищены одной из _LOCK_STRIPES блокировок, выбираемой по названию,
+    поэтому потоки, изменяющие разные товары, не ждут друг друга;
+    общие индексы обновляются под короткой общей блокировкой.
+    Транзакции рассчитаны на использование из одного потока.
     """
     
-    def __init__(self, name: str, address: str, initial_items: Optional[Dict[str, Dict[str, Any]]] = None):
+    def __init__(self, name: str, address: str, initial_items: Optional[Dict[str, Dict[str, Any]]] = None,
+                 location: Optional[Tuple[float, float]] = None):
         """Инициализирует магазин.
         
         Args:
             name: Название магазина.
             address: Адрес магазина.
             initial_items: Начальный ассортимент товаров.
+            location: Координаты магазина (широта, долгота) в градусах.
         """
         if not name.strip():
             error_msg = "Название магазина не может быть пустым"
@@ -81,23 +233,259 @@ class Store:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
+        if location is not None:
+            latitude, longitude = location
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                error_msg = f"Неверные координаты магазина: {location}"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            location = (float(latitude), float(longitude))
+        
         self.name = name.strip()
         self.address = address.strip()
+        self.location = location
         self._items: Dict[str, Product] = {}
+        # Индекс категорий: категория -> {название товара: товар}
+        self._categories: Dict[str, Dict[str, Product]] = {}
+        # Индексы цен: общий и по категориям
+        self._prices = SortedPriceIndex()
+        self._category_prices: Dict[str, SortedPriceIndex] = {}
+        # Индекс названий для поиска по префиксу
+        self._names = PrefixIndex()
+        self._listeners: List[StoreListener] = []
+        # Транзакции: глубина вложенности и изменения, ожидающие применения
+        self._tx_depth = 0
+        self._tx_events: List[StoreEvent] = []
+        # Количество изменений транзакции, уже отражённых в индексах
+        self._tx_indexed = 0
+        # Счётчик изменений, увеличивается при каждой модификации
+        self._version = 0
+        # Версии товаров: номер изменения магазина, последним затронувшего товар
+        self._product_versions: Dict[str, int] = {}
+        # Блокировки товаров (по названию) и общая блокировка индексов
+        self._product_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._lock = threading.RLock()
+        # Кэш строкового представления: фрагменты категорий и весь текст
+        self._fragments: Dict[str, str] = {}
+        self._dirty_categories: Set[str] = set()
+        self._rendered: Optional[Tuple[Tuple[int, str, str], str]] = None
         
         # Добавляем начальные товары, если они предоставлены
         if initial_items:
-            for item_name, item_data in initial_items.items():
-                try:
-                    self.add_item(
-                        name=item_name,
-                        price=item_data.get('price'),
-                        category=item_data.get('category', 'Без категории')
-                    )
-                except (ValueError, KeyError) as e:
-                    logger.error(f"Ошибка при добавлении начального товара {item_name}: {e}")
+            with self.transaction():
+                for item_name, item_data in initial_items.items():
+                    try:
+                        self.add_item(
+                            name=item_name,
+                            price=item_data.get('price'),
+                            category=item_data.get('category', 'Без категории')
+                        )
+                    except (ValueError, KeyError) as e:
+                        logger.error("Ошибка при добавлении начального товара %s: %s", item_name, e)
+        
+        logger.info("Создан новый магазин: %s", self)
+    
+    @property
+    def version(self) -> int:
+        """Номер версии, увеличивающийся при каждом изменении ассортимента."""
+        return self._version
+    
+    def add_listener(self, listener: StoreListener) -> None:
+        """Подписывает обработчик на изменения ассортимента.
+        
+        Обработчик вызывается с магазином и списком изменений: после
+        каждой операции или один раз при завершении транзакции.
         
-        logger.info(f"Создан новый магазин: {self}")
+        Args:
+            listener: Функция-обработчик.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: StoreListener) -> bool:
+        """Отписывает обработчик от изменений ассортимента.
+        
+        Args:
+            listener: Ранее подписанный обработчик.
+            
+        Returns:
+            True, если обработчик был подписан, иначе False.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+            return True
+        return False
+    
+    def _record(self, event: StoreEvent) -> None:
+        """Применяет изменение или откладывает его до завершения транзакции.
+        
+        Args:
+            event: Изменение ассортимента.
+        """
+        self._record_many([event])
+    
+    def _record_many(self, events: List[StoreEvent]) -> None:
+        """Применяет пакет изменений или откладывает его до завершения транзакции.
+        
+        Args:
+            events: Список изменений ассортимента.
+        """
+        if not events:
+            return
+        with self._lock:
+            self._version += 1
+            for event in events:
+                if event.kind == 'remove':
+                    self._product_versions.pop(event.product.name, None)
+                else:
+                    self._product_versions[event.product.name] = self._version
+            if self._tx_depth:
+                self._tx_events.extend(events)
+            else:
+                self._update_indexes(events)
+                self._notify_listeners(events)
+    
+    def _update_indexes(self, events: List[StoreEvent]) -> None:
+        """Отражает изменения во вспомогательных индексах.
+        
+        Args:
+            events: Список изменений ассортимента.
+        """
+        if len(events) >= BULK_INSERT_THRESHOLD and all(event.kind == 'add' for event in events):
+            self._index_added(events)
+            return
+        for event in events:
+            product = event.product
+            self._dirty_categories.add(product.category)
+            if event.kind == 'add':
+                self._categories.setdefault(product.category, {})[product.name] = product
+                self._names.add(product.name)
+                self._prices.add(event.added_price, product.name)
+                self._category_prices.setdefault(
+                    product.category, SortedPriceIndex()
+                ).add(event.added_price, product.name)
+            elif event.kind == 'remove':
+                bucket = self._categories[product.category]
+                del bucket[product.name]
+                self._names.remove(product.name)
+                self._prices.remove(event.removed_price, product.name)
+                self._category_prices[product.category].remove(event.removed_price, product.name)
+                if not bucket:
+                    del self._categories[product.category]
+                    del self._category_prices[product.category]
+            else:
+                self._prices.remove(event.removed_price, product.name)
+                self._prices.add(event.added_price, product.name)
+                category_prices = self._category_prices[product.category]
+                category_prices.remove(event.removed_price, product.name)
+                category_prices.add(event.added_price, product.name)
+    
+    def _index_added(self, events: List[StoreEvent]) -> None:
+        """Добавляет в индексы пакет новых товаров.
+        
+        Индексы цен и названий пополняются пакетами по категориям, а не
+        вставкой каждого товара, что важно при загрузке ассортимента.
+        
+        Args:
+            events: Изменения вида 'add'.
+        """
+        by_category: Dict[str, List[StoreEvent]] = {}
+        for event in events:
+            by_category.setdefault(event.product.category, []).append(event)
+        for category, group in by_category.items():
+            self._dirty_categories.add(category)
+            bucket = self._categories.setdefault(category, {})
+            for event in group:
+                bucket[event.product.name] = event.product
+            self._category_prices.setdefault(category, SortedPriceIndex()).update(
+                (event.added_price, event.product.name) for event in group
+            )
+        self._names.update(event.product.name for event in events)
+        self._prices.update((event.added_price, event.product.name) for event in events)
+    
+    def _sync_indexes(self) -> None:
+        """Применяет к индексам изменения текущей транзакции, если они есть."""
+        if self._tx_indexed < len(self._tx_events):
+            self._update_indexes(self._tx_events[self._tx_indexed:])
+            self._tx_indexed = len(self._tx_events)
+    
+    def _notify_listeners(self, events: List[StoreEvent]) -> None:
+        """Передаёт изменения подписчикам одним пакетом.
+        
+        Args:
+            events: Список изменений ассортимента.
+        """
+        for listener in self._listeners:
+            listener(self, events)
+    
+    @contextmanager
+    def transaction(self) -> Iterator['Store']:
+        """Объединяет изменения ассортимента в одну транзакцию.
+        
+        Изменения применяются к товарам сразу, индексы обновляются при
+        завершении (или при первом запросе к ним внутри транзакции),
+        подписчики получают изменения одним пакетом, а вместо строки
+        журнала на каждую операцию записывается одна итоговая. При исключении все
+        изменения транзакции откатываются. Вложенные транзакции
+        откатывают только свои изменения.
+        
+        Yields:
+            Этот же магазин.
+        """
+        mark = len(self._tx_events)
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            self._rollback_to(mark)
+            raise
+        self._tx_depth -= 1
+        if not self._tx_depth and self._tx_events:
+            self._sync_indexes()
+            events = self._tx_events
+            self._tx_events = []
+            self._tx_indexed = 0
+            self._notify_listeners(events)
+            counts = {'add': 0, 'remove': 0, 'price': 0}
+            for event in events:
+                counts[event.kind] += 1
+            logger.info(
+                "Транзакция в магазине '%s' завершена: "
+                "добавлено %s, удалено %s, "
+                "изменено цен %s",
+                self.name, counts['add'], counts['remove'], counts['price']
+            )
+    
+    def _rollback_to(self, mark: int) -> None:
+        """Отменяет изменения транзакции, записанные после отметки.
+        
+        Args:
+            mark: Количество изменений на момент начала транзакции.
+        """
+        changes = len(self._tx_events) - mark
+        with self._lock:
+            if changes:
+                self._version += 1
+            while len(self._tx_events) > mark:
+                event = self._tx_events.pop()
+                if len(self._tx_events) < self._tx_indexed:
+                    self._update_indexes([_invert_event(event)])
+                    self._tx_indexed = len(self._tx_events)
+                name = event.product.name
+                if event.kind == 'add':
+                    del self._items[name]
+                    self._product_versions.pop(name, None)
+                elif event.kind == 'remove':
+                    self._items[name] = event.product
+                    self._product_versions[name] = self._version
+                else:
+                    event.product.price = event.removed_price
+                    self._product_versions[name] = self._version
+        logger.warning(
+            "Транзакция в магазине '%s' отменена: "
+            "откачено изменений: %s",
+            self.name, changes
+        )
     
     def add_item(self, name: str, price: float, category: str = "Без категории") -> Product:
         """Добавляет товар в ассортимент магазина.
@@ -113,15 +501,210 @@ class Store:
         Raises:
             ValueError: Если товар с таким названием уже существует.
         """
-        if name in self._items:
-            error_msg = f"Товар с названием '{name}' уже существует в магазине '{self.name}'"
+        with self._product_lock(name):
+            if name in self._items:
+                error_msg = f"Товар с названием '{name}' уже существует в магазине '{self.name}'"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            
+            product = Product(name=name, price=price, category=category)
+            self._items[name] = product
+            self._record(StoreEvent('add', product, new_price=product.price))
+        if not self._tx_depth:
+            logger.info("Добавлен товар в магазин '%s': %s", self.name, product)
+        return product
+    
+    def add_items(self, items: Iterable[Sequence[Any]]) -> List[Product]:
+        """Добавляет несколько товаров: либо все, либо ни одного.
+        
+        Все товары проверяются до изменения ассортимента; в журнал
+        записывается одна итоговая строка.
+        
+        Args:
+            items: Кортежи (название, цена) или (название, цена, категория).
+            
+        Returns:
+            Список добавленных товаров в порядке передачи.
+            
+        Raises:
+            ValueError: Если хотя бы один товар некорректен или уже существует.
+        """
+        products = []
+        errors = []
+        seen = set()
+        for item in items:
+            # Форма элемента тоже проверяется здесь: число вместо кортежа
+            # или нехешируемое название попадают в общий список ошибок
+            try:
+                if not 2 <= len(item) <= 3:
+                    errors.append(
+                        f"Ожидается (название, цена) или (название, цена, категория): {item!r}"
+                    )
+                    continue
+                name = item[0]
+                if name in self._items or name in seen:
+                    errors.append(
+                        f"Товар с названием '{name}' уже существует в магазине '{self.name}'"
+                    )
+                    continue
+                product = Product(*item)
+            except (ValueError, TypeError) as e:
+                errors.append(f"{item!r}: {e}")
+                continue
+            seen.add(name)
+            products.append(product)
+        
+        if errors:
+            error_msg = (
+                f"Товары не добавлены в магазин '{self.name}', ошибок: {len(errors)}: "
+                + "; ".join(errors[:10])
+            )
             logger.error(error_msg)
             raise ValueError(error_msg)
+        
+        self._insert_batch(products)
+        logger.info("Добавлено товаров в магазин '%s': %s", self.name, len(products))
+        return products
+    
+    def load_csv(
+        self,
+        source: Union[str, Path, TextIO],
+        mapping: Optional[Dict[str, str]] = None,
+        errors_path: Optional[Union[str, Path]] = None,
+        batch_size: int = 10000,
+        delimiter: str = ',',
+        encoding: str = 'utf-8',
+    ) -> CsvLoadReport:
+        """Загружает товары из CSV потоково, не читая файл целиком.
+        
+        Строки проверяются по тем же правилам, что и Product, и
+        добавляются пакетами по batch_size. Некорректные строки и
+        повторяющиеся названия пропускаются и, если указан errors_path,
+        записываются в отдельный CSV с колонкой 'error'.
+        
+        Args:
+            source: Путь к файлу или открытый текстовый поток.
+            mapping: Соответствие полей товара ('name', 'price', 'category')
+                колонкам файла; по умолчанию колонки называются так же.
+            errors_path: Путь к файлу для отклонённых строк.
+            batch_size: Количество товаров в одном пакете добавления.
+            delimiter: Разделитель полей.
+            encoding: Кодировка файла (если передан путь).
             
-        product = Product(name=name, price=price, category=category)
-        self._items[name] = product
-        logger.info(f"Добавлен товар в магазин '{self.name}': {product}")
-        return product
+        Returns:
+            Отчёт о загрузке.
+            
+        Raises:
+            ValueError: Если в файле нет обязательных колонок.
+        """
+        columns = {'name': 'name', 'price': 'price', 'category': 'category'}
+        columns.update(mapping or {})
+        report = CsvLoadReport()
+        started = time.perf_counter()
+        
+        with ExitStack() as stack:
+            if isinstance(source, (str, Path)):
+                source = stack.enter_context(open(source, newline='', encoding=encoding))
+            reader = csv.DictReader(source, delimiter=delimiter)
+            fieldnames = reader.fieldnames or []
+            missing = [columns[key] for key in ('name', 'price') if columns[key] not in fieldnames]
+            if missing:
+                error_msg = f"В CSV нет обязательных колонок: {', '.join(missing)}"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            
+            errors_writer = None
+            if errors_path is not None:
+                errors_file = stack.enter_context(
+                    open(errors_path, 'w', newline='', encoding=encoding)
+                )
+                errors_writer = csv.writer(errors_file, delimiter=delimiter)
+                errors_writer.writerow(list(fieldnames) + ['error'])
+            
+            batch: List[Product] = []
+            batch_names = set()
+            for row in reader:
+                report.rows += 1
+                name = (row.get(columns['name']) or '').strip()
+                category = (row.get(columns['category']) or '').strip() or "Без категории"
+                try:
+                    price = float((row.get(columns['price']) or '').replace(',', '.'))
+                    error = validate_product_fields(name, price)
+                except ValueError:
+                    error = f"Неверная цена: {row.get(columns['price'])!r}"
+                if error is None and (name in self._items or name in batch_names):
+                    error = f"Товар с названием '{name}' уже существует в магазине '{self.name}'"
+                
+                if error is not None:
+                    report.rejected += 1
+                    if errors_writer is not None:
+                        errors_writer.writerow([row.get(key, '') for key in fieldnames] + [error])
+                    continue
+                
+                batch.append(Product(name=name, price=price, category=category))
+                batch_names.add(name)
+                if len(batch) >= batch_size:
+                    self._load_batch(batch, report)
+                    batch = []
+                    batch_names.clear()
+            self._load_batch(batch, report)
+        
+        report.seconds = time.perf_counter() - started
+        logger.info(
+            "Загружено товаров из CSV в магазин '%s': %s, "
+            "отклонено: %s, скорость: %.0f строк/с",
+            self.name, report.loaded, report.rejected, report.rows_per_second
+        )
+        return report
+    
+    def _load_batch(self, batch: List[Product], report: CsvLoadReport) -> None:
+        """Добавляет пакет товаров из CSV и учитывает его в отчёте.
+        
+        Товары, добавленные другим потоком во время загрузки,
+        считаются отклонёнными.
+        
+        Args:
+            batch: Проверенные товары.
+            report: Отчёт о загрузке.
+        """
+        loaded = self._insert_batch(batch, skip_existing=True)
+        report.loaded += loaded
+        report.rejected += len(batch) - loaded
+    
+    def _insert_batch(self, products: List[Product], skip_existing: bool = False) -> int:
+        """Добавляет проверенные товары без записи в журнал по каждому.
+        
+        Пакет добавляется под блокировками всех его товаров, поэтому
+        отсутствие названий в магазине проверяется повторно: товар с
+        тем же названием мог быть добавлен другим потоком после проверки
+        вызывающим кодом.
+        
+        Args:
+            products: Товары с уникальными названиями.
+            skip_existing: Пропускать товары, уже имеющиеся в магазине
+                (иначе пакет не добавляется и возникает ошибка).
+            
+        Returns:
+            Количество добавленных товаров.
+            
+        Raises:
+            ValueError: Если товар уже существует, а skip_existing ложно.
+        """
+        with self._locked_products(product.name for product in products):
+            existing = [product.name for product in products if product.name in self._items]
+            if existing and not skip_existing:
+                error_msg = (
+                    f"Товары не добавлены в магазин '{self.name}', уже существуют: "
+                    + ", ".join(existing[:10])
+                )
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            if existing:
+                products = [product for product in products if product.name not in self._items]
+            for product in products:
+                self._items[product.name] = product
+            self._record_many([StoreEvent('add', product, new_price=product.price) for product in products])
+        return len(products)
     
     def remove_item(self, name: str) -> bool:
         """Удаляет товар из ассортимента.
@@ -132,11 +715,15 @@ class Store:
         Returns:
             True, если товар был удален, иначе False.
         """
-        if name in self._items:
-            del self._items[name]
-            logger.info(f"Товар '{name}' удален из магазина '{self.name}'")
+        with self._product_lock(name):
+            product = self._items.pop(name, None)
+            if product is not None:
+                self._record(StoreEvent('remove', product, old_price=product.price))
+        if product is not None:
+            if not self._tx_depth:
+                logger.info("Товар '%s' удален из магазина '%s'", name, self.name)
             return True
-        logger.warning(f"Товар '{name}' не найден в магазине '{self.name}'")
+        logger.warning("Товар '%s' не найден в магазине '%s'", name, self.name)
         return False
     
     def get_item(self, name: str) -> Optional[Product]:
@@ -150,6 +737,14 @@ class Store:
         """
         return self._items.get(name)
     
+    def get_items(self) -> List[Product]:
+        """Возвращает список всех товаров магазина.
+        
+        Returns:
+            Список товаров в порядке добавления.
+        """
+        return list(self._items.values())
+    
     def get_price(self, name: str) -> Optional[float]:
         """Возвращает цену товара по названию.
         
@@ -164,36 +759,184 @@ class Store:
             return product.price
         return None
     
-    def update_price(self, name: str, new_price: float) -> bool:
+    def _product_lock(self, name: str) -> threading.Lock:
+        """Возвращает блокировку, защищающую изменения товара.
+        
+        Args:
+            name: Название товара.
+            
+        Returns:
+            Блокировка.
+        """
+        return self._product_locks[hash(name) % _LOCK_STRIPES]
+    
+    @contextmanager
+    def _locked_products(self, names: Iterable[str]) -> Iterator[None]:
+        """Удерживает блокировки всех указанных товаров.
+        
+        Блокировки берутся в порядке номеров, чтобы исключить взаимоблокировку.
+        
+        Args:
+            names: Названия товаров.
+        """
+        stripes = sorted({hash(name) % _LOCK_STRIPES for name in names})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._product_locks[stripe])
+            yield
+    
+    def _lookup(self, names: Iterable[str]) -> List[Product]:
+        """Возвращает товары по названиям, полученным из индекса.
+        
+        Индексы читаются без блокировок, поэтому товар может быть удалён
+        другим потоком после чтения индекса; такие названия пропускаются.
+        
+        Args:
+            names: Названия товаров.
+            
+        Returns:
+            Список найденных товаров в порядке названий.
+        """
+        items = self._items
+        return [product for product in map(items.get, names) if product is not None]
+    
+    def get_version(self, name: str) -> Optional[int]:
+        """Возвращает номер версии товара.
+        
+        Версия меняется при каждом добавлении товара и изменении его цены
+        и никогда не повторяется, даже если товар удалён и добавлен заново.
+        
+        Args:
+            name: Название товара.
+            
+        Returns:
+            Номер версии или None, если товар не найден.
+        """
+        return self._product_versions.get(name)
+    
+    def get_price_with_version(self, name: str) -> Optional[Tuple[float, int]]:
+        """Возвращает согласованные цену и версию товара.
+        
+        Args:
+            name: Название товара.
+            
+        Returns:
+            Кортеж (цена, версия) или None, если товар не найден.
+        """
+        with self._product_lock(name):
+            product = self._items.get(name)
+            if product is None:
+                return None
+            return product.price, self._product_versions[name]
+    
+    def update_price(self, name: str, new_price: float,
+                     expected_version: Optional[int] = None) -> bool:
         """Обновляет цену товара.
         
+        Если указана ожидаемая версия, цена изменяется только при
+        совпадении её с текущей версией товара (сравнение с обменом):
+        так параллельные изменения не затирают друг друга.
+        
         Args:
             name: Название товара.
             new_price: Новая цена товара.
+            expected_version: Версия товара, на основе которой рассчитана
+                новая цена (см. get_price_with_version()).
             
         Returns:
             True, если цена обновлена, иначе False.
             
         Raises:
             ValueError: Если новая цена некорректна.
+            PriceConflictError: Если версия товара не совпадает с ожидаемой.
         """
-        if new_price <= 0:
-            error_msg = f"Цена товара должна быть положительной: {new_price}"
+        if not math.isfinite(new_price) or new_price <= 0:
+            error_msg = f"Цена товара должна быть положительным конечным числом: {new_price}"
             logger.error(error_msg)
             raise ValueError(error_msg)
-            
-        if name in self._items:
-            old_price = self._items[name].price
-            self._items[name].price = new_price
-            logger.info(
-                f"Цена товара '{name}' в магазине '{self.name}' обновлена: "
-                f"{old_price:.2f} -> {new_price:.2f} руб."
-            )
+        
+        with self._product_lock(name):
+            product = self._items.get(name)
+            if product is not None:
+                version = self._product_versions[name]
+                if expected_version is not None and version != expected_version:
+                    # Конфликт - ожидаемая ситуация при параллельной работе,
+                    # вызывающий повторяет попытку, поэтому уровень DEBUG
+                    error = PriceConflictError(name, expected_version, version)
+                    logger.debug("%s", error)
+                    raise error
+                old_price = product.price
+                product.price = new_price
+                self._record(StoreEvent('price', product, old_price, new_price))
+        
+        if product is not None:
+            if not self._tx_depth:
+                logger.info(
+                    "Цена товара '%s' в магазине '%s' обновлена: "
+                    "%.2f -> %.2f руб.",
+                    name, self.name, old_price, new_price
+                )
             return True
-            
-        logger.warning(f"Товар '{name}' не найден в магазине '{self.name}' для обновления цены")
+        
+        logger.warning("Товар '%s' не найден в магазине '%s' для обновления цены", name, self.name)
         return False
     
+    def update_prices(self, prices: Dict[str, float]) -> Dict[str, bool]:
+        """Обновляет цены нескольких товаров: либо все, либо ни одной.
+        
+        Все цены проверяются до изменения ассортимента; в журнал
+        записывается одна итоговая строка.
+        
+        Args:
+            prices: Словарь, где ключ - название товара, значение - новая цена.
+            
+        Returns:
+            Словарь, где ключ - название товара, значение - True, если цена
+            обновлена, и False, если товар не найден.
+            
+        Raises:
+            ValueError: Если хотя бы одна цена некорректна.
+        """
+        invalid = []
+        for name, new_price in prices.items():
+            try:
+                if not math.isfinite(new_price) or new_price <= 0:
+                    invalid.append(f"{name}: {new_price}")
+            except TypeError:
+                invalid.append(f"{name}: {new_price!r}")
+        
+        if invalid:
+            error_msg = (
+                f"Цена товара должна быть положительным конечным числом, некорректных цен: {len(invalid)}: "
+                + "; ".join(invalid[:10])
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        results = {}
+        events = []
+        with self._locked_products(prices):
+            for name, new_price in prices.items():
+                product = self._items.get(name)
+                if product is None:
+                    results[name] = False
+                    continue
+                events.append(StoreEvent('price', product, product.price, new_price))
+                product.price = new_price
+                results[name] = True
+            self._record_many(events)
+        
+        missing = len(prices) - len(events)
+        if missing:
+            logger.warning(
+                "Обновлены цены в магазине '%s': %s, "
+                "не найдено товаров: %s",
+                self.name, len(events), missing
+            )
+        else:
+            logger.info("Обновлены цены в магазине '%s': %s", self.name, len(events))
+        return results
+    
     def get_items_by_category(self, category: str) -> List[Product]:
         """Возвращает список товаров по категории.
         
@@ -203,7 +946,8 @@ class Store:
         Returns:
             Список товаров в указанной категории.
         """
-        return [product for product in self._items.values() if product.category == category]
+        self._sync_indexes()
+        return list(self._categories.get(category, {}).values())
     
     def get_categories(self) -> List[str]:
         """Возвращает список всех категорий товаров в магазине.
@@ -211,7 +955,182 @@ class Store:
         Returns:
             Список уникальных категорий.
         """
-        return list({product.category for product in self._items.values()})
+        self._sync_indexes()
+        return list(self._categories)
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """Возвращает количество товаров в каждой категории.
+        
+        Returns:
+            Словарь, где ключ - категория, значение - количество товаров.
+        """
+        self._sync_indexes()
+        return {category: len(bucket) for category, bucket in self._categories.items()}
+    
+    def count_in_category(self, category: str) -> int:
+        """Возвращает количество товаров в категории за O(1).
+        
+        Args:
+            category: Название категории.
+            
+        Returns:
+            Количество товаров (0 для несуществующей категории).
+        """
+        self._sync_indexes()
+        return len(self._categories.get(category, ()))
+    
+    def _price_index(self, category: Optional[str]) -> SortedPriceIndex:
+        """Возвращает индекс цен всего магазина или категории.
+        
+        Args:
+            category: Название категории или None для всего магазина.
+            
+        Returns:
+            Индекс цен (пустой для несуществующей категории).
+        """
+        self._sync_indexes()
+        if category is None:
+            return self._prices
+        return self._category_prices.get(category, SortedPriceIndex())
+    
+    def get_category_stats(self, category: str) -> Optional[Dict[str, float]]:
+        """Возвращает статистику цен категории за O(1).
+        
+        Агрегаты поддерживаются индексом цен категории при каждом
+        изменении ассортимента, поэтому обход товаров не требуется.
+        
+        Args:
+            category: Название категории.
+            
+        Returns:
+            Словарь с ключами 'count', 'total', 'min', 'max' и 'average'
+            или None для несуществующей категории.
+        """
+        self._sync_indexes()
+        index = self._category_prices.get(category)
+        if index is None:
+            return None
+        return self._index_stats(index)
+    
+    def category_stats(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает статистику цен по всем категориям.
+        
+        Returns:
+            Словарь, где ключ - категория, значение - словарь как в
+            get_category_stats().
+        """
+        self._sync_indexes()
+        return {
+            category: self._index_stats(index)
+            for category, index in self._category_prices.items()
+        }
+    
+    @staticmethod
+    def _index_stats(index: SortedPriceIndex) -> Dict[str, float]:
+        """Собирает статистику индекса цен категории.
+        
+        Индекс категории удаляется вместе с её последним товаром,
+        поэтому минимум, максимум и средняя цена всегда определены.
+        
+        Args:
+            index: Непустой индекс цен категории.
+            
+        Returns:
+            Словарь как в get_category_stats().
+        """
+        low, high, average = index.min_price(), index.max_price(), index.mean()
+        assert low is not None and high is not None and average is not None, "Индекс категории пуст"
+        return {'count': len(index), 'total': index.total, 'min': low, 'max': high, 'average': average}
+    
+    def get_items_in_price_range(self, min_price: float, max_price: float,
+                                 category: Optional[str] = None) -> List[Product]:
+        """Возвращает товары с ценой в диапазоне включительно.
+        
+        Args:
+            min_price: Минимальная цена.
+            max_price: Максимальная цена.
+            category: Название категории или None для всего магазина.
+            
+        Returns:
+            Список товаров в порядке возрастания цены.
+        """
+        return self._lookup(self._price_index(category).range(min_price, max_price))
+    
+    def cheapest(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Возвращает самые дешёвые товары.
+        
+        Args:
+            count: Количество товаров.
+            category: Название категории или None для всего магазина.
+            
+        Returns:
+            Список товаров в порядке возрастания цены.
+        """
+        return self._lookup(self._price_index(category).first(count))
+    
+    def most_expensive(self, count: int, category: Optional[str] = None) -> List[Product]:
+        """Возвращает самые дорогие товары.
+        
+        Args:
+            count: Количество товаров.
+            category: Название категории или None для всего магазина.
+            
+        Returns:
+            Список товаров в порядке убывания цены.
+        """
+        return self._lookup(self._price_index(category).last(count))
+    
+    def price_percentile(self, percent: float, category: Optional[str] = None) -> Optional[float]:
+        """Возвращает цену указанного процентиля (метод ближайшего ранга).
+        
+        Args:
+            percent: Процентиль от 0 до 100.
+            category: Название категории или None для всего магазина.
+            
+        Returns:
+            Цена или None, если товаров нет.
+            
+        Raises:
+            ValueError: Если процентиль вне диапазона от 0 до 100.
+        """
+        if not 0 <= percent <= 100:
+            error_msg = f"Процентиль должен быть в диапазоне от 0 до 100: {percent}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return self._price_index(category).percentile(percent)
+    
+    def autocomplete(self, prefix: str, limit: int = 10, order: str = 'name') -> List[Product]:
+        """Возвращает товары, название которых начинается с префикса.
+        
+        Регистр не учитывается. Границы совпадений находятся двоичным
+        поиском по индексу названий, поэтому при сортировке по названию
+        запрос выполняется за O(log n + limit), без обхода ассортимента.
+        
+        Args:
+            prefix: Начало названия товара.
+            limit: Максимальное количество товаров.
+            order: Порядок: 'name' - по названию, 'price' - по возрастанию
+                цены, 'category' - по категории, затем по названию.
+            
+        Returns:
+            Список товаров.
+            
+        Raises:
+            ValueError: Если порядок сортировки неизвестен.
+        """
+        if order not in ('name', 'price', 'category'):
+            error_msg = f"Неизвестный порядок сортировки подсказок: {order}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        self._sync_indexes()
+        if order == 'name':
+            return self._lookup(self._names.search(prefix, limit))
+        
+        products = self._lookup(self._names.search(prefix))
+        if order == 'price':
+            return heapq.nsmallest(limit, products, key=lambda p: (p.price, p.name))
+        return heapq.nsmallest(limit, products, key=lambda p: (p.category, p.name.casefold()))
     
     def to_dict(self) -> Dict[str, Any]:
         """Возвращает представление магазина в виде словаря.
@@ -219,11 +1138,14 @@ class Store:
         Returns:
             Словарь с данными магазина и его ассортиментом.
         """
-        return {
+        data: Dict[str, Any] = {
             'name': self.name,
             'address': self.address,
             'items': {name: product.to_dict() for name, product in self._items.items()}
         }
+        if self.location is not None:
+            data['location'] = list(self.location)
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Store':
@@ -235,18 +1157,63 @@ class Store:
         Returns:
             Экземпляр класса Store.
         """
-        store = cls(name=data['name'], address=data['address'])
+        location = data.get('location')
+        store = cls(
+            name=data['name'],
+            address=data['address'],
+            location=tuple(location) if location is not None else None,
+        )
+        products = []
+        seen = set()
         for item_name, item_data in data.get('items', {}).items():
             try:
-                store._items[item_name] = Product.from_dict(item_data)
+                product = Product.from_dict(item_data)
             except (ValueError, KeyError) as e:
-                logger.error(f"Ошибка при загрузке товара {item_name}: {e}")
+                logger.error("Ошибка при загрузке товара %s: %s", item_name, e)
+                continue
+            # Название берётся из данных товара и может повторяться под разными ключами
+            if product.name in seen:
+                logger.error("Повторяющийся товар пропущен: %s", product.name)
+                continue
+            seen.add(product.name)
+            products.append(product)
+        store._insert_batch(products)
         return store
     
+    def _render_category(self, category: str) -> str:
+        """Формирует фрагмент строкового представления для категории.
+        
+        Args:
+            category: Название категории.
+            
+        Returns:
+            Строки категории и её товаров.
+        """
+        result = [f"\n  {category}:"]
+        for product in sorted(self._categories[category].values(), key=lambda p: p.name):
+            result.append(f"  - {product}")
+        return "\n".join(result)
+    
     def __str__(self) -> str:
-        """Возвращает строковое представление магазина."""
+        """Возвращает строковое представление магазина.
+        
+        Повторный вызов без изменений возвращает готовую строку; после
+        изменений заново формируются только затронутые категории.
+        """
+        self._sync_indexes()
+        key = (self._version, self.name, self.address)
+        if self._rendered is not None and self._rendered[0] == key:
+            return self._rendered[1]
+        
+        for category in self._dirty_categories:
+            if category in self._categories:
+                self._fragments[category] = self._render_category(category)
+            else:
+                self._fragments.pop(category, None)
+        self._dirty_categories.clear()
+        
         items_count = len(self._items)
-        categories = self.get_categories()
+        categories = list(self._categories)
         
         result = [
             f"=== {self.name} ===",
@@ -258,14 +1225,11 @@ class Store:
         if items_count > 0:
             result.append("\nАссортимент товаров:")
             for category in sorted(categories):
-                result.append(f"\n  {category}:")
-                for product in sorted(
-                    self.get_items_by_category(category),
-                    key=lambda p: p.name
-                ):
-                    result.append(f"  - {product}")
+                result.append(self._fragments[category])
         
-        return "\n".join(result)
+        rendered = "\n".join(result)
+        self._rendered = (key, rendered)
+        return rendered
     
     def __len__(self) -> int:
         """Возвращает количество товаров в магазине."""
@@ -0,0 +1,655 @@
+"""Модуль для синхронизации копий магазинов и менеджеров задач.
+
+Содержимое копии описывается деревом хешей (дерево Меркла): хеш каждой
+записи (товара или задачи), хеши корзин записей внутри группы
+(категории товаров или месяца срока задач), хеши групп и корневой хеш.
+Две копии сравнивают хеши сверху вниз и запрашивают только записи из
+различающихся корзин, поэтому объём обмена зависит от количества
+изменений, а не от размера каталога. Сравнение возможно и между
+процессами: serve() обслуживает запросы к копии через соединение
+multiprocessing, а RemoteReplica передаёт их.
+"""
+
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .serialization import Codec, get_codec
+from .store import Store, StoreEvent
+from .task import Task, TaskManager
+
+logger = logging.getLogger(__name__)
+
+# Количество корзин записей в группе по умолчанию
+DEFAULT_BUCKETS = 64
+
+# Разделитель полей при хешировании записей
+_SEPARATOR = '\x1f'
+
+# Методы копии, доступные удалённой стороне
+PEER_METHODS = frozenset({'info', 'group_hashes', 'bucket_hashes', 'leaf_hashes', 'records'})
+
+
+def _digest(parts: Iterable[str]) -> str:
+    """Возвращает 128-битный хеш последовательности строк в шестнадцатеричном виде.
+
+    Args:
+        parts: Строки.
+
+    Returns:
+        Хеш, одинаковый во всех процессах.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\x1e')
+    return h.hexdigest()
+
+
+class HashTree:
+    """Дерево хешей записей: корень -> группы -> корзины -> записи.
+
+    Запись попадает в корзину по хешу ключа, поэтому у одинаковых
+    записей в разных процессах одинаковые корзины. Изменение записи
+    помечает её корзину; хеши корзин, групп и корня пересчитываются
+    только для помеченных корзин при следующем запросе.
+    """
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS):
+        """Инициализирует пустое дерево.
+
+        Args:
+            buckets: Количество корзин записей в группе.
+
+        Raises:
+            ValueError: Если количество корзин неположительно.
+        """
+        if buckets < 1:
+            error_msg = f"Количество корзин должно быть положительным: {buckets}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self.buckets = buckets
+        # Группа -> список корзин (ключ -> хеш записи)
+        self._leaves: Dict[str, List[Dict[str, str]]] = {}
+        self._key_groups: Dict[str, str] = {}
+        self._bucket_hashes: Dict[str, List[Optional[str]]] = {}
+        self._group_hashes: Dict[str, str] = {}
+        self._dirty: Dict[str, Set[int]] = {}
+        self._root: Optional[str] = None
+
+    def bucket_of(self, key: str) -> int:
+        """Возвращает номер корзины ключа."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4).digest()
+        return int.from_bytes(digest, 'little') % self.buckets
+
+    def set(self, key: str, group: str, leaf_hash: str) -> None:
+        """Добавляет или обновляет запись.
+
+        Args:
+            key: Ключ записи.
+            group: Группа записи (запись может перейти в другую группу).
+            leaf_hash: Хеш содержимого записи.
+        """
+        old_group = self._key_groups.get(key)
+        if old_group is not None and old_group != group:
+            self.discard(key)
+        bucket = self.bucket_of(key)
+        buckets = self._leaves.get(group)
+        if buckets is None:
+            buckets = self._leaves[group] = [{} for _ in range(self.buckets)]
+        if buckets[bucket].get(key) == leaf_hash:
+            return
+        buckets[bucket][key] = leaf_hash
+        self._key_groups[key] = group
+        self._dirty.setdefault(group, set()).add(bucket)
+        self._root = None
+
+    def discard(self, key: str) -> bool:
+        """Удаляет запись.
+
+        Args:
+            key: Ключ записи.
+
+        Returns:
+            True, если запись была в дереве, иначе False.
+        """
+        group = self._key_groups.pop(key, None)
+        if group is None:
+            return False
+        bucket = self.bucket_of(key)
+        del self._leaves[group][bucket][key]
+        self._dirty.setdefault(group, set()).add(bucket)
+        self._root = None
+        return True
+
+    def _update(self) -> str:
+        """Пересчитывает хеши помеченных корзин, их групп и корня.
+
+        Returns:
+            Корневой хеш.
+        """
+        if self._root is not None:
+            return self._root
+        for group, dirty in self._dirty.items():
+            buckets = self._leaves[group]
+            if not any(buckets):
+                del self._leaves[group]
+                self._bucket_hashes.pop(group, None)
+                self._group_hashes.pop(group, None)
+                continue
+            hashes = self._bucket_hashes.setdefault(group, [None] * self.buckets)
+            for bucket in dirty:
+                leaves = buckets[bucket]
+                hashes[bucket] = _digest(
+                    f"{key}{_SEPARATOR}{leaves[key]}" for key in sorted(leaves)
+                ) if leaves else None
+            self._group_hashes[group] = _digest(h or '' for h in hashes)
+        self._dirty = {}
+        self._root = _digest(
+            f"{group}{_SEPARATOR}{self._group_hashes[group]}" for group in sorted(self._group_hashes)
+        )
+        return self._root
+
+    def root(self) -> str:
+        """Возвращает корневой хеш."""
+        return self._update()
+
+    def group_hashes(self) -> Dict[str, str]:
+        """Возвращает хеши групп."""
+        self._update()
+        return dict(self._group_hashes)
+
+    def bucket_hashes(self, group: str) -> List[Optional[str]]:
+        """Возвращает хеши корзин группы (None для пустых корзин)."""
+        self._update()
+        return list(self._bucket_hashes.get(group, [None] * self.buckets))
+
+    def leaf_hashes(self, group: str, buckets: Iterable[int]) -> Dict[str, str]:
+        """Возвращает хеши записей из корзин группы.
+
+        Args:
+            group: Группа.
+            buckets: Номера корзин.
+
+        Returns:
+            Словарь ключ -> хеш записи.
+        """
+        result: Dict[str, str] = {}
+        leaves = self._leaves.get(group)
+        if leaves is not None:
+            for bucket in buckets:
+                result.update(leaves[bucket])
+        return result
+
+    def __len__(self) -> int:
+        """Возвращает количество записей."""
+        return len(self._key_groups)
+
+
+@dataclass
+class Patch:
+    """Изменения, переводящие одну копию в состояние другой.
+
+    Атрибуты:
+        upserts: Добавляемые или изменённые записи в виде списков
+            ([название, цена, категория] для товаров, [описание, срок,
+            статус, описания блокирующих задач] для задач).
+        removals: Ключи удаляемых записей.
+    """
+    upserts: List[List[Any]] = field(default_factory=list)
+    removals: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Возвращает количество изменений."""
+        return len(self.upserts) + len(self.removals)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает представление изменений в виде словаря."""
+        return {'upserts': self.upserts, 'removals': self.removals}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Patch':
+        """Создает изменения из словаря."""
+        return cls(list(data.get('upserts', [])), list(data.get('removals', [])))
+
+
+class Replica(ABC):
+    """Копия данных с деревом хешей для синхронизации.
+
+    Подклассы задают вид копии, запись и группу объекта и применение
+    изменений. Методы info(), group_hashes(), bucket_hashes(),
+    leaf_hashes() и records() образуют интерфейс, через который другая
+    копия (в том числе удалённая) вычисляет разницу.
+    """
+
+    kind = ''
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS):
+        """Инициализирует копию с пустым деревом хешей.
+
+        Args:
+            buckets: Количество корзин записей в группе.
+        """
+        self.tree = HashTree(buckets)
+
+    def _refresh(self) -> None:
+        """Приводит дерево хешей в соответствие с данными."""
+
+    def info(self) -> Dict[str, Any]:
+        """Возвращает вид копии, количество корзин и корневой хеш."""
+        self._refresh()
+        return {'kind': self.kind, 'buckets': self.tree.buckets, 'root': self.tree.root()}
+
+    def group_hashes(self) -> Dict[str, str]:
+        """Возвращает хеши групп."""
+        self._refresh()
+        return self.tree.group_hashes()
+
+    def bucket_hashes(self, groups: List[str]) -> Dict[str, List[Optional[str]]]:
+        """Возвращает хеши корзин групп.
+
+        Args:
+            groups: Группы.
+
+        Returns:
+            Словарь группа -> хеши корзин (None для пустых корзин).
+        """
+        self._refresh()
+        return {group: self.tree.bucket_hashes(group) for group in groups}
+
+    def leaf_hashes(self, buckets: Dict[str, List[int]]) -> Dict[str, Dict[str, str]]:
+        """Возвращает хеши записей из корзин.
+
+        Args:
+            buckets: Словарь группа -> номера корзин.
+
+        Returns:
+            Словарь группа -> (ключ -> хеш записи).
+        """
+        self._refresh()
+        return {group: self.tree.leaf_hashes(group, numbers) for group, numbers in buckets.items()}
+
+    @abstractmethod
+    def records(self, keys: List[str]) -> List[List[Any]]:
+        """Возвращает записи по ключам (отсутствующие ключи пропускаются)."""
+
+    @abstractmethod
+    def apply(self, patch: Patch) -> None:
+        """Применяет изменения к данным копии."""
+
+
+class StoreReplica(Replica):
+    """Копия магазина: записи - товары, группы - категории.
+
+    Дерево хешей обновляется обработчиком изменений ассортимента,
+    поэтому после изменения пересчитываются хеши только затронутых
+    корзин.
+    """
+
+    kind = 'Store'
+
+    def __init__(self, store: Store, buckets: int = DEFAULT_BUCKETS):
+        """Инициализирует копию магазина и подписывается на его изменения.
+
+        Args:
+            store: Магазин.
+            buckets: Количество корзин товаров в категории.
+        """
+        super().__init__(buckets)
+        self.store = store
+        for product in store.get_items():
+            self.tree.set(product.name, product.category,
+                          self._leaf_hash(product.name, product.price, product.category))
+        store.add_listener(self._on_store_events)
+
+    @staticmethod
+    def _leaf_hash(name: str, price: float, category: str) -> str:
+        """Возвращает хеш товара."""
+        return _digest((name, repr(float(price)), category))
+
+    def _on_store_events(self, store: Store, events: List[StoreEvent]) -> None:
+        """Обновляет хеши изменённых товаров.
+
+        Args:
+            store: Магазин.
+            events: Список изменений ассортимента.
+        """
+        for event in events:
+            product = event.product
+            if event.kind == 'remove':
+                self.tree.discard(product.name)
+            else:
+                self.tree.set(product.name, product.category,
+                              self._leaf_hash(product.name, event.added_price, product.category))
+
+    def close(self) -> None:
+        """Отписывает копию от изменений магазина."""
+        self.store.remove_listener(self._on_store_events)
+
+    def records(self, keys: List[str]) -> List[List[Any]]:
+        """Возвращает товары в виде [название, цена, категория]."""
+        result = []
+        for name in keys:
+            product = self.store.get_item(name)
+            if product is not None:
+                result.append([product.name, product.price, product.category])
+        return result
+
+    def apply(self, patch: Patch) -> None:
+        """Применяет изменения к магазину одной транзакцией.
+
+        Товар, сменивший категорию, удаляется и добавляется заново.
+
+        Args:
+            patch: Изменения.
+        """
+        store = self.store
+        with store.transaction():
+            for name in patch.removals:
+                store.remove_item(name)
+            for name, price, category in patch.upserts:
+                product = store.get_item(name)
+                if product is not None and product.category == category:
+                    if product.price != price:
+                        store.update_price(name, price)
+                    continue
+                if product is not None:
+                    store.remove_item(name)
+                store.add_item(name, price, category)
+        logger.info(
+            "Применены изменения к магазину '%s': %s товаров "
+            "добавлено или изменено, %s удалено",
+            store.name, len(patch.upserts), len(patch.removals)
+        )
+
+
+class TaskManagerReplica(Replica):
+    """Копия менеджера задач: записи - задачи, группы - месяцы срока.
+
+    Ключ задачи - описание в нижнем регистре, как при поиске в
+    get_task(). Обработчик изменений менеджера запоминает ключи
+    изменённых задач, и перед обращением к дереву хешей пересчитываются
+    только они. Из задач с одинаковым ключом синхронизируется первая,
+    об остальных пишется предупреждение в журнал.
+    """
+
+    kind = 'TaskManager'
+
+    def __init__(self, manager: TaskManager, buckets: int = DEFAULT_BUCKETS):
+        """Инициализирует копию менеджера задач и подписывается на его изменения.
+
+        Args:
+            manager: Менеджер задач.
+            buckets: Количество корзин задач в месяце.
+        """
+        super().__init__(buckets)
+        self.manager = manager
+        self._dirty: Set[str] = {task.description.lower() for task in manager.tasks}
+        manager.add_listener(self._on_tasks_changed)
+
+    def _on_tasks_changed(self, manager: TaskManager, tasks: List[Task]) -> None:
+        """Запоминает ключи изменённых задач.
+
+        Args:
+            manager: Менеджер задач.
+            tasks: Изменённые задачи.
+        """
+        self._dirty.update(task.description.lower() for task in tasks)
+
+    def close(self) -> None:
+        """Отписывает копию от изменений менеджера задач."""
+        self.manager.remove_listener(self._on_tasks_changed)
+
+    def _record(self, task: Task) -> List[Any]:
+        """Возвращает запись задачи с отсортированными описаниями блокеров."""
+        blockers = sorted(blocker.description for blocker in self.manager.blockers_of(task))
+        return [task.description, task.due_date, task.status, blockers]
+
+    def _refresh(self) -> None:
+        """Пересчитывает хеши задач, изменившихся с прошлой проверки."""
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            tasks = self.manager.get_tasks(key)
+            if not tasks:
+                self.tree.discard(key)
+                continue
+            if len(tasks) > 1:
+                logger.warning(
+                    "Задачи с описанием '%s' совпадают без учёта регистра: "
+                    "синхронизируется только первая из %s",
+                    tasks[0].description, len(tasks)
+                )
+            description, due_date, status, blockers = self._record(tasks[0])
+            self.tree.set(key, due_date[:7],
+                          _digest((description, due_date, str(status), *blockers)))
+
+    def records(self, keys: List[str]) -> List[List[Any]]:
+        """Возвращает задачи в виде [описание, срок, статус, блокеры]."""
+        result = []
+        for key in keys:
+            task = self.manager.get_task(key)
+            if task is not None:
+                result.append(self._record(task))
+        return result
+
+    def apply(self, patch: Patch) -> None:
+        """Применяет изменения к менеджеру задач одной транзакцией.
+
+        Задача с другим сроком или снова открытая пересоздаётся, при
+        этом зависящие от неё задачи сохраняют зависимость. Зависимости
+        устанавливаются после добавления всех задач.
+
+        Args:
+            patch: Изменения.
+        """
+        manager = self.manager
+        with manager.transaction():
+            for key in patch.removals:
+                task = manager.get_task(key)
+                if task is not None:
+                    manager.remove_task(task.description)
+            tasks: Dict[str, Task] = {}
+            for description, due_date, status, _ in patch.upserts:
+                key = description.lower()
+                task = tasks.get(key) or manager.get_task(key)
+                if task is None:
+                    task = manager.add_task(description, due_date)
+                elif task.description != description or task.due_date != due_date \
+                        or (task.status and not status):
+                    task = manager.replace_task(task, description, due_date)
+                tasks[key] = task
+                if status and not task.status:
+                    task.mark_as_done()
+            # Сначала снимаются лишние зависимости, иначе новая может
+            # временно образовать цикл со старой
+            wanted = {}
+            for description, _, _, blockers in patch.upserts:
+                for blocker_task in map(manager.get_task, blockers):
+                    if blocker_task is not None:
+                        tasks.setdefault(blocker_task.description.lower(), blocker_task)
+                task = tasks[description.lower()]
+                wanted[task] = {tasks[blocker.lower()] for blocker in blockers}
+                for blocker in set(manager.blockers_of(task)) - wanted[task]:
+                    manager.unlink_tasks(task, blocker)
+            for task, blockers in wanted.items():
+                for blocker in blockers - set(manager.blockers_of(task)):
+                    manager.link_tasks(task, blocker)
+        logger.info(
+            "Применены изменения к менеджеру задач: %s задач "
+            "добавлено или изменено, %s удалено",
+            len(patch.upserts), len(patch.removals)
+        )
+
+
+def diff(source: Any, target: Any) -> Patch:
+    """Вычисляет изменения, переводящие target в состояние source.
+
+    Хеши сравниваются сверху вниз: корень, группы, корзины различающихся
+    групп и записи различающихся корзин; запрашиваются только записи,
+    хеши которых различаются.
+
+    Args:
+        source: Копия-источник (Replica или RemoteReplica).
+        target: Копия, которую нужно обновить.
+
+    Returns:
+        Изменения для target.apply().
+
+    Raises:
+        ValueError: Если копии разного вида или с разным количеством корзин.
+    """
+    source_info = source.info()
+    target_info = target.info()
+    if (source_info['kind'], source_info['buckets']) != (target_info['kind'], target_info['buckets']):
+        error_msg = (
+            f"Несовместимые копии: {source_info['kind']} ({source_info['buckets']} корзин) "
+            f"и {target_info['kind']} ({target_info['buckets']} корзин)"
+        )
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if source_info['root'] == target_info['root']:
+        return Patch()
+
+    source_groups = source.group_hashes()
+    target_groups = target.group_hashes()
+    groups = sorted(
+        group for group in source_groups.keys() | target_groups.keys()
+        if source_groups.get(group) != target_groups.get(group)
+    )
+    source_buckets = source.bucket_hashes([g for g in groups if g in source_groups])
+    target_buckets = target.bucket_hashes([g for g in groups if g in target_groups])
+    empty = [None] * source_info['buckets']
+    changed: Dict[str, List[int]] = {}
+    for group in groups:
+        ours = source_buckets.get(group, empty)
+        theirs = target_buckets.get(group, empty)
+        changed[group] = [number for number, (a, b) in enumerate(zip(ours, theirs)) if a != b]
+
+    source_leaves: Dict[str, str] = {}
+    for leaves in source.leaf_hashes({g: b for g, b in changed.items() if g in source_groups}).values():
+        source_leaves.update(leaves)
+    target_leaves: Dict[str, str] = {}
+    for leaves in target.leaf_hashes({g: b for g, b in changed.items() if g in target_groups}).values():
+        target_leaves.update(leaves)
+
+    # Запись, сменившая группу, есть в обоих наборах и приходит целиком
+    upserts = sorted(key for key, h in source_leaves.items() if target_leaves.get(key) != h)
+    removals = sorted(target_leaves.keys() - source_leaves.keys())
+    patch = Patch(source.records(upserts) if upserts else [], removals)
+    logger.info(
+        "Разница копий %s: групп %s, "
+        "корзин %s, изменений %s",
+        source_info['kind'], len(groups), sum(map(len, changed.values())), len(patch)
+    )
+    return patch
+
+
+def sync(source: Any, target: Replica) -> Patch:
+    """Приводит копию target к состоянию source.
+
+    Args:
+        source: Копия-источник (Replica или RemoteReplica).
+        target: Локальная копия.
+
+    Returns:
+        Применённые изменения.
+    """
+    patch = diff(source, target)
+    if patch:
+        target.apply(patch)
+    return patch
+
+
+def serve(replica: Replica, connection: Any, codec: Any = 'json') -> None:
+    """Обслуживает запросы RemoteReplica к копии до получения None.
+
+    Args:
+        replica: Копия.
+        connection: Соединение multiprocessing (например, из Pipe()).
+        codec: Название кодека или кодек модуля serialization.
+    """
+    codec = get_codec(codec)
+    while True:
+        request = codec.loads(connection.recv_bytes())
+        if request is None:
+            break
+        method, args = request
+        if method not in PEER_METHODS:
+            response = [False, f"Неизвестный метод копии: {method}"]
+        else:
+            try:
+                response = [True, getattr(replica, method)(*args)]
+            except Exception as e:
+                logger.error("Ошибка при обработке запроса %s: %s", method, e)
+                response = [False, str(e)]
+        connection.send_bytes(codec.dumps(response))
+
+
+class RemoteReplica:
+    """Копия в другом процессе, обслуживаемая функцией serve().
+
+    Атрибуты:
+        calls: Количество выполненных запросов.
+        bytes_received: Объём полученных ответов в байтах.
+    """
+
+    def __init__(self, connection: Any, codec: Any = 'json'):
+        """Инициализирует удалённую копию.
+
+        Args:
+            connection: Соединение multiprocessing с процессом копии.
+            codec: Название кодека или кодек (такой же, как у serve()).
+        """
+        self.connection = connection
+        self.codec: Codec = get_codec(codec)
+        self.calls = 0
+        self.bytes_received = 0
+
+    def _call(self, method: str, *args: Any) -> Any:
+        """Выполняет запрос к удалённой копии.
+
+        Raises:
+            ValueError: Если удалённая копия вернула ошибку.
+        """
+        self.connection.send_bytes(self.codec.dumps([method, list(args)]))
+        payload = self.connection.recv_bytes()
+        self.calls += 1
+        self.bytes_received += len(payload)
+        ok, result = self.codec.loads(payload)
+        if not ok:
+            error_msg = f"Ошибка удалённой копии: {result}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return result
+
+    def info(self) -> Dict[str, Any]:
+        """Возвращает вид копии, количество корзин и корневой хеш."""
+        info: Dict[str, Any] = self._call('info')
+        return info
+
+    def group_hashes(self) -> Dict[str, str]:
+        """Возвращает хеши групп."""
+        hashes: Dict[str, str] = self._call('group_hashes')
+        return hashes
+
+    def bucket_hashes(self, groups: List[str]) -> Dict[str, List[Optional[str]]]:
+        """Возвращает хеши корзин групп."""
+        hashes: Dict[str, List[Optional[str]]] = self._call('bucket_hashes', groups)
+        return hashes
+
+    def leaf_hashes(self, buckets: Dict[str, List[int]]) -> Dict[str, Dict[str, str]]:
+        """Возвращает хеши записей из корзин."""
+        hashes: Dict[str, Dict[str, str]] = self._call('leaf_hashes', buckets)
+        return hashes
+
+    def records(self, keys: List[str]) -> List[List[Any]]:
+        """Возвращает записи по ключам."""
+        records: List[List[Any]] = self._call('records', keys)
+        return records
+
+    def close(self) -> None:
+        """Завершает обслуживание запросов удалённой стороной."""
+        self.connection.send_bytes(self.codec.dumps(None))
@@ -1,18 +1,13 @@
 """Модуль для работы с задачами."""
 
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterator, Set
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("task_manager.log"),
-        logging.StreamHandler()
-    ]
-)
+from .indexes import CalendarHistogram
+
+# Журнал настраивается приложением (см. log.configure_logging)
 logger = logging.getLogger(__name__)
 
 class Task:
@@ -50,15 +45,19 @@ class Task:
         self.description = description.strip()
         self.due_date = due_date
         self.status = False
-        logger.info(f"Создана новая задача: {self}")
+        # Обработчик, вызываемый менеджером при выполнении задачи
+        self._on_done: Optional[Callable[['Task'], None]] = None
+        logger.info("Создана новая задача: %s", self)
     
     def mark_as_done(self) -> None:
         """Отмечает задачу как выполненную."""
         if not self.status:
             self.status = True
-            logger.info(f"Задача отмечена как выполненная: {self}")
+            logger.info("Задача отмечена как выполненная: %s", self)
+            if self._on_done is not None:
+                self._on_done(self)
         else:
-            logger.warning(f"Попытка отметить уже выполненную задачу: {self}")
+            logger.warning("Попытка отметить уже выполненную задачу: %s", self)
     
     def to_dict(self) -> Dict[str, Any]:
         """Возвращает представление задачи в виде словаря.
@@ -97,12 +96,199 @@ class Task:
         return f"Task(description='{self.description}', due_date='{self.due_date}', status={self.status})"
 
 
+TaskListener = Callable[['TaskManager', List[Task]], None]
+
+
 class TaskManager:
-    """Класс для управления списком задач."""
+    """Класс для управления списком задач.
+    
+    Поддерживает зависимости между задачами: задача считается готовой
+    к выполнению, когда все блокирующие её задачи выполнены. Счётчики
+    незавершённых блокировок обновляются инкрементально.
+    
+    Также ведётся календарная гистограмма сроков, позволяющая считать
+    задачи за период без обхода списка: за O(log n) плюс количество
+    далёких дней сроков вне окна гистограммы (обычно их нет).
+    
+    Изменения можно объединять в транзакции (см. transaction()), а
+    обработчики (см. add_listener()) узнают, какие задачи изменились.
+    """
     
     def __init__(self):
         """Инициализирует менеджер задач с пустым списком."""
         self.tasks: List[Task] = []
+        # Задачи по описанию в нижнем регистре в порядке списка задач
+        self._descriptions: Dict[str, List[Task]] = {}
+        # Граф зависимостей: задача -> блокирующие её задачи и обратные рёбра
+        self._blockers: Dict[Task, Set[Task]] = {}
+        self._dependents: Dict[Task, Set[Task]] = {}
+        # Количество невыполненных блокирующих задач
+        self._pending_blockers: Dict[Task, int] = {}
+        # Невыполненные задачи без открытых блокировок (в порядке готовности)
+        self._ready: Dict[Task, None] = {}
+        # Календарь сроков: порядковый номер дня срока каждой задачи
+        self._calendar = CalendarHistogram()
+        self._due_days: Dict[Task, int] = {}
+        # Транзакции: глубина вложенности и журнал отмены изменений
+        self._tx_depth = 0
+        self._undo_log: List[Callable[[], None]] = []
+        # Производные индексы не соответствуют данным и требуют перестроения
+        self._indexes_dirty = False
+        # Счётчик изменений, увеличивается при каждой модификации
+        self._version = 0
+        # Обработчики изменений и задачи, изменённые в текущей транзакции
+        self._listeners: List[TaskListener] = []
+        self._tx_changed: List[Task] = []
+    
+    @property
+    def version(self) -> int:
+        """Номер версии, увеличивающийся при каждом изменении задач."""
+        return self._version
+    
+    def add_listener(self, listener: TaskListener) -> None:
+        """Подписывает обработчик на изменения задач.
+        
+        Обработчик вызывается с менеджером и списком изменённых задач
+        (добавленных, удалённых, выполненных или со сменой блокеров):
+        после каждой операции или один раз при завершении транзакции,
+        в том числе отменённой. Обработчик не должен изменять менеджер.
+        
+        Args:
+            listener: Функция-обработчик.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: TaskListener) -> bool:
+        """Отписывает обработчик от изменений задач.
+        
+        Args:
+            listener: Ранее подписанный обработчик.
+            
+        Returns:
+            True, если обработчик был подписан, иначе False.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+            return True
+        return False
+    
+    def _notify_listeners(self, tasks: List[Task]) -> None:
+        """Сообщает обработчикам об изменённых задачах.
+        
+        Args:
+            tasks: Изменённые задачи.
+        """
+        for listener in list(self._listeners):
+            listener(self, tasks)
+    
+    def _record_change(self, undo: Callable[[], None], *tasks: Task) -> bool:
+        """Учитывает изменение задач.
+        
+        Увеличивает номер версии и сообщает обработчикам об изменённых
+        задачах, а внутри транзакции записывает отмену изменения,
+        откладывает обновление индексов и уведомление обработчиков.
+        
+        Args:
+            undo: Функция, отменяющая изменение основных данных.
+            *tasks: Задачи, затронутые изменением.
+            
+        Returns:
+            True, если идёт транзакция и индексы будут перестроены
+            при её завершении, иначе False.
+        """
+        self._version += 1
+        if not self._tx_depth:
+            if self._listeners:
+                self._notify_listeners(list(tasks))
+            return False
+        if self._listeners:
+            self._tx_changed.extend(tasks)
+        self._undo_log.append(undo)
+        self._indexes_dirty = True
+        return True
+    
+    def _register_task(self, task: Task) -> None:
+        """Добавляет задачу в список и во внутренние индексы.
+        
+        Args:
+            task: Регистрируемая задача.
+        """
+        self.tasks.append(task)
+        self._descriptions.setdefault(task.description.lower(), []).append(task)
+        task._on_done = self._on_task_done
+        if self._record_change(lambda: self._unregister_task(task), task):
+            return
+        self._pending_blockers[task] = 0
+        if not task.status:
+            self._ready[task] = None
+        day = self._due_day(task)
+        self._calendar.add(day, done=task.status)
+    
+    def _unregister_task(self, task: Task) -> None:
+        """Отменяет регистрацию задачи (используется при откате транзакции).
+        
+        Args:
+            task: Задача, добавленная в ходе транзакции.
+        """
+        self.tasks.remove(task)
+        self._forget_description(task)
+        task._on_done = None
+    
+    def _forget_description(self, task: Task) -> None:
+        """Удаляет задачу из словаря описаний.
+        
+        Args:
+            task: Задача менеджера.
+        """
+        key = task.description.lower()
+        tasks = self._descriptions[key]
+        tasks.remove(task)
+        if not tasks:
+            del self._descriptions[key]
+    
+    def _due_day(self, task: Task) -> int:
+        """Возвращает порядковый номер дня срока задачи с кэшированием.
+        
+        Args:
+            task: Задача.
+            
+        Returns:
+            Порядковый номер дня срока.
+        """
+        day = self._due_days.get(task)
+        if day is None:
+            day = datetime.strptime(task.due_date, '%Y-%m-%d').toordinal()
+            self._due_days[task] = day
+        return day
+    
+    def _on_task_done(self, task: Task) -> None:
+        """Уменьшает счётчики блокировок у задач, зависящих от выполненной.
+        
+        Args:
+            task: Задача, отмеченная как выполненная.
+        """
+        def undo() -> None:
+            task.status = False
+        
+        if self._record_change(undo, task):
+            return
+        self._ready.pop(task, None)
+        self._calendar.mark_done(self._due_days[task])
+        for dependent in self._dependents.get(task, ()):
+            self._pending_blockers[dependent] -= 1
+            if self._pending_blockers[dependent] == 0 and not dependent.status:
+                self._ready[dependent] = None
+    
+    def tasks_by_description(self) -> Dict[str, Task]:
+        """Возвращает задачи по описанию в нижнем регистре.
+        
+        При совпадающих описаниях остаётся первая задача, как в get_task().
+        Словарь строится по индексу описаний без обхода списка задач.
+        
+        Returns:
+            Словарь описание -> задача.
+        """
+        return {key: tasks[0] for key, tasks in self._descriptions.items()}
     
     def add_task(self, description: str, due_date: str) -> Task:
         """Добавляет новую задачу.
@@ -119,11 +305,12 @@ class TaskManager:
         """
         try:
             task = Task(description, due_date)
-            self.tasks.append(task)
-            logger.info(f"Задача добавлена: {task}")
+            self._register_task(task)
+            if not self._tx_depth:
+                logger.info("Задача добавлена: %s", task)
             return task
         except ValueError as e:
-            logger.error(f"Ошибка при добавлении задачи: {e}")
+            logger.error("Ошибка при добавлении задачи: %s", e)
             raise
     
     def get_task(self, description: str) -> Optional[Task]:
@@ -135,10 +322,19 @@ class TaskManager:
         Returns:
             Найденная задача или None, если не найдена.
         """
-        for task in self.tasks:
-            if task.description.lower() == description.lower():
-                return task
-        return None
+        tasks = self._descriptions.get(description.lower())
+        return tasks[0] if tasks else None
+    
+    def get_tasks(self, description: str) -> List[Task]:
+        """Находит все задачи с описанием без учёта регистра.
+        
+        Args:
+            description: Описание искомых задач.
+            
+        Returns:
+            Список задач в порядке списка задач (пустой, если не найдены).
+        """
+        return list(self._descriptions.get(description.lower(), []))
     
     def mark_task_completed(self, description: str) -> bool:
         """Отмечает задачу как выполненную.
@@ -153,7 +349,7 @@ class TaskManager:
         if task:
             task.mark_as_done()
             return True
-        logger.warning(f"Задача не найдена: {description}")
+        logger.warning("Задача не найдена: %s", description)
         return False
     
     def get_current_tasks(self) -> List[Task]:
@@ -183,18 +379,467 @@ class TaskManager:
         """
         task = self.get_task(description)
         if task:
-            self.tasks.remove(task)
-            logger.info(f"Задача удалена: {task}")
+            self._remove_task(task)
             return True
         return False
     
+    def replace_task(self, task: Task, description: str, due_date: str) -> Task:
+        """Заменяет задачу новой невыполненной задачей с теми же зависимостями.
+        
+        Args:
+            task: Заменяемая задача менеджера.
+            description: Описание новой задачи.
+            due_date: Срок выполнения в формате 'YYYY-MM-DD'.
+            
+        Returns:
+            Новая задача.
+            
+        Raises:
+            ValueError: Если не удалось создать задачу (заменяемая задача
+                при этом остаётся в менеджере).
+        """
+        try:
+            new_task = Task(description, due_date)
+        except ValueError as e:
+            logger.error("Ошибка при замене задачи: %s", e)
+            raise
+        blockers = self.blockers_of(task)
+        dependents = self.dependents_of(task)
+        self._remove_task(task)
+        self._register_task(new_task)
+        for blocker in blockers:
+            self.link_tasks(new_task, blocker)
+        for dependent in dependents:
+            self.link_tasks(dependent, new_task)
+        if not self._tx_depth:
+            logger.info("Задача заменена: %s", new_task)
+        return new_task
+    
+    def _remove_task(self, task: Task) -> None:
+        """Удаляет задачу менеджера вместе с её зависимостями.
+        
+        Args:
+            task: Удаляемая задача.
+        """
+        position = self.tasks.index(task)
+        del self.tasks[position]
+        self._forget_description(task)
+        task._on_done = None
+        blockers = self._blockers.pop(task, set())
+        dependents = self._dependents.pop(task, set())
+        for blocker in blockers:
+            self._dependents[blocker].discard(task)
+        for dependent in dependents:
+            self._blockers[dependent].discard(task)
+        
+        def undo() -> None:
+            self.tasks.insert(position, task)
+            namesakes = self._descriptions.setdefault(task.description.lower(), [])
+            namesakes.append(task)
+            namesakes.sort(key=self.tasks.index)
+            task._on_done = self._on_task_done
+            self._blockers[task] = blockers
+            self._dependents[task] = dependents
+            for blocker in blockers:
+                self._dependents[blocker].add(task)
+            for dependent in dependents:
+                self._blockers[dependent].add(task)
+        
+        if not self._record_change(undo, task, *dependents):
+            self._ready.pop(task, None)
+            self._pending_blockers.pop(task, None)
+            self._calendar.remove(self._due_days.pop(task), done=task.status)
+            for dependent in dependents:
+                if not task.status:
+                    self._pending_blockers[dependent] -= 1
+                    if self._pending_blockers[dependent] == 0 and not dependent.status:
+                        self._ready[dependent] = None
+            logger.info("Задача удалена: %s", task)
+    
+    def add_dependency(self, description: str, blocker_description: str) -> bool:
+        """Добавляет зависимость: задача не готова, пока не выполнен блокер.
+        
+        Args:
+            description: Описание зависимой задачи.
+            blocker_description: Описание блокирующей задачи.
+            
+        Returns:
+            True, если зависимость добавлена, False, если она уже существовала.
+            
+        Raises:
+            ValueError: Если задача не найдена, задача блокирует саму себя
+                или зависимость образует цикл.
+        """
+        task = self.get_task(description)
+        blocker = self.get_task(blocker_description)
+        if task is None or blocker is None:
+            missing = description if task is None else blocker_description
+            error_msg = f"Задача не найдена: {missing}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return self.link_tasks(task, blocker)
+    
+    def link_tasks(self, task: Task, blocker: Task) -> bool:
+        """Добавляет зависимость между задачами менеджера без поиска по описанию.
+        
+        Args:
+            task: Зависимая задача.
+            blocker: Блокирующая задача.
+            
+        Returns:
+            True, если зависимость добавлена, False, если она уже существовала.
+            
+        Raises:
+            ValueError: Если задача блокирует саму себя или зависимость
+                образует цикл.
+        """
+        if task is blocker:
+            error_msg = f"Задача не может блокировать саму себя: {task.description}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        if blocker in self._blockers.get(task, ()):
+            return False
+        
+        if self._blocks_transitively(task, blocker):
+            error_msg = (
+                f"Зависимость '{task.description}' от '{blocker.description}' "
+                f"образует цикл"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        self._blockers.setdefault(task, set()).add(blocker)
+        self._dependents.setdefault(blocker, set()).add(task)
+        
+        def undo() -> None:
+            self._blockers[task].discard(blocker)
+            self._dependents[blocker].discard(task)
+        
+        if not self._record_change(undo, task):
+            if not blocker.status:
+                self._pending_blockers[task] += 1
+                self._ready.pop(task, None)
+            logger.info("Добавлена зависимость: '%s' ждёт '%s'",
+                        task.description, blocker.description)
+        return True
+    
+    def remove_dependency(self, description: str, blocker_description: str) -> bool:
+        """Удаляет зависимость между задачами.
+        
+        Args:
+            description: Описание зависимой задачи.
+            blocker_description: Описание блокирующей задачи.
+            
+        Returns:
+            True, если зависимость найдена и удалена, иначе False.
+        """
+        task = self.get_task(description)
+        blocker = self.get_task(blocker_description)
+        if task is None or blocker is None:
+            return False
+        return self.unlink_tasks(task, blocker)
+    
+    def unlink_tasks(self, task: Task, blocker: Task) -> bool:
+        """Удаляет зависимость между задачами менеджера без поиска по описанию.
+        
+        Args:
+            task: Зависимая задача.
+            blocker: Блокирующая задача.
+            
+        Returns:
+            True, если зависимость найдена и удалена, иначе False.
+        """
+        if blocker not in self._blockers.get(task, ()):
+            return False
+        
+        self._blockers[task].discard(blocker)
+        self._dependents[blocker].discard(task)
+        
+        def undo() -> None:
+            self._blockers[task].add(blocker)
+            self._dependents[blocker].add(task)
+        
+        if not self._record_change(undo, task):
+            if not blocker.status:
+                self._pending_blockers[task] -= 1
+                if self._pending_blockers[task] == 0 and not task.status:
+                    self._ready[task] = None
+            logger.info("Удалена зависимость: '%s' от '%s'", task.description, blocker.description)
+        return True
+    
+    def _blocks_transitively(self, source: Task, target: Task) -> bool:
+        """Проверяет, блокирует ли задача source (прямо или косвенно) задачу target.
+        
+        Args:
+            source: Начальная задача обхода.
+            target: Искомая задача.
+            
+        Returns:
+            True, если target достижима из source по рёбрам зависимостей.
+        """
+        stack = [source]
+        visited = {source}
+        while stack:
+            current = stack.pop()
+            for dependent in self._dependents.get(current, ()):
+                if dependent is target:
+                    return True
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append(dependent)
+        return False
+    
+    def get_blockers(self, description: str) -> List[Task]:
+        """Возвращает задачи, блокирующие указанную.
+        
+        Args:
+            description: Описание задачи.
+            
+        Returns:
+            Список блокирующих задач (пустой, если задача не найдена).
+        """
+        task = self.get_task(description)
+        if task is None:
+            return []
+        return self.blockers_of(task)
+    
+    def get_dependents(self, description: str) -> List[Task]:
+        """Возвращает задачи, которые блокирует указанная.
+        
+        Args:
+            description: Описание задачи.
+            
+        Returns:
+            Список зависимых задач (пустой, если задача не найдена).
+        """
+        task = self.get_task(description)
+        if task is None:
+            return []
+        return self.dependents_of(task)
+    
+    def blockers_of(self, task: Task) -> List[Task]:
+        """Возвращает задачи, блокирующие задачу менеджера.
+        
+        Args:
+            task: Задача.
+            
+        Returns:
+            Список блокирующих задач.
+        """
+        return list(self._blockers.get(task, ()))
+    
+    def dependents_of(self, task: Task) -> List[Task]:
+        """Возвращает задачи, которые блокирует задача менеджера.
+        
+        Args:
+            task: Задача.
+            
+        Returns:
+            Список зависимых задач.
+        """
+        return list(self._dependents.get(task, ()))
+    
+    def get_ready_tasks(self) -> List[Task]:
+        """Возвращает невыполненные задачи, все блокеры которых выполнены.
+        
+        Список поддерживается инкрементально и не требует обхода графа.
+        Задачи возвращаются в порядке, в котором они стали готовыми.
+        
+        Returns:
+            Список задач, готовых к выполнению.
+        """
+        self._sync_indexes()
+        return list(self._ready)
+    
+    @contextmanager
+    def transaction(self) -> Iterator['TaskManager']:
+        """Объединяет изменения задач в одну транзакцию.
+        
+        Внутри транзакции изменения применяются к списку задач сразу,
+        а индексы зависимостей и календаря перестраиваются один раз
+        при завершении, вместо обновления после каждой операции.
+        Журнал операций записывается одной итоговой строкой. При
+        исключении все изменения транзакции откатываются. Вложенные
+        транзакции откатывают только свои изменения. Обработчики
+        изменений вызываются один раз при завершении внешней транзакции.
+        
+        Yields:
+            Этот же менеджер задач.
+        """
+        mark = len(self._undo_log)
+        self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth -= 1
+            self._rollback_to(mark)
+            if not self._tx_depth:
+                self._notify_transaction()
+            raise
+        self._tx_depth -= 1
+        if not self._tx_depth:
+            changes = len(self._undo_log)
+            self._undo_log.clear()
+            self._sync_indexes()
+            if changes:
+                logger.info("Транзакция завершена: применено изменений: %s", changes)
+            self._notify_transaction()
+    
+    def _notify_transaction(self) -> None:
+        """Сообщает обработчикам о задачах, изменённых в транзакции."""
+        if not self._tx_changed:
+            return
+        changed = list(dict.fromkeys(self._tx_changed))
+        self._tx_changed.clear()
+        self._notify_listeners(changed)
+    
+    def _rollback_to(self, mark: int) -> None:
+        """Отменяет изменения, записанные в журнал после отметки.
+        
+        Args:
+            mark: Длина журнала отмены на момент начала транзакции.
+        """
+        changes = len(self._undo_log) - mark
+        while len(self._undo_log) > mark:
+            self._undo_log.pop()()
+        if changes:
+            self._indexes_dirty = True
+        if not self._tx_depth:
+            self._sync_indexes()
+        logger.warning("Транзакция отменена: откачено изменений: %s", changes)
+    
+    def _sync_indexes(self) -> None:
+        """Перестраивает производные индексы, если они устарели."""
+        if not self._indexes_dirty:
+            return
+        self._pending_blockers = {}
+        self._ready = {}
+        self._calendar = CalendarHistogram()
+        due_days = self._due_days
+        self._due_days = {}
+        for task in self.tasks:
+            pending = sum(1 for blocker in self._blockers.get(task, ()) if not blocker.status)
+            self._pending_blockers[task] = pending
+            if pending == 0 and not task.status:
+                self._ready[task] = None
+            day = due_days.get(task)
+            if day is not None:
+                self._due_days[task] = day
+            self._calendar.add(self._due_day(task), done=task.status)
+        self._indexes_dirty = False
+    
+    @staticmethod
+    def _parse_day(date_str: str) -> int:
+        """Преобразует дату 'YYYY-MM-DD' в порядковый номер дня.
+        
+        Args:
+            date_str: Дата в формате 'YYYY-MM-DD'.
+            
+        Returns:
+            Порядковый номер дня.
+            
+        Raises:
+            ValueError: Если дата имеет неверный формат.
+        """
+        try:
+            return datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+        except ValueError as e:
+            error_msg = f"Неверный формат даты: {date_str}. Используйте формат 'YYYY-MM-DD'"
+            logger.error(error_msg)
+            raise ValueError(error_msg) from e
+    
+    def count_tasks_due(self, start_date: str, end_date: str,
+                        status: Optional[bool] = None) -> int:
+        """Возвращает количество задач со сроком в периоде.
+        
+        Запрос выполняется по календарной гистограмме за O(log n), не
+        считая далёких дней сроков вне её окна (см. DayHistogram).
+        
+        Args:
+            start_date: Первый день периода в формате 'YYYY-MM-DD'.
+            end_date: Последний день периода (включительно).
+            status: True - только выполненные, False - только невыполненные,
+                None - все задачи.
+            
+        Returns:
+            Количество задач.
+        """
+        first_day = self._parse_day(start_date)
+        last_day = self._parse_day(end_date)
+        self._sync_indexes()
+        return self._calendar.range_count(first_day, last_day, status)
+    
+    def get_daily_counts(self, start_date: str, end_date: str) -> Dict[str, Dict[str, int]]:
+        """Возвращает количество задач по дням периода.
+        
+        Args:
+            start_date: Первый день периода в формате 'YYYY-MM-DD'.
+            end_date: Последний день периода (включительно).
+            
+        Returns:
+            Словарь, где ключ - дата, значение - словарь с ключами
+            'open' и 'done'.
+        """
+        first_day = self._parse_day(start_date)
+        last_day = self._parse_day(end_date)
+        self._sync_indexes()
+        result = {}
+        for day in range(first_day, last_day + 1):
+            date_str = datetime.fromordinal(day).strftime('%Y-%m-%d')
+            result[date_str] = {
+                'open': self._calendar.open.count(day),
+                'done': self._calendar.done.count(day),
+            }
+        return result
+    
+    def get_weekly_counts(self, start_date: str, end_date: str) -> Dict[str, Dict[str, int]]:
+        """Возвращает количество задач по неделям периода.
+        
+        Недели начинаются с понедельника; первая и последняя недели
+        обрезаются по границам периода.
+        
+        Args:
+            start_date: Первый день периода в формате 'YYYY-MM-DD'.
+            end_date: Последний день периода (включительно).
+            
+        Returns:
+            Словарь, где ключ - дата понедельника недели, значение - словарь
+            с ключами 'open' и 'done'.
+        """
+        first_day = self._parse_day(start_date)
+        last_day = self._parse_day(end_date)
+        self._sync_indexes()
+        result = {}
+        week_start = first_day - datetime.fromordinal(first_day).weekday()
+        while week_start <= last_day:
+            lo = max(week_start, first_day)
+            hi = min(week_start + 6, last_day)
+            date_str = datetime.fromordinal(week_start).strftime('%Y-%m-%d')
+            result[date_str] = {
+                'open': self._calendar.range_count(lo, hi, status=False),
+                'done': self._calendar.range_count(lo, hi, status=True),
+            }
+            week_start += 7
+        return result
+    
     def to_dict(self) -> List[Dict[str, Any]]:
         """Возвращает список всех задач в виде словарей.
         
+        Зависимости сохраняются в ключе 'blocked_by' в виде описаний
+        блокирующих задач.
+        
         Returns:
             Список словарей с данными задач.
         """
-        return [task.to_dict() for task in self.tasks]
+        result = []
+        for task in self.tasks:
+            task_data = task.to_dict()
+            blockers = self._blockers.get(task)
+            if blockers:
+                task_data['blocked_by'] = [blocker.description for blocker in blockers]
+            result.append(task_data)
+        return result
     
     @classmethod
     def from_dict(cls, data: List[Dict[str, Any]]) -> 'TaskManager':
@@ -207,11 +852,25 @@ class TaskManager:
             Экземпляр класса TaskManager.
         """
         manager = cls()
-        for task_data in data:
-            try:
-                manager.tasks.append(Task.from_dict(task_data))
-            except (KeyError, ValueError) as e:
-                logger.error(f"Ошибка при загрузке задачи: {e}")
+        with manager.transaction():
+            for task_data in data:
+                try:
+                    manager._register_task(Task.from_dict(task_data))
+                except (KeyError, ValueError) as e:
+                    logger.error("Ошибка при загрузке задачи: %s", e)
+            
+            # Задачи ищутся по словарю, а не перебором в get_task()
+            tasks = manager.tasks_by_description()
+            for task_data in data:
+                for blocker_description in task_data.get('blocked_by', ()):
+                    try:
+                        task = tasks[task_data['description'].lower()]
+                        blocker = tasks[blocker_description.lower()]
+                        manager.link_tasks(task, blocker)
+                    except KeyError as e:
+                        logger.error("Ошибка при загрузке зависимости: задача не найдена: %s", e)
+                    except ValueError as e:
+                        logger.error("Ошибка при загрузке зависимости: %s", e)
         return manager
     
     def __str__(self) -> str:
@@ -0,0 +1,82 @@
+"""Модуль для тестирования расчёта стоимости корзины."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store import basket
+from task_manager_store.basket import BasketPricer
+from task_manager_store.network import StoreNetwork
+from task_manager_store.store import Store
+
+
+class TestBasketPricer(unittest.TestCase):
+    """Тесты для класса BasketPricer."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.network = StoreNetwork()
+        catalogs = {
+            "A": {"Молоко": 80.0, "Хлеб": 40.0, "Сыр": 500.0},
+            "B": {"Молоко": 70.0, "Хлеб": 60.0, "Сыр": 450.0},
+            "C": {"Молоко": 85.0, "Хлеб": 30.0},
+            "D": {"Сыр": 300.0},
+        }
+        for key, prices in catalogs.items():
+            self.network.add_store(Store(f"Магазин {key}", "Адрес", {
+                name: {"price": price} for name, price in prices.items()
+            }), key=key)
+        self.pricer = BasketPricer(self.network)
+
+    def test_best_single_store(self):
+        """Тест выбора одного магазина."""
+        quote = self.pricer.best_single_store(["Молоко", "Хлеб", "Сыр"])
+        self.assertEqual(quote.stores, ["B"])
+        self.assertEqual(quote.total, 580.0)
+
+        quote = self.pricer.best_single_store(["Молоко", "Хлеб", "Хлеб"])
+        self.assertEqual(quote.stores, ["C"])
+        self.assertEqual(quote.total, 145.0)
+
+    def test_best_split(self):
+        """Тест покупки в нескольких магазинах."""
+        quote = self.pricer.best_split(["Молоко", "Хлеб", "Сыр"], max_stores=2)
+        self.assertEqual(quote.total, 415.0)
+        self.assertEqual(quote.assignment, {"Молоко": "C", "Хлеб": "C", "Сыр": "D"})
+
+        quote = self.pricer.best_split(["Молоко", "Хлеб", "Сыр"], max_stores=3)
+        self.assertEqual(quote.total, 400.0)
+        self.assertEqual(quote.stores, ["B", "C", "D"])
+
+        with self.assertRaises(ValueError):
+            self.pricer.best_split(["Молоко"], max_stores=0)
+
+    def test_greedy_split(self):
+        """Тест приближённого поиска при большом числе сочетаний."""
+        limit = basket.EXACT_SEARCH_LIMIT
+        basket.EXACT_SEARCH_LIMIT = 0
+        try:
+            quote = self.pricer.best_split(["Молоко", "Хлеб", "Сыр"], max_stores=2)
+        finally:
+            basket.EXACT_SEARCH_LIMIT = limit
+        self.assertEqual(quote.total, 415.0)
+
+    def test_missing_items_and_batches(self):
+        """Тест отсутствующих товаров и пакетного расчёта."""
+        quotes = self.pricer.price_baskets([["Хлеб", "Икра"], ["Сыр"], ["Сыр", "Хлеб"]])
+        self.assertEqual(quotes[0].missing, ["Икра"])
+        self.assertEqual(quotes[0].total, 30.0)
+        self.assertEqual(quotes[1].stores, ["D"])
+        self.assertEqual(quotes[2].stores, ["B"])
+
+        self.network.remove_store("A")
+        self.network.remove_store("B")
+        self.assertIsNone(self.pricer.best_single_store(["Сыр", "Хлеб"]))
+        self.assertEqual(self.pricer.best_split(["Сыр", "Хлеб"]).total, 330.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Модуль для тестирования колоночного каталога товаров."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.store import Store
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy не установлен")
+class TestColumnarCatalog(unittest.TestCase):
+    """Тесты для класса ColumnarCatalog."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        from task_manager_store.columnar import ColumnarCatalog
+
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123", {
+            "Молоко": {"price": 100.0, "category": "Молочные продукты"},
+            "Сыр": {"price": 300.0, "category": "Молочные продукты"},
+            "Хлеб": {"price": 50.0, "category": "Выпечка"},
+        })
+        self.catalog = ColumnarCatalog.from_store(self.store)
+
+    def test_reprice_category(self):
+        """Тест векторного изменения цен категории."""
+        self.assertEqual(self.catalog.reprice_category("Молочные продукты", 1.07), 2)
+        self.assertEqual(self.catalog.get_price("Молоко"), 107.0)
+        self.assertEqual(self.catalog.get_price("Сыр"), 321.0)
+        self.assertEqual(self.catalog.get_price("Хлеб"), 50.0)
+
+    def test_invalid_reprice_is_atomic(self):
+        """Тест отказа от изменения при неположительной цене."""
+        with self.assertRaises(ValueError):
+            self.catalog.reprice(self.catalog.mask_price_range(0, 1000), delta=-60.0)
+        self.assertEqual(self.catalog.get_price("Молоко"), 100.0)
+
+    def test_non_finite_prices_rejected(self):
+        """Тест отказа от цен NaN и бесконечности."""
+        mask = self.catalog.mask_price_range(0, 1000)
+        for factor in (float('nan'), float('inf')):
+            with self.assertRaises(ValueError):
+                self.catalog.reprice(mask, factor=factor)
+        self.assertEqual(self.catalog.get_price("Молоко"), 100.0)
+        with self.assertRaises(ValueError):
+            self.catalog.add("Кефир", float('nan'))
+
+    def test_category_stats(self):
+        """Тест агрегатов по категориям."""
+        self.catalog.remove("Сыр")
+        self.catalog.add("Кефир", 80.0, "Молочные продукты")
+        stats = self.catalog.category_stats()
+        self.assertEqual(stats["Молочные продукты"]["count"], 2)
+        self.assertAlmostEqual(stats["Молочные продукты"]["average"], 90.0)
+        self.assertEqual(stats["Выпечка"]["total"], 50.0)
+
+    def test_write_back(self):
+        """Тест переноса изменённых цен в магазин."""
+        self.catalog.reprice_category("Выпечка", 1.1)
+        self.assertEqual(self.catalog.write_back(self.store), 1)
+        self.assertEqual(self.store.get_price("Хлеб"), 55.0)
+        self.assertEqual(self.catalog.product("Хлеб").category, "Выпечка")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Модуль для тестирования поиска почти одинаковых товаров."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.dedup import DuplicateIndex, normalize_name, shingles
+from task_manager_store.store import Store
+
+
+class TestNormalization(unittest.TestCase):
+    """Тесты для нормализации названий."""
+
+    def test_normalize_name(self):
+        """Тест приведения названий к одному виду."""
+        # Латинская X и кириллическая Х, ё и е, регистр и знаки препинания
+        self.assertEqual(normalize_name("Смартфон X"), normalize_name("смартфон Х"))
+        self.assertEqual(normalize_name("Ёжик"), "ежик")
+        self.assertEqual(normalize_name("Молоко, 3.2% (1 л)"), "молоко 3 2 1 л")
+
+    def test_shingles(self):
+        """Тест разбиения на n-граммы."""
+        self.assertEqual(sorted(shingles("Сыр")), sorted([" сы", "сыр", "ыр "]))
+        self.assertEqual(shingles("", 3), ["  "])
+
+
+class TestDuplicateIndex(unittest.TestCase):
+    """Тесты для класса DuplicateIndex."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.index = DuplicateIndex(threshold=0.5)
+        self.index.add(("A", "Смартфон X 128 ГБ"), "Смартфон X 128 ГБ")
+        self.index.add(("B", "смартфон Х 128ГБ"), "смартфон Х 128ГБ")
+        self.index.add(("C", "Смартфон Х, 128 Гб!"), "Смартфон Х, 128 Гб!")
+        self.index.add(("A", "Молоко"), "Молоко")
+        self.index.add(("B", "Пылесос"), "Пылесос")
+
+    def test_invalid_params(self):
+        """Тест проверки параметров."""
+        with self.assertRaises(ValueError):
+            DuplicateIndex(threshold=0)
+        with self.assertRaises(ValueError):
+            DuplicateIndex(num_perm=0)
+
+    def test_bands(self):
+        """Тест подбора полос под порог."""
+        self.assertEqual(self.index.bands * self.index.rows, self.index.num_perm)
+        strict = DuplicateIndex(threshold=0.9)
+        self.assertLess(strict.bands, self.index.bands)
+
+    def test_signature_deterministic(self):
+        """Тест воспроизводимости сигнатур."""
+        other = DuplicateIndex(threshold=0.5)
+        self.assertEqual(self.index.signature("Чай"), other.signature("Чай"))
+        signature = self.index.signature("Чай")
+        self.assertEqual(self.index.similarity(signature, signature), 1.0)
+
+    def test_add_duplicate_key(self):
+        """Тест добавления существующего ключа."""
+        with self.assertRaises(ValueError):
+            self.index.add(("A", "Молоко"), "Молоко")
+
+    def test_query(self):
+        """Тест поиска похожих товаров."""
+        matches = [key for key, _ in self.index.query("СМАРТФОН x 128 гб")]
+        self.assertEqual(sorted(matches), [
+            ("A", "Смартфон X 128 ГБ"), ("B", "смартфон Х 128ГБ"), ("C", "Смартфон Х, 128 Гб!"),
+        ])
+        self.assertEqual(self.index.query("Телевизор"), [])
+
+    def test_clusters(self):
+        """Тест группировки дубликатов."""
+        clusters = self.index.clusters()
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(sorted(clusters[0]), [
+            ("A", "Смартфон X 128 ГБ"), ("B", "смартфон Х 128ГБ"), ("C", "Смартфон Х, 128 Гб!"),
+        ])
+
+    def test_clusters_compare_all_bucket_members(self):
+        """Тест объединения похожих товаров, не похожих на первый в корзине."""
+        index = DuplicateIndex(threshold=0.5)
+        rows, rest = index.rows, index.num_perm - index.rows
+        self.assertGreaterEqual(index.bands, 3)
+        # Все три сигнатуры совпадают в первой полосе; "b" и "c" различаются
+        # одной позицией в каждой из остальных полос, "a" отличается полностью
+        signatures = {
+            "a": (1,) * rows + (4,) * rest,
+            "b": (1,) * rows + (2,) * rest,
+            "c": (1,) * rows + ((2,) * (rows - 1) + (3,)) * (index.bands - 1),
+        }
+        index.signature = signatures.__getitem__
+        for name in signatures:
+            index.add(name, name)
+
+        self.assertGreaterEqual(index.similarity(signatures["b"], signatures["c"]), 0.5)
+        self.assertEqual([sorted(cluster) for cluster in index.clusters()], [["b", "c"]])
+
+    def test_clusters_identical_names_not_compared_pairwise(self):
+        """Тест группировки одного товара из многих магазинов без попарных сравнений."""
+        index = DuplicateIndex(threshold=0.5)
+        for store_number in range(1000):
+            index.add((store_number, "Молоко 1 л"), "Молоко 1 л")
+        index.add((0, "Молоко 1л"), "Молоко 1л")
+        index.add((0, "Пылесос"), "Пылесос")
+        comparisons = []
+        similarity = index.similarity
+
+        def counting_similarity(first, second):
+            comparisons.append(1)
+            return similarity(first, second)
+
+        index.similarity = counting_similarity
+        clusters = index.clusters()
+
+        self.assertEqual([len(cluster) for cluster in clusters], [1001])
+        self.assertLessEqual(len(comparisons), index.bands)
+
+    def test_remove(self):
+        """Тест удаления из индекса."""
+        self.assertTrue(self.index.remove(("C", "Смартфон Х, 128 Гб!")))
+        self.assertFalse(self.index.remove(("C", "Смартфон Х, 128 Гб!")))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(len(self.index.clusters()[0]), 2)
+
+    def test_add_store(self):
+        """Тест добавления товаров магазина."""
+        index = DuplicateIndex()
+        store = Store("Техника", "Адрес", {
+            "Ноутбук Lenovo": {"price": 50000.0},
+            "ноутбук LENOVO": {"price": 49000.0},
+            "Чайник": {"price": 2000.0},
+        })
+        self.assertEqual(index.add_store(store), 3)
+        self.assertIn(("Техника", "Чайник"), index)
+        self.assertEqual(index.get_name(("Техника", "Чайник")), "Чайник")
+        clusters = index.clusters()
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(sorted(clusters[0]), [
+            ("Техника", "Ноутбук Lenovo"), ("Техника", "ноутбук LENOVO"),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
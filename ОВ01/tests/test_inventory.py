@@ -0,0 +1,147 @@
+"""Модуль для тестирования учёта остатков и резервов."""
+
+import json
+import unittest
+import tempfile
+import threading
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.inventory import InsufficientStockError, Inventory
+from task_manager_store.store import Store
+
+
+class FakeClock:
+    """Управляемый источник времени."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestInventory(unittest.TestCase):
+    """Тесты для класса Inventory."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Магазин", "Адрес", {
+            "Молоко": {"price": 80.0}, "Хлеб": {"price": 40.0}
+        })
+        self.clock = FakeClock()
+        self.inventory = Inventory(self.store, reservation_ttl=60, clock=self.clock)
+        self.inventory.set_stock("Молоко", 10)
+
+    def test_reserve_commit_release(self):
+        """Тест резервирования, списания и отмены резерва."""
+        first = self.inventory.reserve("Молоко", 4)
+        second = self.inventory.reserve("Молоко", 5)
+        self.assertEqual(self.inventory.get_available("Молоко"), 1)
+        with self.assertRaises(InsufficientStockError) as context:
+            self.inventory.reserve("Молоко", 2)
+        self.assertEqual(context.exception.available, 1)
+
+        self.assertTrue(self.inventory.commit(first))
+        self.assertFalse(self.inventory.commit(first))
+        self.assertEqual(self.inventory.get_stock("Молоко"), 6)
+        self.assertTrue(self.inventory.release(second))
+        self.assertFalse(self.inventory.release(second))
+        self.assertEqual(self.inventory.get_available("Молоко"), 6)
+        self.assertEqual(self.inventory.get_reserved("Молоко"), 0)
+
+    def test_validation(self):
+        """Тест проверки товаров и количества."""
+        with self.assertRaises(ValueError):
+            self.inventory.reserve("Кефир")
+        with self.assertRaises(ValueError):
+            self.inventory.reserve("Молоко", 0)
+        with self.assertRaises(InsufficientStockError):
+            self.inventory.reserve("Хлеб")
+        self.inventory.reserve("Молоко", 3)
+        with self.assertRaises(ValueError):
+            self.inventory.set_stock("Молоко", 2)
+        self.assertEqual(self.inventory.add_stock("Хлеб", 5), 5)
+
+    def test_expiry(self):
+        """Тест снятия просроченных резервов."""
+        short = self.inventory.reserve("Молоко", 6, ttl=10)
+        self.inventory.reserve("Молоко", 2)
+        self.clock.now = 30
+        self.assertEqual(self.inventory.get_available("Молоко"), 8)
+        self.assertFalse(self.inventory.commit(short))
+        self.assertEqual(self.inventory.active_reservations, 1)
+        self.assertEqual(self.inventory.expire(now=100), 1)
+        self.assertEqual(self.inventory.get_available("Молоко"), 10)
+
+    def test_expire_when_timers_emptied_concurrently(self):
+        """Тест проверки сроков, опустевших в другом потоке после проверки."""
+
+        class VanishingTimers(list):
+            """Пустой список, который при проверке ещё выглядит непустым."""
+
+            def __bool__(self):
+                return True
+
+        self.inventory._timers = VanishingTimers()
+        self.assertEqual(self.inventory.expire(now=100), 0)
+        self.assertEqual(self.inventory.get_available("Молоко"), 10)
+
+    def test_product_removed_from_store(self):
+        """Тест удаления остатков вместе с товаром."""
+        reservation = self.inventory.reserve("Молоко", 2)
+        self.store.remove_item("Молоко")
+        self.assertFalse(self.inventory.commit(reservation))
+        self.assertEqual(self.inventory.get_stock("Молоко"), 0)
+        self.assertEqual(self.inventory.active_reservations, 0)
+
+    def test_batched_persistence(self):
+        """Тест пакетной записи остатков на диск."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "stock.json"
+            inventory = Inventory(self.store, storage_path=path, flush_every=3)
+            inventory.set_stock("Молоко", 5)
+            inventory.set_stock("Хлеб", 7)
+            self.assertFalse(path.exists())
+            inventory.commit(inventory.reserve("Молоко", 1))
+            self.assertEqual(json.loads(path.read_text(encoding="utf-8")),
+                             {"Молоко": 4, "Хлеб": 7})
+            self.assertFalse(inventory.flush())
+
+            inventory.add_stock("Хлеб", 1)
+            self.assertTrue(inventory.flush())
+            reloaded = Inventory(self.store, storage_path=path)
+            self.assertEqual(reloaded.get_stock("Хлеб"), 8)
+
+    def test_concurrent_checkout(self):
+        """Нагрузочный тест: резервов не больше остатка."""
+        self.inventory.set_stock("Хлеб", 500)
+        committed = []
+
+        def checkout():
+            count = 0
+            for _ in range(200):
+                try:
+                    reservation = self.inventory.reserve("Хлеб", 1)
+                except InsufficientStockError:
+                    continue
+                if self.inventory.commit(reservation):
+                    count += 1
+            committed.append(count)
+
+        threads = [threading.Thread(target=checkout) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(committed), 500)
+        self.assertEqual(self.inventory.get_stock("Хлеб"), 0)
+        self.assertEqual(self.inventory.get_reserved("Хлеб"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
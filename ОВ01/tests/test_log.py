@@ -0,0 +1,116 @@
+"""Модуль для тестирования настройки журналирования через очередь."""
+
+import logging
+import queue
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.log import DroppingQueueHandler, RateLimitFilter, configure_logging
+from task_manager_store.task import Task
+
+
+def make_record(msg, *args, level=logging.INFO, name='task_manager_store.task'):
+    """Создаёт запись журнала."""
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestDroppingQueueHandler(unittest.TestCase):
+    """Тесты для класса DroppingQueueHandler."""
+
+    def test_drops_when_full(self):
+        """Тест отбрасывания записей при переполнении очереди."""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+        for number in range(5):
+            handler.handle(make_record("Запись %d", number))
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(handler.queue.get_nowait().getMessage(), "Запись 0")
+
+    def test_message_formatted_at_call_time(self):
+        """Тест подстановки аргументов до изменения объекта."""
+        handler = DroppingQueueHandler(queue.Queue())
+        task = Task("Позвонить", "2024-06-01")
+        record = make_record("Задача: %s", task)
+        handler.handle(record)
+        task.mark_as_done()
+        queued = handler.queue.get_nowait()
+        self.assertIn("Не выполнено", queued.getMessage())
+        self.assertIsNone(queued.args)
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    """Тесты для класса RateLimitFilter."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.now = 0.0
+        self.filter = RateLimitFilter(rate=2.0, burst=3, clock=lambda: self.now)
+
+    def test_limits_each_template(self):
+        """Тест ограничения частоты сообщений одного шаблона."""
+        passed = [self.filter.filter(make_record("Создана задача: %s", i)) for i in range(10)]
+        self.assertEqual(passed.count(True), 3)
+        self.assertTrue(self.filter.filter(make_record("Другое сообщение: %s", 1)))
+        self.assertEqual(self.filter.suppressed, 7)
+
+        self.now = 1.0
+        passed = [self.filter.filter(make_record("Создана задача: %s", i)) for i in range(10)]
+        self.assertEqual(passed.count(True), 2)
+
+    def test_warnings_not_limited(self):
+        """Тест пропуска предупреждений и ошибок без ограничения."""
+        for _ in range(10):
+            self.assertTrue(self.filter.filter(make_record("Ошибка", level=logging.ERROR)))
+        self.assertEqual(self.filter.suppressed, 0)
+
+
+class TestConfigureLogging(unittest.TestCase):
+    """Тесты для функции configure_logging()."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.log_file = self.temp_dir / "app.log"
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_writes_through_listener(self):
+        """Тест записи журнала в файл фоновым потоком."""
+        pipeline = configure_logging(log_file=self.log_file, stream=False, rate=100.0, burst=5,
+                                     logger_name='task_manager_store')
+        try:
+            logger = logging.getLogger('task_manager_store.store')
+            for number in range(20):
+                logger.info("Добавлен товар: %s", number)
+            logger.error("Ошибка: %s", "проверка")
+        finally:
+            pipeline.stop()
+        lines = self.log_file.read_text(encoding='utf-8').splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertIn("task_manager_store.store - INFO - Добавлен товар: 0", lines[0])
+        self.assertIn("ERROR - Ошибка: проверка", lines[-1])
+        self.assertEqual(pipeline.suppressed, 15)
+        self.assertNotIn(pipeline.handler, logging.getLogger('task_manager_store').handlers)
+
+    def test_reconfigure_replaces_pipeline(self):
+        """Тест замены конвейера при повторной настройке."""
+        first = configure_logging(stream=False, logger_name='task_manager_store')
+        second = configure_logging(log_file=self.log_file, stream=False,
+                                   logger_name='task_manager_store')
+        try:
+            handlers = logging.getLogger('task_manager_store').handlers
+            self.assertNotIn(first.handler, handlers)
+            self.assertIn(second.handler, handlers)
+        finally:
+            second.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
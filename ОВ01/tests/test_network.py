@@ -0,0 +1,88 @@
+"""Модуль для тестирования сети магазинов."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.indexes import BloomFilter
+from task_manager_store.network import StoreNetwork
+from task_manager_store.store import Store
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Тесты для класса BloomFilter."""
+
+    def test_no_false_negatives(self):
+        """Тест отсутствия ложноотрицательных ответов."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        names = [f"Товар {i}" for i in range(1000)]
+        for name in names:
+            bloom.add(name)
+        self.assertTrue(all(name in bloom for name in names))
+        false_positives = sum(f"Другой {i}" in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+
+class TestStoreNetwork(unittest.TestCase):
+    """Тесты для класса StoreNetwork."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.network = StoreNetwork()
+        self.first = Store("Магазин 1", "ул. Первая, 1", {
+            "Молоко": {"price": 80.0}, "Хлеб": {"price": 50.0}
+        })
+        self.second = Store("Магазин 2", "ул. Вторая, 2", {
+            "Молоко": {"price": 75.0}, "Сыр": {"price": 400.0}
+        })
+        self.network.add_store(self.first)
+        self.network.add_store(self.second)
+
+    def test_queries(self):
+        """Тест поиска магазинов и самой низкой цены."""
+        self.assertEqual(self.network.find_cheapest("Молоко"), (self.second, 75.0))
+        self.assertEqual(self.network.stores_carrying("Хлеб"), [self.first])
+        self.assertIsNone(self.network.find_cheapest("Кефир"))
+        self.assertFalse(self.network.might_carry("Магазин 2", "Хлеб"))
+        self.assertTrue(self.network.might_carry("Магазин 2", "Сыр"))
+
+    def test_index_follows_store_changes(self):
+        """Тест обновления индекса при изменениях магазинов."""
+        self.first.update_price("Молоко", 70.0)
+        self.assertEqual(self.network.find_cheapest("Молоко"), (self.first, 70.0))
+
+        with self.second.transaction():
+            self.second.remove_item("Сыр")
+            self.second.add_item("Кефир", 90.0)
+        self.assertEqual(self.network.stores_carrying("Сыр"), [])
+        self.assertEqual(self.network.get_prices("Кефир"), {"Магазин 2": 90.0})
+
+    def test_remove_store(self):
+        """Тест удаления магазина из сети."""
+        self.assertTrue(self.network.remove_store("Магазин 2"))
+        self.assertEqual(self.network.find_cheapest("Молоко"), (self.first, 80.0))
+        self.second.update_price("Молоко", 10.0)
+        self.assertEqual(self.network.get_prices("Молоко"), {"Магазин 1": 80.0})
+        self.assertFalse(self.network.remove_store("Магазин 2"))
+
+        with self.assertRaises(ValueError):
+            self.network.add_store(self.first)
+
+    def test_autocomplete(self):
+        """Тест поиска товаров сети по префиксу."""
+        self.assertEqual(self.network.autocomplete("м"), [("Молоко", 75.0)])
+        self.second.add_item("Масло", 200.0)
+        self.assertEqual(self.network.autocomplete("М"), [("Масло", 200.0), ("Молоко", 75.0)])
+        self.assertEqual(self.network.autocomplete("м", order="price", limit=1),
+                         [("Молоко", 75.0)])
+        self.second.remove_item("Сыр")
+        self.assertEqual(self.network.autocomplete("с"), [])
+        with self.assertRaises(ValueError):
+            self.network.autocomplete("м", order="category")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""Модуль для тестирования пула менеджеров задач."""
+
+import unittest
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.pool import TaskManagerPool
+
+
+class SlowPool(TaskManagerPool):
+    """Пул с замедленной загрузкой для проверки одновременных обращений."""
+
+    loads = 0
+
+    def _load_manager(self, tenant_id):
+        SlowPool.loads += 1
+        time.sleep(0.05)
+        return super()._load_manager(tenant_id)
+
+
+class TestTaskManagerPool(unittest.TestCase):
+    """Тесты для класса TaskManagerPool."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pool = TaskManagerPool(self.temp_dir.name, max_managers=2)
+
+    def tearDown(self):
+        """Удаление временной директории."""
+        self.temp_dir.cleanup()
+
+    def test_hits_and_misses(self):
+        """Тест учёта попаданий и промахов."""
+        manager = self.pool.get("user-1")
+        self.assertIs(self.pool.get("user-1"), manager)
+        stats = self.pool.stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+
+    def test_eviction_writes_back_dirty_managers(self):
+        """Тест записи изменённых менеджеров при вытеснении."""
+        self.pool.get("user-1").add_task("Задача", "2025-06-01")
+        self.pool.get("user-2")
+        self.pool.get("user-3")
+
+        self.assertNotIn("user-1", self.pool)
+        stats = self.pool.stats()
+        self.assertEqual((stats.evictions, stats.writebacks), (1, 1))
+
+        reloaded = self.pool.get("user-1")
+        self.assertIsNotNone(reloaded.get_task("Задача"))
+        # user-2 не изменялся, поэтому вытесняется без записи
+        self.assertEqual(self.pool.stats().writebacks, 1)
+
+    def test_memory_budget(self):
+        """Тест вытеснения по бюджету памяти."""
+        pool = TaskManagerPool(
+            self.temp_dir.name, memory_budget=100,
+            size_estimator=lambda manager: 40 + 10 * len(manager)
+        )
+        pool.get("user-1")
+        pool.get("user-2")
+        self.assertEqual(len(pool), 2)
+        manager = pool.get("user-2")
+        for i in range(3):
+            manager.add_task(f"Задача {i}", "2025-06-01")
+        # Размер пересчитывается при следующем обращении
+        pool.get("user-2")
+        self.assertEqual(len(pool), 1)
+        self.assertIn("user-2", pool)
+        self.assertEqual(pool.memory_usage, 70)
+
+    def test_flush(self):
+        """Тест записи всех изменённых менеджеров."""
+        self.pool.get("user-1").add_task("Задача", "2025-06-01")
+        self.assertEqual(self.pool.flush(), 1)
+        self.assertEqual(self.pool.flush(), 0)
+
+        other_pool = TaskManagerPool(self.temp_dir.name)
+        self.assertEqual(len(other_pool.get("user-1")), 1)
+
+    def test_concurrent_saves(self):
+        """Тест одновременной записи одного пользователя из разных потоков."""
+        manager = self.pool.get("user-1")
+        for i in range(50):
+            manager.add_task(f"Задача {i}", "2025-06-01")
+        errors = []
+
+        def save():
+            try:
+                for _ in range(20):
+                    self.pool._save_manager("user-1", manager)
+            except OSError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=save) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(list(Path(self.temp_dir.name).glob("*.tmp")), [])
+        other_pool = TaskManagerPool(self.temp_dir.name)
+        self.assertEqual(len(other_pool.get("user-1")), 50)
+
+    def test_failed_writeback_is_retried_by_flush(self):
+        """Тест повторной записи менеджера, не записанного при вытеснении."""
+        pool = TaskManagerPool(self.temp_dir.name, max_managers=3)
+        for tenant_id in ("user-1", "user-2"):
+            pool.get(tenant_id).add_task("Задача", "2025-06-01")
+        save_manager = pool._save_manager
+
+        def failing_save(tenant_id, manager):
+            if tenant_id == "user-1":
+                raise OSError("диск заполнен")
+            return save_manager(tenant_id, manager)
+
+        with mock.patch.object(pool, "_save_manager", side_effect=failing_save):
+            # Вытесняются оба менеджера одним пакетом, запись user-1 не удаётся
+            pool.max_managers = 1
+            pool.get("user-3")
+            self.assertEqual(pool.stats().evictions, 2)
+            with self.assertRaises(OSError):
+                pool.flush()
+
+        self.assertTrue(Path(self.temp_dir.name, "user-2.json").exists())
+        self.assertFalse(Path(self.temp_dir.name, "user-1.json").exists())
+        self.assertEqual(pool.flush(), 1)
+        self.assertEqual(len(TaskManagerPool(self.temp_dir.name).get("user-1")), 1)
+        self.assertEqual(pool.flush(), 0)
+
+    def test_writes_of_one_tenant_are_serialized(self):
+        """Тест поочерёдной записи одного пользователя и сохранения последнего снимка."""
+        manager = self.pool.get("user-1")
+        active = []
+        overlaps = []
+        write_file = TaskManagerPool._write_file
+
+        def slow_write(path, snapshot):
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.01)
+            write_file(path, snapshot)
+            active.pop()
+
+        def save(number):
+            manager.add_task(f"Задача {number}", "2025-06-01")
+            self.pool._save_manager("user-1", manager)
+
+        with mock.patch.object(TaskManagerPool, "_write_file", side_effect=slow_write):
+            threads = [threading.Thread(target=save, args=(i,)) for i in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(max(overlaps), 1)
+        self.assertEqual(len(TaskManagerPool(self.temp_dir.name).get("user-1")), 5)
+
+    def test_single_flight_load(self):
+        """Тест однократной загрузки при одновременных обращениях."""
+        SlowPool.loads = 0
+        pool = SlowPool(self.temp_dir.name)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(pool.get("user-1")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(SlowPool.loads, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(manager is results[0] for manager in results))
+        stats = pool.stats()
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.coalesced + stats.hits, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Модуль для тестирования истории цен."""
+
+import unittest
+from datetime import datetime
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.price_history import PriceHistory, PriceSeries
+from task_manager_store.store import Store
+
+
+class FakeClock:
+    """Управляемый источник времени."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestPriceSeries(unittest.TestCase):
+    """Тесты для класса PriceSeries."""
+
+    def test_lookup_across_chunks(self):
+        """Тест поиска цены в разных блоках."""
+        series = PriceSeries(chunk_size=4)
+        for i in range(10):
+            series.append(i * 10, 100 + i)
+        self.assertEqual(len(series), 10)
+        self.assertIsNone(series.at(-1))
+        self.assertEqual(series.at(0), 100)
+        self.assertEqual(series.at(35), 103)
+        self.assertEqual(series.at(40), 104)
+        self.assertEqual(series.at(1000), 109)
+        self.assertEqual(series.entries(30, 50), [(30, 103), (40, 104), (50, 105)])
+
+    def test_order_and_negative_deltas(self):
+        """Тест отрицательных разностей и порядка записей."""
+        series = PriceSeries(chunk_size=3)
+        series.append(5, 10000)
+        series.append(5, 50)
+        series.append(7, None)
+        series.append(9, 2 ** 40)
+        self.assertEqual(series.at(5), 50)
+        self.assertIsNone(series.at(8))
+        self.assertEqual(series.at(9), 2 ** 40)
+        with self.assertRaises(ValueError):
+            series.append(8, 1)
+
+    def test_exact_prices(self):
+        """Тест хранения цен, не выражаемых в копейках."""
+        series = PriceSeries(chunk_size=4)
+        prices = [0.001, 12.345, 80.0, 0.004, 85.5, None, 1 / 3, 99.99]
+        for i, price in enumerate(prices):
+            series.append(i, price)
+        self.assertEqual([price for _, price in series.entries()], prices)
+        self.assertEqual(series.at(0), 0.001)
+        self.assertIsNone(series.at(5))
+
+    def test_compact_encoding(self):
+        """Тест объёма памяти на одно изменение."""
+        series = PriceSeries()
+        for i in range(10000):
+            series.append(1_700_000_000_000 + i * 60_000, 10000 + (i * 37) % 500)
+        self.assertLess(series.nbytes / len(series), 16)
+        self.assertEqual(series.at(1_700_000_000_000 + 5000 * 60_000), 10000 + (5000 * 37) % 500)
+
+
+class TestPriceHistory(unittest.TestCase):
+    """Тесты для класса PriceHistory."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.clock = FakeClock()
+        self.store = Store("Магазин", "Адрес", {"Молоко": {"price": 80.0}})
+        self.history = PriceHistory(self.store, chunk_size=4, clock=self.clock)
+
+    def test_records_store_changes(self):
+        """Тест записи изменений магазина."""
+        self.clock.now = 1010.0
+        self.store.update_price("Молоко", 85.5)
+        self.clock.now = 1020.0
+        self.store.add_item("Хлеб", 40.0)
+        self.clock.now = 1030.0
+        self.store.remove_item("Молоко")
+
+        self.assertEqual(self.history.price_at("Молоко", 1000.0), 80.0)
+        self.assertEqual(self.history.price_at("Молоко", 1015.0), 85.5)
+        self.assertIsNone(self.history.price_at("Молоко", 1030.0))
+        self.assertIsNone(self.history.price_at("Хлеб", 1019.0))
+        self.assertEqual(self.history.price_at("Хлеб", datetime.fromtimestamp(1025.0)), 40.0)
+        self.assertEqual(self.history.changes("Молоко", 1005.0),
+                         [(1010.0, 85.5), (1030.0, None)])
+
+    def test_transactions(self):
+        """Тест записи транзакций и отката."""
+        self.clock.now = 1010.0
+        with self.store.transaction():
+            self.store.update_price("Молоко", 90.0)
+            self.store.update_price("Молоко", 95.0)
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.update_price("Молоко", 1.0)
+                raise RuntimeError("откат")
+        self.store.update_prices({"Молоко": 99.0})
+
+        self.assertEqual(self.history.changes("Молоко"),
+                         [(1000.0, 80.0), (1010.0, 90.0), (1010.0, 95.0), (1010.0, 99.0)])
+        self.assertEqual(self.history.price_at("Молоко", 1010.0), 99.0)
+
+        self.history.detach()
+        self.store.update_price("Молоко", 70.0)
+        self.assertEqual(len(self.history), 4)
+
+    def test_clock_going_back(self):
+        """Тест записи изменений, когда часы переведены назад."""
+        self.clock.now = 1010.0
+        self.store.update_price("Молоко", 85.0)
+        self.clock.now = 1005.0
+        self.store.update_price("Молоко", 0.004)
+        self.store.add_item("Хлеб", 40.0)
+
+        self.assertEqual(self.store.get_price("Молоко"), 0.004)
+        self.assertEqual(self.history.changes("Молоко"),
+                         [(1000.0, 80.0), (1010.0, 85.0), (1010.0, 0.004)])
+        self.assertEqual(self.history.changes("Хлеб"), [(1005.0, 40.0)])
+        with self.assertRaises(ValueError):
+            self.history.record("Молоко", 90.0, ts=1001.0)
+
+    def test_downsample(self):
+        """Тест свёртки истории по интервалам."""
+        for second, price in ((1005, 90.0), (1012, 70.0), (1018, 75.0), (1031, None)):
+            self.history.record("Молоко", price, ts=second)
+        buckets = self.history.downsample("Молоко", 1000.0, 1040.0, 4)
+
+        self.assertEqual([(b.start, b.low, b.high, b.close) for b in buckets], [
+            (1000.0, 80.0, 90.0, 90.0),
+            (1010.0, 70.0, 90.0, 75.0),
+            (1020.0, 75.0, 75.0, 75.0),
+            (1030.0, 75.0, 75.0, None),
+        ])
+        with self.assertRaises(ValueError):
+            self.history.downsample("Молоко", 1000.0, 1000.0, 4)
+        with self.assertRaises(ValueError):
+            self.history.record("Молоко", -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
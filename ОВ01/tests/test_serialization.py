@@ -0,0 +1,158 @@
+"""Модуль для тестирования сериализации задач и магазинов."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.serialization import (
+    FORMAT_VERSION, JsonCodec, MsgpackCodec, dumps, get_codec, loads,
+)
+from task_manager_store.store import Product, Store
+from task_manager_store.task import Task, TaskManager
+
+CODECS = ['json', 'msgpack', MsgpackCodec(use_package=False)]
+
+
+class TestSerialization(unittest.TestCase):
+    """Тесты для функций dumps() и loads()."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Гастроном", "ул. Ленина, 1", location=(55.75, 37.62))
+        self.store.add_items([
+            ("Молоко", 80.0, "Молочные продукты"),
+            ("Сыр", 500.5, "Молочные продукты"),
+            ("Хлеб", 40.0, "Хлебобулочные изделия"),
+        ])
+        self.manager = TaskManager()
+        self.manager.add_task("Купить продукты", "2024-05-01")
+        self.manager.add_task("Приготовить ужин", "2024-05-02")
+        self.manager.add_task("Помыть посуду", "2024-05-03")
+        self.manager.add_dependency("Приготовить ужин", "Купить продукты")
+        self.manager.add_dependency("Помыть посуду", "Приготовить ужин")
+        self.manager.get_task("Купить продукты").mark_as_done()
+
+    def assert_store_equal(self, restored):
+        """Проверяет, что восстановленный магазин совпадает с исходным."""
+        self.assertEqual(restored.to_dict(), self.store.to_dict())
+        self.assertEqual([p.name for p in restored.cheapest(1)], ["Хлеб"])
+        self.assertEqual([p.name for p in restored.autocomplete("Мо")], ["Молоко"])
+
+    def test_product_and_task(self):
+        """Тест сериализации товара и задачи всеми кодеками."""
+        task = Task("Позвонить", "2024-06-01")
+        task.mark_as_done()
+        for codec in CODECS:
+            for trusted in (False, True):
+                with self.subTest(codec=codec, trusted=trusted):
+                    product = loads(dumps(Product("Сыр", 500.5, "Молочные продукты"), codec),
+                                    codec, trusted=trusted)
+                    self.assertEqual(product, Product("Сыр", 500.5, "Молочные продукты"))
+                    restored = loads(dumps(task, codec), codec, trusted=trusted)
+                    self.assertEqual(restored.to_dict(), task.to_dict())
+
+    def test_store_round_trip(self):
+        """Тест сериализации магазина всеми кодеками."""
+        for codec in CODECS:
+            for trusted in (False, True):
+                with self.subTest(codec=codec, trusted=trusted):
+                    restored = loads(dumps(self.store, codec), codec, trusted=trusted)
+                    self.assert_store_equal(restored)
+                    self.assertEqual(restored.location, (55.75, 37.62))
+
+    def test_task_manager_round_trip(self):
+        """Тест сериализации менеджера задач с зависимостями."""
+        for codec in CODECS:
+            for trusted in (False, True):
+                with self.subTest(codec=codec, trusted=trusted):
+                    restored = loads(dumps(self.manager, codec), codec, trusted=trusted)
+                    self.assertEqual(restored.to_dict(), self.manager.to_dict())
+                    self.assertEqual(
+                        [task.description for task in restored.get_ready_tasks()],
+                        ["Приготовить ужин"],
+                    )
+                    restored.get_task("Приготовить ужин").mark_as_done()
+                    self.assertEqual(
+                        [task.description for task in restored.get_ready_tasks()],
+                        ["Помыть посуду"],
+                    )
+
+    def test_untrusted_skips_invalid_products(self):
+        """Тест пропуска некорректных и повторяющихся товаров без доверия."""
+        payload = JsonCodec().dumps(['Store', FORMAT_VERSION, {
+            'name': "Гастроном",
+            'address': "ул. Ленина, 1",
+            'items': [["Молоко", 80.0, "Молочные"], ["Хлеб", -5, "Хлеб"], ["Молоко", 90.0, "Молочные"]],
+        }])
+        with self.assertLogs('task_manager_store.serialization', level='ERROR'):
+            store = loads(payload)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.get_item("Молоко").price, 80.0)
+
+    def test_invalid_payloads(self):
+        """Тест ошибок при неизвестном кодеке, типе и версии формата."""
+        with self.assertRaises(ValueError):
+            get_codec('xml')
+        with self.assertRaises(TypeError):
+            dumps(object())
+        with self.assertRaises(ValueError):
+            loads(JsonCodec().dumps(['Task', FORMAT_VERSION + 1, ["Задача", "2024-01-01", False]]))
+        with self.assertRaises(ValueError):
+            loads(dumps(self.store), expected=TaskManager)
+        with self.assertRaises(ValueError):
+            loads(b'\xc1', 'msgpack')
+
+
+class TestMsgpackCodec(unittest.TestCase):
+    """Тесты для встроенной реализации MessagePack."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.codec = MsgpackCodec(use_package=False)
+
+    def test_encoding(self):
+        """Тест кодирования значений по спецификации MessagePack."""
+        self.assertEqual(self.codec.dumps(None), b'\xc0')
+        self.assertEqual(self.codec.dumps(True), b'\xc3')
+        self.assertEqual(self.codec.dumps(5), b'\x05')
+        self.assertEqual(self.codec.dumps(-1), b'\xff')
+        self.assertEqual(self.codec.dumps(-200), b'\xd3' + (-200).to_bytes(8, 'big', signed=True))
+        self.assertEqual(self.codec.dumps("ab"), b'\xa2ab')
+        self.assertEqual(self.codec.dumps([1, 2]), b'\x92\x01\x02')
+        self.assertEqual(self.codec.dumps({"a": 1}), b'\x81\xa1a\x01')
+
+    def test_round_trip_edge_values(self):
+        """Тест кодирования и декодирования граничных значений."""
+        values = [
+            0, 127, 128, -32, -33, 2 ** 63 - 1, -2 ** 63, 2 ** 64 - 1, 1.5, -0.25,
+            "", "я" * 40, "x" * 300, "y" * 70000, b"\x00\x01", b"z" * 70000,
+            list(range(20)), list(range(70000)), {str(i): i for i in range(20)},
+            {"вложенный": [None, False, {"ключ": [1.0, "значение"]}]},
+        ]
+        for value in values:
+            with self.subTest(value=repr(value)[:40]):
+                self.assertEqual(self.codec.loads(self.codec.dumps(value)), value)
+
+    def test_decodes_compact_integers(self):
+        """Тест декодирования целых и float32, которые встроенный кодер не создаёт."""
+        self.assertEqual(self.codec.loads(b'\xcc\xff'), 255)
+        self.assertEqual(self.codec.loads(b'\xcd\x01\x00'), 256)
+        self.assertEqual(self.codec.loads(b'\xd0\x80'), -128)
+        self.assertEqual(self.codec.loads(b'\xd2\xff\xff\xff\xfe'), -2)
+        self.assertEqual(self.codec.loads(b'\xca\x3f\xc0\x00\x00'), 1.5)
+
+    def test_corrupted_data(self):
+        """Тест ошибок при повреждённых данных."""
+        with self.assertRaises(ValueError):
+            self.codec.loads(b'\x92\x01')
+        with self.assertRaises(ValueError):
+            self.codec.loads(b'\x01\x02')
+        with self.assertRaises(TypeError):
+            self.codec.dumps(object())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Модуль для тестирования снимков магазина по категориям."""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.snapshot import LazyStore, MANIFEST_NAME, save_snapshot
+from task_manager_store.store import Store
+
+
+class TestLazyStore(unittest.TestCase):
+    """Тесты для класса LazyStore."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = Store("Гастроном", "ул. Ленина, 1", location=(55.75, 37.62))
+        self.store.add_items([
+            ("Молоко", 80.0, "Молочные продукты"),
+            ("Сыр", 500.0, "Молочные продукты"),
+            ("Хлеб", 40.0, "Хлебобулочные изделия"),
+            ("Батон", 35.0, "Хлебобулочные изделия"),
+            ("Яблоки", 120.0, "Фрукты"),
+        ])
+        save_snapshot(self.store, self.temp_dir)
+
+    def tearDown(self):
+        """Очистка после тестов."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_open_without_loading(self):
+        """Тест открытия снимка без создания товаров."""
+        lazy = LazyStore(self.temp_dir)
+        self.assertEqual(lazy.name, "Гастроном")
+        self.assertEqual(lazy.location, (55.75, 37.62))
+        self.assertEqual(lazy.loaded_categories, [])
+        self.assertEqual(len(lazy), 5)
+        self.assertIn("Сыр", lazy)
+        self.assertNotIn("Кефир", lazy)
+        self.assertEqual(lazy.count_in_category("Фрукты"), 1)
+        self.assertEqual(sorted(lazy.get_categories()), sorted(self.store.get_categories()))
+        self.assertEqual(lazy.get_category_counts(), self.store.get_category_counts())
+        self.assertEqual(lazy.loaded_categories, [])
+
+    def test_load_on_access(self):
+        """Тест загрузки категории при обращении."""
+        lazy = LazyStore(self.temp_dir)
+        self.assertEqual(lazy.get_price("Сыр"), 500.0)
+        self.assertEqual(lazy.loaded_categories, ["Молочные продукты"])
+        self.assertFalse(lazy.is_loaded("Фрукты"))
+
+        self.assertEqual(len(lazy.get_items_by_category("Хлебобулочные изделия")), 2)
+        self.assertEqual(lazy.cheapest(1, "Хлебобулочные изделия")[0].name, "Батон")
+        self.assertEqual(len(lazy.loaded_categories), 2)
+
+        self.assertEqual(lazy.cheapest(1)[0].name, "Батон")
+        self.assertEqual(len(lazy.loaded_categories), 3)
+        self.assertEqual(lazy.to_dict(), self.store.to_dict())
+
+    def test_eviction(self):
+        """Тест выгрузки давно не использованных категорий."""
+        lazy = LazyStore(self.temp_dir, max_products=2)
+        lazy.get_item("Молоко")
+        lazy.get_item("Хлеб")
+        # Молочные продукты выгружены, чтобы в памяти осталось не больше 2 товаров
+        self.assertEqual(lazy.loaded_categories, ["Хлебобулочные изделия"])
+        self.assertEqual(lazy.get_item("Сыр").price, 500.0)
+        self.assertEqual(lazy.loaded_categories, ["Молочные продукты"])
+        self.assertEqual(len(lazy), 5)
+        # Версии товаров не меняются при повторной загрузке
+        version = lazy.get_version("Сыр")
+        lazy.get_item("Хлеб")
+        self.assertEqual(lazy.get_version("Сыр"), version)
+        # Операции над всем магазином видят все товары
+        self.assertEqual(len(lazy.get_items()), 5)
+        self.assertEqual(len(lazy.get_items_in_price_range(0, 1000)), 5)
+
+    def test_modified_category_not_evicted(self):
+        """Тест сохранения изменённых категорий в памяти."""
+        lazy = LazyStore(self.temp_dir, max_products=1)
+        lazy.update_price("Сыр", 450.0)
+        lazy.get_item("Яблоки")
+        self.assertIn("Молочные продукты", lazy.loaded_categories)
+        self.assertFalse(lazy.evict("Молочные продукты"))
+        self.assertEqual(lazy.get_price("Сыр"), 450.0)
+        # Неизменённая категория выгружена сразу после обращения
+        self.assertFalse(lazy.is_loaded("Фрукты"))
+        self.assertFalse(lazy.evict("Фрукты"))
+
+        lazy.add_item("Груши", 150.0, "Фрукты")
+        self.assertEqual(lazy.count_in_category("Фрукты"), 2)
+        self.assertTrue(lazy.remove_item("Яблоки"))
+        self.assertNotIn("Яблоки", lazy)
+
+    def test_listeners_rejected(self):
+        """Тест запрета подписчиков ленивого магазина."""
+        lazy = LazyStore(self.temp_dir, max_products=1)
+        with self.assertRaises(TypeError):
+            lazy.add_listener(lambda store, events: None)
+        full = Store.from_dict(lazy.to_dict())
+        received = []
+        full.add_listener(lambda store, events: received.extend(events))
+        full.update_price("Яблоки", 130.0)
+        self.assertEqual(len(received), 1)
+
+    def test_str_after_logged_open(self):
+        """Тест строкового представления, когда открытие выводится в журнал."""
+        with self.assertLogs('task_manager_store', level='INFO') as logs:
+            lazy = LazyStore(self.temp_dir, max_products=2)
+        self.assertTrue(any("Товаров в ассортименте: 5" in line for line in logs.output))
+        self.assertEqual(lazy.loaded_categories, [])
+
+        text = str(lazy)
+        self.assertIn("Товаров в ассортименте: 5", text)
+        self.assertIn("Яблоки", text)
+        version = lazy.version
+        lazy.get_item("Сыр")
+        self.assertNotEqual(lazy.version, version)
+        self.assertEqual(str(lazy), text)
+
+    def test_names_follow_changes(self):
+        """Тест учёта категорий добавленных и удалённых товаров."""
+        lazy = LazyStore(self.temp_dir)
+        lazy.add_item("Груши", 150.0, "Фрукты")
+        lazy.remove_item("Сыр")
+        target = self.temp_dir / "copy"
+        save_snapshot(lazy, target)
+        copy = LazyStore(target)
+        self.assertIn("Груши", copy)
+        self.assertNotIn("Сыр", copy)
+        self.assertEqual(copy.loaded_categories, [])
+
+    def test_transaction(self):
+        """Тест транзакции с загрузкой категорий."""
+        lazy = LazyStore(self.temp_dir, max_products=1)
+        with self.assertRaises(RuntimeError):
+            with lazy.transaction():
+                lazy.update_price("Сыр", 1.0)
+                lazy.add_item("Кефир", 90.0, "Молочные продукты")
+                raise RuntimeError("Ошибка")
+        self.assertEqual(lazy.get_price("Сыр"), 500.0)
+        self.assertNotIn("Кефир", lazy)
+
+    def test_resave(self):
+        """Тест повторного сохранения снимка."""
+        lazy = LazyStore(self.temp_dir, max_products=2)
+        lazy.remove_item("Яблоки")
+        lazy.add_item("Груши", 150.0, "Сезонное")
+        target = self.temp_dir / "copy"
+        self.assertEqual(save_snapshot(lazy, target), target / MANIFEST_NAME)
+        copy = LazyStore(target)
+        self.assertEqual(sorted(copy.get_categories()), [
+            "Молочные продукты", "Сезонное", "Хлебобулочные изделия",
+        ])
+        self.assertEqual(copy.get_price("Груши"), 150.0)
+        self.assertEqual(len(copy), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
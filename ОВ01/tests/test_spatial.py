@@ -0,0 +1,118 @@
+"""Модуль для тестирования поиска ближайших магазинов."""
+
+import random
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.network import StoreNetwork
+from task_manager_store.spatial import StoreLocator, haversine
+from task_manager_store.store import Store
+
+
+class TestHaversine(unittest.TestCase):
+    """Тесты для расчёта расстояний."""
+
+    def test_distance(self):
+        """Тест расстояния между городами."""
+        # Москва - Санкт-Петербург, около 634 км
+        self.assertAlmostEqual(haversine(55.7558, 37.6173, 59.9343, 30.3351), 634, delta=3)
+        self.assertEqual(haversine(10.0, 20.0, 10.0, 20.0), 0.0)
+        # Через линию перемены дат
+        self.assertAlmostEqual(haversine(0.0, 179.9, 0.0, -179.9), 22.24, delta=0.1)
+
+
+class TestStoreLocator(unittest.TestCase):
+    """Тесты для класса StoreLocator."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.network = StoreNetwork()
+        stores = {
+            "center": ((55.7558, 37.6173), {"Молоко": 80.0, "Хлеб": 40.0}),
+            "north": ((55.8358, 37.6173), {"Молоко": 75.0}),
+            "south": ((55.6558, 37.6173), {"Хлеб": 35.0}),
+            "spb": ((59.9343, 30.3351), {"Молоко": 90.0, "Икра": 2000.0}),
+        }
+        for key, (location, prices) in stores.items():
+            self.network.add_store(Store(key, "Адрес", {
+                name: {"price": price} for name, price in prices.items()
+            }, location=location), key=key)
+        self.network.add_store(Store("online", "Интернет", {"Молоко": {"price": 70.0}}), key="online")
+        self.locator = StoreLocator(self.network)
+
+    def test_build_from_network(self):
+        """Тест индексации магазинов сети с координатами."""
+        self.assertEqual(len(self.locator), 4)
+        self.assertNotIn("online", self.locator)
+        self.assertEqual(self.locator.get_location("spb"), (59.9343, 30.3351))
+
+    def test_nearest(self):
+        """Тест поиска ближайших магазинов."""
+        result = self.locator.nearest(55.76, 37.62, k=3)
+        self.assertEqual([key for key, _ in result], ["center", "north", "south"])
+        self.assertLess(result[0][1], 1.0)
+        self.assertEqual(len(self.locator.nearest(0.0, 0.0, k=10)), 4)
+        self.assertEqual(self.locator.nearest(0.0, 0.0, k=0), [])
+
+    def test_nearest_with_product(self):
+        """Тест поиска ближайшего магазина с товаром."""
+        self.assertEqual(self.locator.nearest(55.66, 37.62, product="Молоко")[0][0], "center")
+        self.assertEqual(self.locator.nearest(55.66, 37.62, product="Икра")[0][0], "spb")
+        self.assertEqual(self.locator.nearest(55.66, 37.62, product="Соль"), [])
+        with self.assertRaises(ValueError):
+            StoreLocator().nearest(55.66, 37.62, product="Молоко")
+
+    def test_within_radius(self):
+        """Тест поиска магазинов в радиусе."""
+        result = self.locator.within_radius(55.7558, 37.6173, 12)
+        self.assertEqual([key for key, _ in result], ["center", "north", "south"])
+        self.assertEqual(
+            [key for key, _ in self.locator.within_radius(55.7558, 37.6173, 12, product="Хлеб")],
+            ["center", "south"],
+        )
+        self.assertEqual(len(self.locator.within_radius(55.7558, 37.6173, 1000)), 4)
+
+    def test_add_remove(self):
+        """Тест добавления, перемещения и удаления магазинов."""
+        self.locator.add("north", 59.93, 30.33)
+        self.assertEqual(self.locator.nearest(59.93, 30.33)[0][0], "north")
+        self.assertEqual(len(self.locator), 4)
+        self.assertTrue(self.locator.remove("north"))
+        self.assertFalse(self.locator.remove("north"))
+        with self.assertRaises(ValueError):
+            self.locator.add("bad", 0.0, 200.0)
+        with self.assertRaises(ValueError):
+            StoreLocator(cell_size=0)
+
+    def test_matches_linear_scan(self):
+        """Тест совпадения результатов с полным перебором."""
+        rng = random.Random(7)
+        points = {}
+        for cell_size in (0.5, 7.0, 100.0):
+            locator = StoreLocator(cell_size=cell_size)
+            for i in range(300):
+                if i % 2:
+                    point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+                else:
+                    point = (rng.gauss(55.7, 0.5), rng.gauss(37.6, 0.5))
+                points[str(i)] = point
+                locator.add(str(i), *point)
+            for latitude, longitude in [(55.7, 37.6), (89.9, 179.9), (-10.0, -179.5), (0.0, 0.0)]:
+                expected = sorted(
+                    haversine(latitude, longitude, *point) for point in points.values()
+                )
+                found = [distance for _, distance in locator.nearest(latitude, longitude, k=7)]
+                for actual, wanted in zip(found, expected[:7]):
+                    self.assertAlmostEqual(actual, wanted, places=6)
+                in_radius = locator.within_radius(latitude, longitude, 2000)
+                self.assertEqual(
+                    len(in_radius), sum(1 for distance in expected if distance <= 2000)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
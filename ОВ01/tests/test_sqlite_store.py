@@ -0,0 +1,125 @@
+"""Модуль для тестирования хранения магазинов в SQLite."""
+
+import unittest
+import tempfile
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.sqlite_store import SqliteStore
+from task_manager_store.store import Store
+
+
+class TestSqliteStore(unittest.TestCase):
+    """Тесты для класса SqliteStore."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "stores.db"
+        self.store = SqliteStore(self.path, "Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_items([
+            ("Молоко", 80.0, "Молочные продукты"),
+            ("Сыр", 500.0, "Молочные продукты"),
+            ("Хлеб", 40.0, "Хлебобулочные изделия"),
+            ("Батон", 45.0, "Хлебобулочные изделия"),
+        ])
+
+    def tearDown(self):
+        """Закрытие базы и удаление временной директории."""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def names(self, products):
+        """Возвращает названия товаров."""
+        return [product.name for product in products]
+
+    def test_queries(self):
+        """Тест выборок, выполняемых запросами к базе."""
+        self.assertEqual(len(self.store), 4)
+        self.assertIn("Сыр", self.store)
+        self.assertEqual(self.store.get_price("Хлеб"), 40.0)
+        self.assertEqual(self.store.get_item("Молоко").category, "Молочные продукты")
+        self.assertIsNone(self.store.get_item("Кефир"))
+        self.assertEqual(self.store.get_categories(),
+                         ["Молочные продукты", "Хлебобулочные изделия"])
+        self.assertEqual(self.store.get_category_counts(),
+                         {"Молочные продукты": 2, "Хлебобулочные изделия": 2})
+        self.assertEqual(self.names(self.store.get_items_by_category("Хлебобулочные изделия")),
+                         ["Батон", "Хлеб"])
+        self.assertEqual(self.names(self.store.get_items_in_price_range(40.0, 80.0)),
+                         ["Хлеб", "Батон", "Молоко"])
+        self.assertEqual(self.names(self.store.get_items_in_price_range(
+            40.0, 80.0, category="Молочные продукты")), ["Молоко"])
+        self.assertEqual(self.names(self.store.cheapest(2)), ["Хлеб", "Батон"])
+        self.assertEqual(self.names(self.store.most_expensive(1, "Хлебобулочные изделия")),
+                         ["Батон"])
+
+    def test_changes_and_validation(self):
+        """Тест изменения ассортимента и проверки данных."""
+        self.assertTrue(self.store.update_price("Молоко", 85.0))
+        self.assertFalse(self.store.update_price("Кефир", 85.0))
+        self.assertTrue(self.store.remove_item("Хлеб"))
+        self.assertFalse(self.store.remove_item("Хлеб"))
+        with self.assertRaises(ValueError):
+            self.store.add_item("Молоко", 90.0)
+        with self.assertRaises(ValueError):
+            self.store.update_prices({"Молоко": 90.0, "Сыр": -1.0})
+        with self.assertRaises(ValueError):
+            self.store.add_items([("Кефир", 70.0), ("Сыр", 10.0)])
+        self.assertEqual(self.store.get_price("Молоко"), 85.0)
+        self.assertNotIn("Кефир", self.store)
+
+    def test_malformed_and_non_finite_items(self):
+        """Тест отказа от пустых элементов и цен NaN и бесконечности."""
+        for items in ([("Кефир", 70.0), ()], [("Кефир", 70.0), 42],
+                      [("Кефир", 70.0), ("Творог", float('nan'))]):
+            with self.assertRaises(ValueError):
+                self.store.add_items(items)
+        for price in (float('nan'), float('inf')):
+            with self.assertRaises(ValueError):
+                self.store.add_item("Кефир", price)
+            with self.assertRaises(ValueError):
+                self.store.update_price("Молоко", price)
+        self.assertNotIn("Кефир", self.store)
+        self.assertEqual(self.store.get_price("Молоко"), 80.0)
+
+    def test_transactions(self):
+        """Тест атомарности транзакций и точек сохранения."""
+        with self.store.transaction():
+            self.store.add_item("Кефир", 70.0, "Молочные продукты")
+            with self.assertRaises(RuntimeError):
+                with self.store.transaction():
+                    self.store.remove_item("Сыр")
+                    raise RuntimeError("откат вложенной транзакции")
+        self.assertIn("Кефир", self.store)
+        self.assertIn("Сыр", self.store)
+
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.update_price("Молоко", 1.0)
+                raise RuntimeError("откат")
+        self.assertEqual(self.store.get_price("Молоко"), 80.0)
+
+    def test_persistence_and_conversion(self):
+        """Тест сохранения между соединениями и обмена с Store."""
+        self.store.close()
+        self.store = SqliteStore(self.path, "Тестовый магазин")
+        self.assertEqual(self.store.address, "ул. Тестовая, 123")
+        self.assertEqual(len(self.store), 4)
+        with self.assertRaises(ValueError):
+            SqliteStore(self.path, "Неизвестный магазин")
+
+        memory_store = self.store.to_store()
+        self.assertEqual(memory_store.get_price("Сыр"), 500.0)
+
+        other = Store("Другой магазин", "ул. Другая, 1", {"Чай": {"price": 150.0}})
+        with SqliteStore.from_store(self.path, other) as saved:
+            self.assertEqual(self.names(saved.iter_items()), ["Чай"])
+        self.assertEqual(len(self.store), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
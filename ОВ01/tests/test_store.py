@@ -1,15 +1,21 @@
 """Модуль для тестирования функциональности работы с магазинами."""
 
 import unittest
+import csv
+import io
+import json
 import shutil
+import tempfile
+import threading
 from pathlib import Path
 import sys
 from datetime import datetime
+from unittest import mock
 
 # Добавляем родительскую директорию в путь для импорта
 sys.path.append(str(Path(__file__).parent.parent))
 
-from task_manager_store.store import Store, Product
+from task_manager_store.store import PriceConflictError, Store, Product
 
 class TestProduct(unittest.TestCase):
     """Тесты для класса Product."""
@@ -33,6 +39,15 @@ class TestProduct(unittest.TestCase):
         """Тест создания товара с пустым названием."""
         with self.assertRaises(ValueError):
             Product("", 100.0, "Категория")
+    
+    def test_shared_strings(self):
+        """Тест общего экземпляра названия и категории в разных магазинах."""
+        data = '{"name": "М", "address": "А", "items": {"Сыр": {"name": "Сыр", "price": 500.0, "category": "Молочные продукты"}}}'
+        first = Store.from_dict(json.loads(data)).get_item("Сыр")
+        second = Store.from_dict(json.loads(data)).get_item("Сыр")
+        self.assertIsNot(first, second)
+        self.assertIs(first.name, second.name)
+        self.assertIs(first.category, second.category)
 
 
 class TestStore(unittest.TestCase):
@@ -124,6 +139,532 @@ class TestStore(unittest.TestCase):
             self.assertEqual(self.store._items[item_name].name, new_store._items[item_name].name)
             self.assertEqual(self.store._items[item_name].price, new_store._items[item_name].price)
             self.assertEqual(self.store._items[item_name].category, new_store._items[item_name].category)
+    
+    def test_location(self):
+        """Тест координат магазина."""
+        self.assertIsNone(self.store.location)
+        self.assertNotIn('location', self.store.to_dict())
+        
+        store = Store("Магазин", "Адрес", location=(55.75, 37.62))
+        self.assertEqual(store.location, (55.75, 37.62))
+        self.assertEqual(Store.from_dict(store.to_dict()).location, (55.75, 37.62))
+        
+        with self.assertRaises(ValueError):
+            Store("Магазин", "Адрес", location=(95.0, 37.62))
+
+
+class TestCategoryIndex(unittest.TestCase):
+    """Тесты индекса категорий магазина."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123", {
+            "Молоко": {"price": 70.0, "category": "Молочные продукты"},
+            "Сыр": {"price": 350.0, "category": "Молочные продукты"},
+            "Хлеб": {"price": 50.0, "category": "Выпечка"},
+        })
+    
+    def test_index_follows_changes(self):
+        """Тест обновления индекса при добавлении и удалении товаров."""
+        self.assertEqual(self.store.get_category_counts(), {"Молочные продукты": 2, "Выпечка": 1})
+        
+        self.store.add_item("Кефир", 80.0, "Молочные продукты")
+        self.store.remove_item("Хлеб")
+        self.assertEqual(self.store.count_in_category("Молочные продукты"), 3)
+        self.assertEqual(self.store.count_in_category("Выпечка"), 0)
+        self.assertEqual(self.store.get_categories(), ["Молочные продукты"])
+    
+    def test_from_dict_builds_index(self):
+        """Тест построения индекса при загрузке из словаря."""
+        new_store = Store.from_dict(self.store.to_dict())
+        self.assertEqual(
+            sorted(item.name for item in new_store.get_items_by_category("Молочные продукты")),
+            ["Молоко", "Сыр"]
+        )
+    
+    def test_from_dict_skips_duplicate_names(self):
+        """Тест пропуска товаров с повторяющимися названиями при загрузке."""
+        data = self.store.to_dict()
+        data['items']['Копия'] = {"name": "Сыр", "price": 1.0, "category": "Выпечка"}
+        new_store = Store.from_dict(data)
+        self.assertEqual(len(new_store), 3)
+        self.assertEqual(new_store.get_price("Сыр"), 350.0)
+        self.assertEqual(new_store.count_in_category("Выпечка"), 1)
+    
+    def test_index_inside_transaction(self):
+        """Тест согласованности индекса внутри транзакции и после отката."""
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.add_item("Батон", 45.0, "Выпечка")
+                self.assertEqual(self.store.count_in_category("Выпечка"), 2)
+                self.store.remove_item("Хлеб")
+                raise RuntimeError("сбой")
+        
+        self.assertEqual(self.store.get_category_counts(), {"Молочные продукты": 2, "Выпечка": 1})
+        self.assertEqual(
+            [item.name for item in self.store.get_items_by_category("Выпечка")],
+            ["Хлеб"]
+        )
+
+
+class TestPriceIndex(unittest.TestCase):
+    """Тесты запросов по цене."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        for i, (category, price) in enumerate([
+            ("Фрукты", 120.0), ("Фрукты", 90.0), ("Овощи", 45.0),
+            ("Овощи", 600.0), ("Фрукты", 450.0),
+        ]):
+            self.store.add_item(f"Товар {i}", price, category)
+    
+    def names(self, products):
+        return [product.name for product in products]
+    
+    def test_price_range(self):
+        """Тест выборки товаров по диапазону цен."""
+        self.assertEqual(
+            self.names(self.store.get_items_in_price_range(90.0, 450.0)),
+            ["Товар 1", "Товар 0", "Товар 4"]
+        )
+        self.assertEqual(
+            self.names(self.store.get_items_in_price_range(0.0, 500.0, category="Овощи")),
+            ["Товар 2"]
+        )
+        self.assertEqual(self.store.get_items_in_price_range(1000.0, 2000.0), [])
+    
+    def test_cheapest_and_most_expensive(self):
+        """Тест выборки самых дешёвых и самых дорогих товаров."""
+        self.assertEqual(self.names(self.store.cheapest(2)), ["Товар 2", "Товар 1"])
+        self.assertEqual(self.names(self.store.cheapest(1, category="Фрукты")), ["Товар 1"])
+        self.assertEqual(self.names(self.store.most_expensive(2)), ["Товар 3", "Товар 4"])
+        self.assertEqual(self.store.cheapest(3, category="Нет такой"), [])
+    
+    def test_index_follows_updates(self):
+        """Тест обновления индекса при изменении цен и удалении."""
+        self.store.update_price("Товар 3", 10.0)
+        self.store.remove_item("Товар 2")
+        self.assertEqual(self.names(self.store.cheapest(2)), ["Товар 3", "Товар 1"])
+        self.assertEqual(self.names(self.store.most_expensive(1, category="Овощи")), ["Товар 3"])
+    
+    def test_non_finite_prices_rejected(self):
+        """Тест отказа от цен NaN и бесконечности, нарушающих порядок индекса."""
+        for price in (float('nan'), float('inf'), float('-inf')):
+            with self.subTest(price=price):
+                with self.assertRaises(ValueError):
+                    self.store.add_item("Новый товар", price, "Фрукты")
+                with self.assertRaises(ValueError):
+                    self.store.update_price("Товар 0", price)
+                with self.assertRaises(ValueError):
+                    self.store.update_prices({"Товар 1": 10.0, "Товар 0": price})
+                with self.assertRaises(ValueError):
+                    Product("Новый товар", price)
+
+        self.store.update_price("Товар 2", 20.0)
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.names(self.store.cheapest(2)), ["Товар 2", "Товар 1"])
+        self.assertEqual(self.names(self.store.get_items_in_price_range(40.0, 100.0)), ["Товар 1"])
+
+    def test_percentile(self):
+        """Тест вычисления процентилей цен."""
+        self.assertEqual(self.store.price_percentile(50), 120.0)
+        self.assertEqual(self.store.price_percentile(0), 45.0)
+        self.assertEqual(self.store.price_percentile(100), 600.0)
+        self.assertIsNone(Store("Пустой", "Адрес").price_percentile(50))
+        with self.assertRaises(ValueError):
+            self.store.price_percentile(101)
+    
+    def test_category_stats(self):
+        """Тест статистики цен по категориям."""
+        self.assertEqual(self.store.get_category_stats("Фрукты"), {
+            'count': 3, 'total': 660.0, 'min': 90.0, 'max': 450.0, 'average': 220.0
+        })
+        self.assertIsNone(self.store.get_category_stats("Нет такой"))
+        
+        self.store.update_price("Товар 4", 30.0)
+        self.store.remove_item("Товар 1")
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.update_price("Товар 0", 1000.0)
+                self.assertEqual(self.store.get_category_stats("Фрукты")['max'], 1000.0)
+                self.store.update_price("Товар 0", -1.0)
+        stats = self.store.category_stats()
+        self.assertEqual(stats["Фрукты"], {
+            'count': 2, 'total': 150.0, 'min': 30.0, 'max': 120.0, 'average': 75.0
+        })
+        self.assertEqual(stats["Овощи"]["average"], 322.5)
+        
+        self.store.remove_item("Товар 2")
+        self.store.remove_item("Товар 3")
+        self.assertNotIn("Овощи", self.store.category_stats())
+
+
+class TestBulkOperations(unittest.TestCase):
+    """Тесты пакетных операций магазина."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Товар 1", 100.0, "Категория 1")
+        self.store.add_item("Товар 2", 200.0, "Категория 1")
+        self.batches = []
+        self.store.add_listener(lambda store, events: self.batches.append(events))
+    
+    def test_update_prices(self):
+        """Тест пакетного обновления цен."""
+        results = self.store.update_prices({"Товар 1": 110.0, "Товар 2": 220.0, "Нет": 5.0})
+        self.assertEqual(results, {"Товар 1": True, "Товар 2": True, "Нет": False})
+        self.assertEqual(self.store.get_price("Товар 2"), 220.0)
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([p.name for p in self.store.cheapest(1)], ["Товар 1"])
+    
+    def test_update_prices_is_atomic(self):
+        """Тест отказа от всего пакета при некорректной цене."""
+        with self.assertRaises(ValueError):
+            self.store.update_prices({"Товар 1": 110.0, "Товар 2": -1.0})
+        self.assertEqual(self.store.get_price("Товар 1"), 100.0)
+        self.assertEqual(self.batches, [])
+    
+    def test_add_items(self):
+        """Тест пакетного добавления товаров."""
+        products = self.store.add_items([("Товар 3", 300.0, "Категория 2"), ("Товар 4", 400.0)])
+        self.assertEqual([p.name for p in products], ["Товар 3", "Товар 4"])
+        self.assertEqual(self.store.get_item("Товар 4").category, "Без категории")
+        self.assertEqual(self.store.count_in_category("Категория 2"), 1)
+        self.assertEqual(len(self.batches), 1)
+    
+    def test_add_items_is_atomic(self):
+        """Тест отказа от всего пакета при ошибке в одном товаре."""
+        for items in (
+            [("Товар 3", 300.0), ("Товар 1", 50.0)],
+            [("Товар 3", 300.0), ("Товар 3", 50.0)],
+            [("Товар 3", 300.0), ("", 50.0)],
+            [("Товар 3", 300.0), ()],
+            [("Товар 3", 300.0), ["Товар 5", 50.0, "Категория 1", "лишнее"]],
+            [("Товар 3", 300.0), 42],
+            [("Товар 3", 300.0), ("Товар 5",)],
+            [("Товар 3", 300.0), (["Товар 5"], 50.0)],
+            [("Товар 3", 300.0), ("Товар 5", "дорого")],
+        ):
+            with self.assertRaises(ValueError):
+                self.store.add_items(items)
+        self.assertNotIn("Товар 3", self.store)
+        self.assertEqual(len(self.store), 2)
+
+
+class TestCsvLoader(unittest.TestCase):
+    """Тесты потоковой загрузки товаров из CSV."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Хлеб", 50.0, "Выпечка")
+    
+    def tearDown(self):
+        """Удаление временной директории."""
+        self.temp_dir.cleanup()
+    
+    def test_load_with_rejects(self):
+        """Тест загрузки с записью отклонённых строк."""
+        path = Path(self.temp_dir.name) / "catalog.csv"
+        errors_path = Path(self.temp_dir.name) / "errors.csv"
+        path.write_text(
+            "title;cost;group\n"
+            "Молоко;70,5;Молочные продукты\n"
+            "Сыр;350;Молочные продукты\n"
+            "Хлеб;45;Выпечка\n"
+            ";10;Без названия\n"
+            "Кефир;-5;Молочные продукты\n"
+            "Творог;дорого;Молочные продукты\n"
+            "Сыр;360;Молочные продукты\n"
+            "Соль;20;\n",
+            encoding="utf-8"
+        )
+        report = self.store.load_csv(
+            path, mapping={"name": "title", "price": "cost", "category": "group"},
+            errors_path=errors_path, batch_size=2, delimiter=";"
+        )
+        
+        self.assertEqual((report.rows, report.loaded, report.rejected), (8, 3, 5))
+        self.assertGreater(report.rows_per_second, 0)
+        self.assertEqual(self.store.get_price("Молоко"), 70.5)
+        self.assertEqual(self.store.get_item("Соль").category, "Без категории")
+        self.assertEqual(self.store.count_in_category("Молочные продукты"), 2)
+        
+        with open(errors_path, newline="", encoding="utf-8") as f:
+            rejects = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual([row["title"] for row in rejects], ["Хлеб", "", "Кефир", "Творог", "Сыр"])
+        self.assertTrue(all(row["error"] for row in rejects))
+    
+    def test_load_from_stream(self):
+        """Тест загрузки из открытого потока."""
+        report = self.store.load_csv(io.StringIO("name,price\nСоль,20\n"))
+        self.assertEqual(report.loaded, 1)
+        self.assertIn("Соль", self.store)
+    
+    def test_non_finite_prices_rejected(self):
+        """Тест отклонения строк с ценами nan и inf."""
+        errors_path = Path(self.temp_dir.name) / "errors.csv"
+        report = self.store.load_csv(
+            io.StringIO("name,price\nСоль,nan\nСахар,inf\nПерец,-inf\nМука,60\n"),
+            errors_path=errors_path
+        )
+        self.assertEqual((report.rows, report.loaded, report.rejected), (4, 1, 3))
+        self.assertNotIn("Соль", self.store)
+        self.assertEqual(self.store.cheapest(1)[0].name, "Хлеб")
+        with open(errors_path, newline="", encoding="utf-8") as f:
+            rejects = list(csv.DictReader(f))
+        self.assertEqual([row["name"] for row in rejects], ["Соль", "Сахар", "Перец"])
+    
+    def test_missing_columns(self):
+        """Тест отказа при отсутствии обязательных колонок."""
+        with self.assertRaises(ValueError):
+            self.store.load_csv(io.StringIO("title,price\nСоль,20\n"))
+
+
+class TestStoreTransactions(unittest.TestCase):
+    """Тесты транзакций магазина."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Товар 1", 100.0, "Категория 1")
+        self.store.add_item("Товар 2", 200.0, "Категория 1")
+        self.batches = []
+        self.store.add_listener(lambda store, events: self.batches.append(events))
+    
+    def test_commit_notifies_once(self):
+        """Тест передачи изменений подписчикам одним пакетом."""
+        with self.store.transaction():
+            self.store.add_item("Товар 3", 300.0, "Категория 2")
+            self.store.update_price("Товар 1", 150.0)
+            self.store.remove_item("Товар 2")
+            self.assertEqual(self.batches, [])
+        
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([event.kind for event in self.batches[0]], ["add", "price", "remove"])
+        self.assertEqual(self.store.get_price("Товар 1"), 150.0)
+        self.assertNotIn("Товар 2", self.store)
+    
+    def test_rollback_on_error(self):
+        """Тест отката всех изменений при исключении."""
+        before = self.store.to_dict()
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.add_item("Товар 3", 300.0, "Категория 2")
+                self.store.update_price("Товар 1", 150.0)
+                self.store.remove_item("Товар 2")
+                self.store.update_price("Товар 1", -1.0)
+        
+        self.assertEqual(self.store.to_dict(), before)
+        self.assertEqual(self.batches, [])
+    
+    def test_listener_without_transaction(self):
+        """Тест уведомления подписчиков об отдельных операциях."""
+        self.store.update_price("Товар 1", 120.0)
+        self.assertEqual(len(self.batches), 1)
+        event = self.batches[0][0]
+        self.assertEqual((event.kind, event.old_price, event.new_price), ("price", 100.0, 120.0))
+
+
+class TestAutocomplete(unittest.TestCase):
+    """Тесты поиска товаров по префиксу."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Молоко", 80.0, "Молочные продукты")
+        self.store.add_item("молочный коктейль", 120.0, "Напитки")
+        self.store.add_item("Морковь", 40.0, "Овощи")
+        self.store.add_item("Мёд", 500.0, "Бакалея")
+        self.store.add_item("Хлеб", 50.0, "Хлебобулочные изделия")
+    
+    def names(self, products):
+        """Возвращает названия товаров."""
+        return [product.name for product in products]
+    
+    def test_case_insensitive_prefix(self):
+        """Тест поиска без учёта регистра."""
+        self.assertEqual(self.names(self.store.autocomplete("мол")),
+                         ["Молоко", "молочный коктейль"])
+        self.assertEqual(self.names(self.store.autocomplete("МО", limit=2)),
+                         ["Молоко", "молочный коктейль"])
+        self.assertEqual(self.store.autocomplete("Сыр"), [])
+        self.assertEqual(len(self.store.autocomplete("")), 5)
+    
+    def test_ordering(self):
+        """Тест сортировки подсказок по цене и категории."""
+        self.assertEqual(self.names(self.store.autocomplete("м", order="price")),
+                         ["Морковь", "Молоко", "молочный коктейль", "Мёд"])
+        self.assertEqual(self.names(self.store.autocomplete("м", limit=2, order="category")),
+                         ["Мёд", "Молоко"])
+        with self.assertRaises(ValueError):
+            self.store.autocomplete("м", order="rating")
+    
+    def test_index_follows_changes(self):
+        """Тест обновления индекса при изменениях и откате."""
+        self.store.remove_item("Молоко")
+        self.store.add_item("Мороженое", 90.0, "Замороженные продукты")
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.add_item("Мойва", 200.0, "Рыба")
+                self.assertEqual(len(self.store.autocomplete("мо")), 4)
+                self.store.add_item("Мойва", 200.0, "Рыба")
+        self.assertEqual(self.names(self.store.autocomplete("мо")),
+                         ["молочный коктейль", "Морковь", "Мороженое"])
+
+
+class TestOptimisticConcurrency(unittest.TestCase):
+    """Тесты изменения цен с проверкой версии."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Товар 1", 100.0)
+        self.store.add_item("Товар 2", 200.0)
+    
+    def test_compare_and_set(self):
+        """Тест сравнения версии с обменом."""
+        price, version = self.store.get_price_with_version("Товар 1")
+        self.assertTrue(self.store.update_price("Товар 1", price + 10, expected_version=version))
+        with self.assertRaises(PriceConflictError) as context:
+            self.store.update_price("Товар 1", price + 20, expected_version=version)
+        self.assertIsInstance(context.exception, ValueError)
+        self.assertEqual(context.exception.actual_version, self.store.get_version("Товар 1"))
+        self.assertEqual(self.store.get_price("Товар 1"), 110.0)
+        self.assertIsNone(self.store.get_price_with_version("Товар 3"))
+    
+    def test_versions_never_repeat(self):
+        """Тест уникальности версий после удаления и отката."""
+        version = self.store.get_version("Товар 1")
+        self.store.remove_item("Товар 1")
+        self.assertIsNone(self.store.get_version("Товар 1"))
+        self.store.add_item("Товар 1", 100.0)
+        self.assertGreater(self.store.get_version("Товар 1"), version)
+        
+        version = self.store.get_version("Товар 2")
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.update_price("Товар 2", 1.0)
+                raise RuntimeError("откат")
+        self.assertEqual(self.store.get_price("Товар 2"), 200.0)
+        self.assertNotEqual(self.store.get_version("Товар 2"), version)
+    
+    def test_no_lost_updates(self):
+        """Нагрузочный тест: параллельные увеличения цены не теряются."""
+        workers, increments = 8, 100
+        conflicts = []
+        
+        def worker():
+            retries = 0
+            for i in range(increments):
+                name = f"Товар {i % 2 + 1}"
+                while True:
+                    price, version = self.store.get_price_with_version(name)
+                    try:
+                        self.store.update_price(name, price + 1, expected_version=version)
+                        break
+                    except PriceConflictError:
+                        retries += 1
+            conflicts.append(retries)
+        
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        total = workers * increments
+        self.assertEqual(self.store.get_price("Товар 1") + self.store.get_price("Товар 2"),
+                         300.0 + total)
+        self.assertEqual(len(conflicts), workers)
+        self.assertEqual([p.name for p in self.store.cheapest(1)], ["Товар 1"])
+    
+    def test_concurrent_batches(self):
+        """Нагрузочный тест: пересекающиеся пакеты не добавляются дважды."""
+        added = []
+        
+        def worker(offset):
+            for start in range(0, 200, 20):
+                items = [(f"Пакетный товар {i}", 10.0 + i) for i in range(start + offset, start + 40)]
+                try:
+                    added.extend(self.store.add_items(items))
+                except ValueError:
+                    pass
+        
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        names = [product.name for product in added]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(self.store), 2 + len(names))
+        self.assertEqual(len(self.store.get_items_in_price_range(0, 1000)), len(self.store))
+    
+    def test_queries_skip_concurrently_removed(self):
+        """Тест запросов, когда товар удалён после чтения индекса."""
+        self.store.cheapest(1)
+        # Товар исчезает из словаря раньше, чем из индексов
+        del self.store._items["Товар 1"]
+        self.assertEqual([p.name for p in self.store.cheapest(2)], ["Товар 2"])
+        self.assertEqual([p.name for p in self.store.most_expensive(2)], ["Товар 2"])
+        self.assertEqual([p.name for p in self.store.get_items_in_price_range(0, 1000)], ["Товар 2"])
+        self.assertEqual([p.name for p in self.store.autocomplete("Товар")], ["Товар 2"])
+
+
+class TestStoreRendering(unittest.TestCase):
+    """Тесты кэширования строкового представления магазина."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.store = Store("Тестовый магазин", "ул. Тестовая, 123")
+        self.store.add_item("Товар 1", 100.0, "Категория 1")
+        self.store.add_item("Товар 2", 200.0, "Категория 2")
+    
+    def render_calls(self):
+        """Возвращает заглушку, считающую перестроенные категории."""
+        return mock.patch.object(
+            self.store, '_render_category', wraps=self.store._render_category
+        )
+    
+    def test_cached_output(self):
+        """Тест повторного использования готовой строки."""
+        text = str(self.store)
+        version = self.store.version
+        with self.render_calls() as render:
+            self.assertIs(str(self.store), text)
+        render.assert_not_called()
+        self.assertEqual(self.store.version, version)
+    
+    def test_only_changed_category_rerendered(self):
+        """Тест перестроения только изменившейся категории."""
+        str(self.store)
+        self.store.update_price("Товар 1", 150.0)
+        with self.render_calls() as render:
+            text = str(self.store)
+        render.assert_called_once_with("Категория 1")
+        self.assertIn("Товар 1 - 150.00 руб.", text)
+        self.assertIn("Товар 2 - 200.00 руб.", text)
+        
+        self.store.remove_item("Товар 2")
+        self.store.name = "Новое название"
+        text = str(self.store)
+        self.assertNotIn("Категория 2", text)
+        self.assertTrue(text.startswith("=== Новое название ==="))
+    
+    def test_rollback_invalidates_cache(self):
+        """Тест актуальности кэша после отката транзакции."""
+        before = str(self.store)
+        with self.assertRaises(ValueError):
+            with self.store.transaction():
+                self.store.update_price("Товар 1", 150.0)
+                self.assertIn("150.00", str(self.store))
+                self.store.update_price("Товар 1", -1.0)
+        self.assertEqual(str(self.store), before)
 
 
 class TestStoreInitialization(unittest.TestCase):
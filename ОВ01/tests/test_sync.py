@@ -0,0 +1,237 @@
+"""Модуль для тестирования синхронизации копий магазинов и менеджеров задач."""
+
+import json
+import multiprocessing
+import unittest
+from pathlib import Path
+import sys
+
+# Добавляем родительскую директорию в путь для импорта
+sys.path.append(str(Path(__file__).parent.parent))
+
+from task_manager_store.store import Store
+from task_manager_store.sync import (
+    HashTree, Patch, RemoteReplica, StoreReplica, TaskManagerReplica, diff, serve, sync,
+)
+from task_manager_store.task import TaskManager
+
+PRODUCTS = 2000
+
+
+def build_store():
+    """Создаёт магазин с одинаковым ассортиментом в каждом процессе."""
+    store = Store("Гипермаркет", "пр. Мира, 1")
+    store.add_items([
+        (f"Товар {number}", 10.0 + number, f"Категория {number % 20}")
+        for number in range(PRODUCTS)
+    ])
+    return store
+
+
+def serve_changed_store(connection):
+    """Изменяет магазин и обслуживает запросы к его копии (в дочернем процессе)."""
+    store = build_store()
+    replica = StoreReplica(store)
+    store.update_price("Товар 5", 999.0)
+    store.remove_item("Товар 6")
+    store.add_item("Новый товар", 50.0, "Категория 3")
+    serve(replica, connection)
+
+
+class TestHashTree(unittest.TestCase):
+    """Тесты для класса HashTree."""
+
+    def test_root_depends_only_on_content(self):
+        """Тест совпадения корня при одинаковом содержимом в любом порядке."""
+        first, second = HashTree(buckets=8), HashTree(buckets=8)
+        for key in ("а", "б", "в"):
+            first.set(key, "группа", f"хеш {key}")
+        for key in ("в", "а", "б"):
+            second.set(key, "группа", f"хеш {key}")
+        self.assertEqual(first.root(), second.root())
+
+        original = first.root()
+        first.set("а", "другая группа", "хеш а")
+        self.assertNotEqual(first.root(), original)
+        first.set("а", "группа", "хеш а")
+        self.assertEqual(first.root(), original)
+        self.assertEqual(list(first.group_hashes()), ["группа"])
+
+        first.discard("а")
+        first.discard("б")
+        first.discard("в")
+        self.assertEqual(first.root(), HashTree(buckets=8).root())
+        self.assertEqual(len(first), 0)
+
+    def test_invalid_buckets(self):
+        """Тест ошибки при неположительном количестве корзин."""
+        with self.assertRaises(ValueError):
+            HashTree(buckets=0)
+
+
+class TestStoreSync(unittest.TestCase):
+    """Тесты синхронизации магазинов."""
+
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.source = build_store()
+        self.target = build_store()
+        self.source_replica = StoreReplica(self.source)
+        self.target_replica = StoreReplica(self.target)
+
+    def test_identical_stores(self):
+        """Тест пустой разницы у одинаковых магазинов."""
+        self.assertEqual(len(diff(self.source_replica, self.target_replica)), 0)
+
+    def test_minimal_patch(self):
+        """Тест разницы, содержащей только изменённые товары."""
+        self.source.update_price("Товар 1", 555.0)
+        self.source.remove_item("Товар 2")
+        self.source.remove_item("Товар 3")
+        self.source.add_item("Товар 3", 13.0, "Категория 7")
+        self.source.add_item("Новый товар", 42.0, "Новая категория")
+        self.target.remove_item("Товар 4")
+
+        patch = diff(self.source_replica, self.target_replica)
+        self.assertEqual(sorted(patch.upserts), sorted([
+            ["Товар 1", 555.0, "Категория 1"],
+            ["Товар 3", 13.0, "Категория 7"],
+            ["Товар 4", 14.0, "Категория 4"],
+            ["Новый товар", 42.0, "Новая категория"],
+        ]))
+        self.assertEqual(patch.removals, ["Товар 2"])
+
+        self.target_replica.apply(Patch.from_dict(json.loads(json.dumps(patch.to_dict()))))
+        self.assertEqual(self.target.to_dict()['items'], self.source.to_dict()['items'])
+        self.assertEqual(self.target_replica.info(), self.source_replica.info())
+
+    def test_removed_category(self):
+        """Тест удаления всех товаров категории."""
+        with self.target.transaction():
+            for product in self.target.get_items_by_category("Категория 0"):
+                self.target.remove_item(product.name)
+        self.assertEqual(len(sync(self.target_replica, self.source_replica)), PRODUCTS // 20)
+        self.assertNotIn("Категория 0", self.source.get_categories())
+        self.assertEqual(self.source_replica.info(), self.target_replica.info())
+
+    def test_incompatible_replicas(self):
+        """Тест ошибки при сравнении копий разного вида."""
+        with self.assertRaises(ValueError):
+            diff(self.source_replica, TaskManagerReplica(TaskManager()))
+        with self.assertRaises(ValueError):
+            diff(self.source_replica, StoreReplica(Store("Магазин", "Адрес"), buckets=8))
+
+    def test_two_processes(self):
+        """Тест синхронизации с копией в другом процессе."""
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=serve_changed_store, args=(child,))
+        process.start()
+        remote = RemoteReplica(parent)
+        try:
+            patch = sync(remote, self.target_replica)
+            self.assertEqual(len(patch), 3)
+            self.assertEqual(self.target.get_item("Товар 5").price, 999.0)
+            self.assertNotIn("Товар 6", self.target)
+            self.assertEqual(self.target_replica.info()['root'], remote.info()['root'])
+            self.assertEqual(len(sync(remote, self.target_replica)), 0)
+        finally:
+            remote.close()
+            process.join(timeout=30)
+        full_size = len(json.dumps(self.target.to_dict(), ensure_ascii=False).encode('utf-8'))
+        self.assertLess(remote.bytes_received * 5, full_size)
+
+
+class TestTaskManagerSync(unittest.TestCase):
+    """Тесты синхронизации менеджеров задач."""
+
+    @staticmethod
+    def build_manager():
+        """Создаёт менеджер задач с зависимостями."""
+        manager = TaskManager()
+        manager.add_task("Купить продукты", "2024-05-01")
+        manager.add_task("Приготовить ужин", "2024-05-02")
+        manager.add_task("Помыть посуду", "2024-05-03")
+        manager.add_task("Отчёт", "2024-06-10")
+        manager.add_dependency("Приготовить ужин", "Купить продукты")
+        manager.add_dependency("Помыть посуду", "Приготовить ужин")
+        return manager
+
+    def test_sync_tasks_and_dependencies(self):
+        """Тест синхронизации задач, статусов, сроков и зависимостей."""
+        source, target = self.build_manager(), self.build_manager()
+        source_replica, target_replica = TaskManagerReplica(source), TaskManagerReplica(target)
+        self.assertEqual(len(diff(source_replica, target_replica)), 0)
+
+        source.mark_task_completed("Купить продукты")
+        source.remove_task("Отчёт")
+        source.add_task("Отчёт", "2024-07-01")
+        source.add_task("Вынести мусор", "2024-05-03")
+        source.remove_dependency("Помыть посуду", "Приготовить ужин")
+        source.add_dependency("Помыть посуду", "Вынести мусор")
+        source.add_dependency("Приготовить ужин", "Отчёт")
+
+        patch = sync(source_replica, target_replica)
+        self.assertEqual(len(patch), 5)
+        self.assertEqual(target_replica.info(), source_replica.info())
+        self.assertEqual(target.get_task("Отчёт").due_date, "2024-07-01")
+        self.assertEqual(
+            sorted(task.description for task in target.get_ready_tasks()),
+            sorted(task.description for task in source.get_ready_tasks()),
+        )
+
+    def test_reopened_task_keeps_dependents(self):
+        """Тест пересоздания задачи с сохранением зависящих от неё задач."""
+        source, target = self.build_manager(), self.build_manager()
+        target.mark_task_completed("Купить продукты")
+        sync(TaskManagerReplica(source), TaskManagerReplica(target))
+        self.assertFalse(target.get_task("Купить продукты").status)
+        self.assertEqual(
+            [task.description for task in target.get_blockers("Приготовить ужин")],
+            ["Купить продукты"],
+        )
+        self.assertEqual(sorted(task.description for task in target.get_ready_tasks()),
+                         ["Купить продукты", "Отчёт"])
+
+    def test_refresh_rehashes_only_changed_tasks(self):
+        """Тест пересчёта хешей только изменённых задач."""
+        manager = TaskManager()
+        with manager.transaction():
+            for number in range(2000):
+                manager.add_task(f"Задача {number}", "2024-05-01")
+        replica = TaskManagerReplica(manager)
+        replica.info()
+        recorded = []
+        record = replica._record
+
+        def counting_record(task):
+            recorded.append(task.description)
+            return record(task)
+
+        replica._record = counting_record
+        replica.info()
+        self.assertEqual(recorded, [])
+
+        manager.mark_task_completed("Задача 7")
+        manager.add_dependency("Задача 8", "Задача 9")
+        replica.info()
+        self.assertEqual(sorted(recorded), ["Задача 7", "Задача 8"])
+
+        recorded.clear()
+        manager.remove_task("Задача 9")
+        replica.close()
+        manager.mark_task_completed("Задача 10")
+        replica.info()
+        self.assertEqual(recorded, ["Задача 8"])
+        self.assertEqual(len(replica.tree), 1999)
+
+    def test_case_collision_reported(self):
+        """Тест предупреждения о задачах, совпадающих без учёта регистра."""
+        manager = self.build_manager()
+        manager.add_task("отчёт", "2024-06-11")
+        with self.assertLogs('task_manager_store.sync', level='WARNING') as logs:
+            TaskManagerReplica(manager).info()
+        self.assertIn("Отчёт", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
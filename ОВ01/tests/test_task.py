@@ -109,6 +109,261 @@ class TestTaskManager(unittest.TestCase):
             self.assertEqual(original.status, loaded.status)
 
 
+class TestTaskDependencies(unittest.TestCase):
+    """Тесты зависимостей между задачами."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.manager = TaskManager()
+        self.tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        for description in ("Купить краску", "Покрасить стену", "Повесить картину"):
+            self.manager.add_task(description, self.tomorrow)
+        self.manager.add_dependency("Покрасить стену", "Купить краску")
+        self.manager.add_dependency("Повесить картину", "Покрасить стену")
+    
+    def ready_descriptions(self):
+        return [task.description for task in self.manager.get_ready_tasks()]
+    
+    def test_ready_tasks_follow_completion(self):
+        """Тест обновления готовых задач при выполнении блокеров."""
+        self.assertEqual(self.ready_descriptions(), ["Купить краску"])
+        
+        self.manager.mark_task_completed("Купить краску")
+        self.assertEqual(self.ready_descriptions(), ["Покрасить стену"])
+        
+        self.manager.get_task("Покрасить стену").mark_as_done()
+        self.assertEqual(self.ready_descriptions(), ["Повесить картину"])
+    
+    def test_cycle_detection(self):
+        """Тест запрета циклических зависимостей."""
+        with self.assertRaises(ValueError):
+            self.manager.add_dependency("Купить краску", "Повесить картину")
+        with self.assertRaises(ValueError):
+            self.manager.add_dependency("Купить краску", "Купить краску")
+        with self.assertRaises(ValueError):
+            self.manager.add_dependency("Купить краску", "Несуществующая задача")
+        self.assertFalse(self.manager.add_dependency("Покрасить стену", "Купить краску"))
+    
+    def test_remove_blocker_task(self):
+        """Тест удаления блокирующей задачи."""
+        self.manager.remove_task("Купить краску")
+        self.assertEqual(self.ready_descriptions(), ["Покрасить стену"])
+        self.assertEqual(self.manager.get_blockers("Покрасить стену"), [])
+    
+    def test_remove_dependency(self):
+        """Тест удаления зависимости."""
+        self.assertTrue(self.manager.remove_dependency("Повесить картину", "Покрасить стену"))
+        self.assertIn("Повесить картину", self.ready_descriptions())
+        self.assertFalse(self.manager.remove_dependency("Повесить картину", "Покрасить стену"))
+    
+    def test_dependents(self):
+        """Тест получения зависимых задач."""
+        self.assertEqual(
+            [task.description for task in self.manager.get_dependents("Купить краску")],
+            ["Покрасить стену"]
+        )
+        self.assertEqual(self.manager.get_dependents("Повесить картину"), [])
+        self.assertEqual(self.manager.get_dependents("Несуществующая задача"), [])
+    
+    def test_link_tasks(self):
+        """Тест связывания и разрыва зависимости по объектам задач."""
+        tasks = self.manager.tasks_by_description()
+        paint, picture = tasks["покрасить стену"], tasks["повесить картину"]
+        self.assertTrue(self.manager.unlink_tasks(picture, paint))
+        self.assertFalse(self.manager.unlink_tasks(picture, paint))
+        self.assertIn("Повесить картину", self.ready_descriptions())
+        self.assertTrue(self.manager.link_tasks(picture, paint))
+        self.assertEqual(self.manager.blockers_of(picture), [paint])
+        with self.assertRaises(ValueError):
+            self.manager.link_tasks(tasks["купить краску"], picture)
+    
+    def test_replace_task(self):
+        """Тест замены задачи с сохранением зависимостей."""
+        self.manager.mark_task_completed("Покрасить стену")
+        old = self.manager.get_task("Покрасить стену")
+        new = self.manager.replace_task(old, "Покрасить стену", "2030-01-01")
+        self.assertNotIn(old, self.manager.tasks)
+        self.assertFalse(new.status)
+        self.assertEqual(self.manager.dependents_of(new), [self.manager.get_task("Повесить картину")])
+        self.assertEqual(
+            [task.description for task in self.manager.blockers_of(new)], ["Купить краску"]
+        )
+        self.assertEqual(self.ready_descriptions(), ["Купить краску"])
+        with self.assertRaises(ValueError):
+            self.manager.replace_task(new, "Покрасить стену", "2030-13-01")
+        self.assertIn(new, self.manager.tasks)
+    
+    def test_serialization_keeps_dependencies(self):
+        """Тест сохранения зависимостей при сериализации."""
+        self.manager.mark_task_completed("Купить краску")
+        new_manager = TaskManager.from_dict(self.manager.to_dict())
+        self.assertEqual(
+            [task.description for task in new_manager.get_ready_tasks()],
+            ["Покрасить стену"]
+        )
+        self.assertEqual(
+            [task.description for task in new_manager.get_blockers("Повесить картину")],
+            ["Покрасить стену"]
+        )
+
+
+class TestTaskCalendar(unittest.TestCase):
+    """Тесты календарной гистограммы задач."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.manager = TaskManager()
+        self.manager.add_task("Отчёт", "2025-03-03")
+        self.manager.add_task("Налоги", "2025-03-31")
+        self.manager.add_task("Отпуск", "2025-04-01")
+        self.manager.add_task("Старое дело", "2020-01-15")
+        self.manager.mark_task_completed("Налоги")
+    
+    def test_range_counts(self):
+        """Тест подсчёта задач за период."""
+        self.assertEqual(self.manager.count_tasks_due("2025-03-01", "2025-03-31"), 2)
+        self.assertEqual(self.manager.count_tasks_due("2025-03-01", "2025-03-31", status=False), 1)
+        self.assertEqual(self.manager.count_tasks_due("2025-03-01", "2025-03-31", status=True), 1)
+        self.assertEqual(self.manager.count_tasks_due("2000-01-01", "2030-12-31"), 4)
+        self.assertEqual(self.manager.count_tasks_due("1990-01-01", "1990-12-31"), 0)
+    
+    def test_counts_follow_removal(self):
+        """Тест обновления гистограммы при удалении задач."""
+        self.manager.remove_task("Налоги")
+        self.manager.remove_task("Старое дело")
+        self.assertEqual(self.manager.count_tasks_due("2000-01-01", "2030-12-31"), 2)
+        self.assertEqual(self.manager.count_tasks_due("2025-03-01", "2025-03-31", status=True), 0)
+    
+    def test_daily_and_weekly_counts(self):
+        """Тест гистограмм по дням и неделям."""
+        daily = self.manager.get_daily_counts("2025-03-30", "2025-04-01")
+        self.assertEqual(daily["2025-03-31"], {"open": 0, "done": 1})
+        self.assertEqual(daily["2025-04-01"], {"open": 1, "done": 0})
+        self.assertEqual(daily["2025-03-30"], {"open": 0, "done": 0})
+        
+        weekly = self.manager.get_weekly_counts("2025-03-01", "2025-04-06")
+        self.assertEqual(weekly["2025-03-03"], {"open": 1, "done": 0})
+        self.assertEqual(weekly["2025-03-31"], {"open": 1, "done": 1})
+    
+    def test_distant_dates(self):
+        """Тест подсчёта задач с очень далёкими сроками."""
+        self.manager.add_task("Древнее дело", "0001-01-01")
+        self.manager.add_task("Далёкое дело", "9999-12-31")
+        self.assertEqual(self.manager.count_tasks_due("0001-01-01", "9999-12-31"), 6)
+        self.assertEqual(self.manager.count_tasks_due("0001-01-01", "0001-12-31"), 1)
+        self.assertEqual(self.manager.count_tasks_due("9999-01-01", "9999-12-31"), 1)
+        self.assertEqual(self.manager.count_tasks_due("2025-03-01", "2025-03-31"), 2)
+        self.assertLessEqual(len(self.manager._calendar.open._tree), 366 * 50)
+        self.manager.remove_task("Древнее дело")
+        self.assertEqual(self.manager.count_tasks_due("0001-01-01", "9999-12-31"), 5)
+    
+    def test_invalid_period(self):
+        """Тест запроса с неверной датой."""
+        with self.assertRaises(ValueError):
+            self.manager.count_tasks_due("2025-13-01", "2025-12-31")
+
+
+class TestTaskTransactions(unittest.TestCase):
+    """Тесты транзакций менеджера задач."""
+    
+    def setUp(self):
+        """Настройка тестового окружения."""
+        self.manager = TaskManager()
+        self.manager.add_task("Задача 1", "2025-05-01")
+        self.manager.add_task("Задача 2", "2025-05-02")
+        self.manager.add_dependency("Задача 2", "Задача 1")
+    
+    def test_commit_updates_indexes(self):
+        """Тест применения изменений при завершении транзакции."""
+        with self.manager.transaction():
+            self.manager.add_task("Задача 3", "2025-05-03")
+            self.manager.mark_task_completed("Задача 1")
+            self.manager.add_dependency("Задача 3", "Задача 2")
+            self.manager.remove_task("Задача 2")
+        
+        self.assertEqual([t.description for t in self.manager.tasks], ["Задача 1", "Задача 3"])
+        self.assertEqual([t.description for t in self.manager.get_ready_tasks()], ["Задача 3"])
+        self.assertEqual(self.manager.count_tasks_due("2025-05-01", "2025-05-31", status=True), 1)
+        self.assertEqual(self.manager.count_tasks_due("2025-05-01", "2025-05-31", status=False), 1)
+    
+    def test_rollback_on_error(self):
+        """Тест отката всех изменений при исключении."""
+        before = self.manager.to_dict()
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.add_task("Задача 3", "2025-05-03")
+                self.manager.mark_task_completed("Задача 1")
+                self.manager.remove_task("Задача 2")
+                self.assertEqual(len(self.manager.get_ready_tasks()), 1)
+                raise RuntimeError("сбой")
+        
+        self.assertEqual(self.manager.to_dict(), before)
+        self.assertEqual([t.description for t in self.manager.get_ready_tasks()], ["Задача 1"])
+        self.assertEqual(self.manager.count_tasks_due("2025-05-01", "2025-05-31"), 2)
+        
+        self.manager.mark_task_completed("Задача 1")
+        self.assertEqual([t.description for t in self.manager.get_ready_tasks()], ["Задача 2"])
+    
+    def test_nested_rollback(self):
+        """Тест отката только вложенной транзакции."""
+        with self.manager.transaction():
+            self.manager.add_task("Задача 3", "2025-05-03")
+            try:
+                with self.manager.transaction():
+                    self.manager.add_task("Задача 4", "2025-05-04")
+                    raise ValueError("сбой")
+            except ValueError:
+                pass
+        
+        self.assertIsNotNone(self.manager.get_task("Задача 3"))
+        self.assertIsNone(self.manager.get_task("Задача 4"))
+    
+    def test_listeners(self):
+        """Тест уведомления обработчиков об изменённых задачах."""
+        calls = []
+        
+        def listener(manager, tasks):
+            calls.append([task.description for task in tasks])
+        
+        self.manager.add_listener(listener)
+        self.manager.mark_task_completed("Задача 1")
+        self.assertEqual(calls, [["Задача 1"]])
+        
+        calls.clear()
+        with self.manager.transaction():
+            self.manager.add_task("Задача 3", "2025-05-03")
+            self.manager.add_dependency("Задача 3", "Задача 2")
+            self.manager.remove_task("Задача 2")
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [["Задача 3", "Задача 2"]])
+        
+        calls.clear()
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.add_task("Задача 4", "2025-05-04")
+                raise RuntimeError("сбой")
+        self.assertEqual(calls, [["Задача 4"]])
+        
+        self.assertTrue(self.manager.remove_listener(listener))
+        self.assertFalse(self.manager.remove_listener(listener))
+        self.manager.add_task("Задача 5", "2025-05-05")
+        self.assertEqual(calls, [["Задача 4"]])
+    
+    def test_get_tasks_after_rollback(self):
+        """Тест поиска задач с одинаковым описанием после отката удаления."""
+        self.manager.add_task("задача 1", "2025-05-03")
+        with self.assertRaises(RuntimeError):
+            with self.manager.transaction():
+                self.manager.remove_task("Задача 1")
+                self.assertEqual(self.manager.get_task("ЗАДАЧА 1").due_date, "2025-05-03")
+                raise RuntimeError("сбой")
+        
+        self.assertEqual([t.due_date for t in self.manager.get_tasks("ЗАДАЧА 1")],
+                         ["2025-05-01", "2025-05-03"])
+        self.assertEqual(self.manager.get_task("задача 1").due_date, "2025-05-01")
+        self.assertEqual(self.manager.get_tasks("Задача 9"), [])
+
+
 if __name__ == "__main__":
     # Создаем временную директорию для логов
     test_log_dir = Path("test_logs")